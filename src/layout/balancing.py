@@ -2,6 +2,7 @@
 import pandas as pd
 import streamlit as st
 import toml
+from mcomservice import MCOM_COLUMNS, mcom_lookup
 from omegaconf import DictConfig, OmegaConf
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
@@ -128,15 +129,9 @@ class QueryManager:
             return pd.DataFrame()
 
     def _get_mcom(self, siteid):
-        query = text(
-            """
-        SELECT "Site_ID", "NODE_ID", "NE_ID", "Cell_Name", "Longitude", "Latitude", "Dir", "Ant_BW",
-               "Ant_Size", "cellId", "eNBId", "KABUPATEN", "LTE"
-        FROM mcom
-        WHERE "Site_ID" LIKE :siteid
-        """
+        return mcom_lookup(
+            self.engine, "mcom", "Site_ID", [siteid], MCOM_COLUMNS, report=st.error
         )
-        return self.fetch_data(query, {"siteid": siteid})
 
     def _get_prb(_self, selected_sites):
         like_conditions = " OR ".join(
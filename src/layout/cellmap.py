@@ -0,0 +1,303 @@
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import toml
+from omegaconf import OmegaConf
+from sqlalchemy import create_engine, inspect, select, text
+from utils.gentable import CellAttributes
+
+EUTRAN_MAPPING = {
+    "L23_F1_S1": ["ME1", "ME01"],
+    "L23_F2_S1": ["MF1", "MF01"],
+    "L23_F1_S2": ["ME2", "ME02"],
+    "L23_F2_S2": ["MF2", "MF02"],
+    "L23_F1_S3": ["ME3", "ME03"],
+    "L23_F2_S3": ["MF3", "MF03"],
+    "L23_F1_S4": ["ME4", "ME04"],
+    "L23_F2_S4": ["MF4", "MF04"],
+    "L23_F1_S5": ["ME5", "ME05"],
+    "L23_F2_S5": ["MF5", "MF05"],
+    "L23_F1_S6": ["ME6", "ME06"],
+    "L23_F2_S6": ["MF6", "MF06"],
+    "L23_F3_S1": ["MI1", "MI01"],
+    "L23_F3_S2": ["MI2", "MI02"],
+    "L23_F3_S3": ["MI3", "MI03"],
+    "L23_MIMO_50_F3_S1": ["MV01"],
+    "L23_MIMO_50_F3_S2": ["MV02"],
+    "L23_MIMO_50_F3_S3": ["MV03"],
+    "L23_MIMO_F1_S1": ["VE01"],
+    "L23_MIMO_F1_S2": ["VE02"],
+    "L23_MIMO_F1_S3": ["VE03"],
+    "L23_MIMO_F2_S1": ["VF01"],
+    "L23_MIMO_F2_S2": ["VF02"],
+    "L23_MIMO_F2_S3": ["VF03"],
+    "L23_MIMO_F3_S1": ["VV01"],
+    "L23_MIMO_F3_S2": ["VV02"],
+    "L23_MIMO_F3_S3": ["VV03"],
+    "L9_S1": ["MT1", "MT01"],
+    "L9_S2": ["MT2", "MT02"],
+    "L9_S3": ["MT3", "MT03"],
+    "L9_S4": ["MT4", "MT04"],
+    "L9_S5": ["MT5", "MT05"],
+    "L9_S6": ["MT6", "MT06"],
+    "L18_S1": ["ML1", "ML01"],
+    "L18_S2": ["ML2", "ML02"],
+    "L18_S3": ["ML3", "ML03"],
+    "L18_S4": ["ML4", "ML04"],
+    "L18_S5": ["ML5", "ML05"],
+    "L18_S6": ["ML6", "ML06"],
+    "L21_S1": ["MR1", "MR01"],
+    "L21_S2": ["MR2", "MR02"],
+    "L21_S3": ["MR3", "MR03"],
+    "L21_S4": ["MR4", "MR04"],
+    "L21_S5": ["MR5", "MR05"],
+    "L21_S6": ["MR6", "MR06"],
+}
+
+
+REVERSE_MAPPING = {v: k for k, vals in EUTRAN_MAPPING.items() for v in vals}
+
+# No suffix is itself the tail of another, so the one anchored match is the
+# same entry the first-match scan over REVERSE_MAPPING used to return
+SUFFIX_PATTERN = re.compile("(" + "|".join(map(re.escape, REVERSE_MAPPING)) + r")\Z")
+
+
+def find_mapping(value):
+    match = SUFFIX_PATTERN.search(value)
+    return REVERSE_MAPPING[match.group(1)] if match else "Unknown"
+
+
+def map_unique(values, func, default=None):
+    """
+    Apply ``func`` once per distinct value and broadcast the results back.
+
+    Cell names repeat on every row of a daily or hourly frame, so the values
+    are factorized and ``func`` only sees the unique names; the results are
+    then taken by code. Missing values get ``default``.
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(value) for value in uniques]
+    # Code -1 (missing) picks the trailing default
+    mapped[-1] = default
+    return pd.Series(
+        mapped[codes], index=values.index, name=values.name
+    ).infer_objects()
+
+
+def derive_column(df, column, source, func, default=None):
+    """
+    Set ``column`` from ``source`` with ``func``, once per unique value.
+
+    Frames joined with cell_attributes already carry the column; only the
+    rows the join left empty (cells missing from mcom) are derived here.
+    """
+    if column not in df.columns:
+        df[column] = map_unique(df[source], func, default)
+        return df
+    missing = df[column].isna()
+    if missing.any():
+        df.loc[missing, column] = map_unique(df.loc[missing, source], func, default)
+    return df
+
+
+def split_sector(df, col, new_col="eutrancell_new"):
+    return derive_column(df, new_col, col, find_mapping, "Unknown")
+
+
+LTE_SECTOR_MAPPING = {
+    "1": 1,
+    "2": 2,
+    "3": 3,
+    "4": 1,
+    "5": 2,
+    "6": 3,
+    "7": 1,
+    "8": 2,
+    "9": 3,
+}
+
+GSM_SECTOR_MAPPING = {
+    "E": 1,
+    "F": 2,
+    "G": 3,
+    "A": 1,
+    "B": 2,
+    "C": 3,
+    "S": 1,
+    "T": 2,
+    "U": 3,
+    "P": 1,
+    "Q": 2,
+    "R": 3,
+}
+
+
+def lte_sector(cell: str) -> int:
+    return LTE_SECTOR_MAPPING.get(cell[-1].upper(), 0)
+
+
+def gsm_sector(cell: str) -> int:
+    return GSM_SECTOR_MAPPING.get(cell[-1].upper(), 0)
+
+
+def site_id_of(cell: str) -> str:
+    if cell.startswith(("E_", "E-", "N_", "N-")):
+        cell = cell[2:]
+    return cell[:6]
+
+
+# Bands whose sector 4-6 cells are multisector splits of sectors 1-3
+MULSEC_BANDS = ("MT", "ML", "MR")
+
+
+def mulsec_suffixes(band, sector):
+    return (f"{band}0{sector}", f"{band}{sector}")
+
+
+def mulsec_categories(cells):
+    """
+    Map multisector cell names to their ``MULSEC SEC n`` category.
+
+    A band's sector 4-6 cell and its sector 1-3 partner both get the
+    category, but only when both are present on the same site. Suffixes
+    are matched case insensitively over the unique names, so the cost does
+    not grow with the number of rows.
+    """
+    names = pd.Series(pd.unique(pd.Series(cells).dropna()), dtype=object)
+    upper = names.str.upper()
+    sites = names.map(site_id_of)
+    categories = {}
+    for band in MULSEC_BANDS:
+        for sector in (1, 2, 3):
+            multisector = upper.str.endswith(mulsec_suffixes(band, sector + 3))
+            partners = upper.str.endswith(mulsec_suffixes(band, sector))
+            paired = sites.isin(set(sites[multisector]) & set(sites[partners]))
+            for name in names[(multisector | partners) & paired]:
+                categories[name] = f"MULSEC SEC {sector}"
+    return categories
+
+
+def add_mulsec_category(df, derive=None):
+    """
+    Fill ``mulsec_category`` for the rows selected by the ``derive`` mask.
+
+    Pairing looks at every cell in the frame, but only the selected rows
+    (all of them by default) are assigned, so categories already joined from
+    cell_attributes are kept as they are.
+    """
+    try:
+        # Ensure 'mulsec_category' column exists
+        if "mulsec_category" not in df.columns:
+            df["mulsec_category"] = None
+        if derive is None:
+            derive = pd.Series(True, index=df.index)
+
+        categories = mulsec_categories(df["EUtranCellFDD"])
+        if categories and derive.any():
+            category = df.loc[derive, "EUtranCellFDD"].map(categories).dropna()
+            df.loc[category.index, "mulsec_category"] = category
+    except KeyError as e:
+        print(f"KeyError in add_mulsec_category: {e}")
+
+    return df
+
+
+# Technology -> (mcom table, cell name column, sector resolver)
+CELL_SOURCES = {
+    "LTE": ("mcom", "Cell_Name", lte_sector),
+    "GSM": ("gsmmcom", "Cell", gsm_sector),
+}
+
+
+def cell_attributes(cells, technology):
+    """
+    Derived attributes of every distinct cell name, as cell_attributes rows.
+
+    The multisector category follows the same rule as add_mulsec_category.
+    """
+    sector_of = CELL_SOURCES[technology][2]
+    names = pd.Series(pd.unique(pd.Series(cells).dropna()), dtype=object)
+    attributes = pd.DataFrame(
+        {
+            "cell_name": names,
+            "technology": technology,
+            "site_id": names.map(site_id_of),
+            "sector": names.map(sector_of),
+            "band": names.map(find_mapping) if technology == "LTE" else None,
+            "mulsec_category": None,
+        }
+    )
+    if technology == "LTE":
+        attributes["mulsec_category"] = names.map(mulsec_categories(names).get)
+    return attributes
+
+
+def refresh_cell_attributes(engine, technologies=None):
+    """
+    Rebuild cell_attributes from the mcom and gsmmcom cell names.
+
+    The upload page runs it whenever mcom or gsmmcom is loaded. Each technology
+    is replaced inside one transaction, so pages never join a half-written
+    table. Returns the number of cells written per technology.
+    """
+    table = CellAttributes.__table__
+    counts = {}
+    with engine.begin() as conn:
+        table.create(conn, checkfirst=True)
+        for technology in technologies or CELL_SOURCES:
+            source, column, _ = CELL_SOURCES[technology]
+            cells = pd.read_sql(
+                text(f'SELECT DISTINCT "{column}" AS cell_name FROM {source}'), conn
+            )
+            attributes = cell_attributes(cells["cell_name"], technology)
+            conn.execute(table.delete().where(table.c.technology == technology))
+            if not attributes.empty:
+                conn.execute(table.insert(), attributes.to_dict("records"))
+            counts[technology] = len(attributes)
+    return counts
+
+
+_ensured = set()
+_ensure_lock = threading.Lock()
+
+
+def ensure_cell_attributes(engine):
+    """
+    Create cell_attributes and fill the technologies it has no rows for.
+
+    Pages call it before joining the table, so a database that predates it
+    works without a manual refresh. Technologies whose mcom table does not
+    exist are skipped. The check runs once per database and process.
+    """
+    key = engine.url.render_as_string(hide_password=True)
+    with _ensure_lock:
+        if key in _ensured:
+            return
+        table = CellAttributes.__table__
+        with engine.begin() as conn:
+            table.create(conn, checkfirst=True)
+            filled = set(conn.execute(select(table.c.technology).distinct()).scalars())
+        inspector = inspect(engine)
+        missing = [
+            technology
+            for technology, (source, _, _) in CELL_SOURCES.items()
+            if technology not in filled and inspector.has_table(source)
+        ]
+        if missing:
+            refresh_cell_attributes(engine, missing)
+        _ensured.add(key)
+
+
+if __name__ == "__main__":
+    with open(".streamlit/secrets.toml") as f:
+        cfg = OmegaConf.create(toml.loads(f.read()))
+    db_cfg = cfg.connections.postgresql
+    engine = create_engine(
+        f"{db_cfg.dialect}://{db_cfg.username}:{db_cfg.password}@{db_cfg.host}:{db_cfg.port}/{db_cfg.database}"
+    )
+    for technology, count in refresh_cell_attributes(engine).items():
+        print(f"{technology}: {count} cell attributes written")
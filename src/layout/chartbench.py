@@ -0,0 +1,486 @@
+"""
+Chart-generation benchmarks on synthetic networks.
+
+Builds daily, hourly and GSM frames for a configurable network (sites,
+bands, sectors, days and KPI sections), then runs every chart builder
+without a Streamlit session. Each case reports its build time, the size of
+the serialized figures (plain Plotly JSON and figencode typed arrays) and
+the tracemalloc peak of one build. Results can be saved as a baseline and
+later runs compared against it.
+
+    python chartbench.py --save bench/baseline.json
+    python chartbench.py --days 180 --compare bench/baseline.json
+
+Sectors 4-6 are the multisector cells of sectors 1-3, so the default six
+sectors also exercise the multisector chart.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import plotly
+from cellmap import map_unique
+from figcache import FigureCache
+from figencode import encode_figure
+from gsmdaily import GsmDaily
+from gsmreview import ChartGenerator as GsmChartGenerator
+from prbutil import create_chart, determine_sector
+from reviewexport import load_review_page
+from traces import SectorCellSplit
+
+LTE_BANDS = ["ML", "MR", "MT", "ME", "MF"]
+GSM_BANDS = ["G", "D"]
+GSM_SECTORS = "ABC"
+HOURLY_KPIS = ["DL_Resource_Block_Utilizing_Rate", "Active User"]
+GSM_KPIS = ["T_AVAIL", "SDCCH_Success_Rate", "SDSR", "NEW_TDR", "TCH Drop Rate"]
+GSM_SECTIONS = [
+    ("T_AVAIL", None),
+    ("SDCCH_Success_Rate", "SDSR"),
+    ("NEW_TDR", "TCH Drop Rate"),
+]
+
+# Value ranges for KPIs that are not percentages
+KPI_RANGES = {
+    "UL_INT_PUSCH_x": (-120, -95),
+    "UL_INT_PUSCH_y": (-120, -95),
+    "CQI": (6, 12),
+    "avgcqinonhom": (6, 12),
+    "SE": (1, 3),
+    "SE_DAILY": (1, 3),
+    "CellDownlinkAverageThroughput": (5, 40),
+    "Payload_Total(Gb)": (0, 50),
+    "Active User": (0, 60),
+    "DL_Resource_Block_Utilizing_Rate": (0, 100),
+    "NEW_TDR": (0, 2),
+    "TCH Drop Rate": (0, 2),
+}
+COMPARED = ["median_s", "json_bytes", "binary_bytes", "peak_bytes"]
+
+
+class SyntheticNetwork:
+    """Seeded chart frames shaped like the review page query results."""
+
+    def __init__(self, page, sites=1, bands=3, sectors=6, days=90, hourly_days=30):
+        self.page = page
+        self.siteids = [f"SITE{index:02d}" for index in range(1, sites + 1)]
+        self.lte_suffixes = [
+            f"{band}{sector:02d}"
+            for band in LTE_BANDS[:bands]
+            for sector in range(1, sectors + 1)
+        ]
+        self.end_date = date(2024, 7, 31)
+        self.days = days
+        self.hourly_days = hourly_days
+        self.rng = np.random.default_rng(0)
+
+    def values(self, column, size):
+        low, high = KPI_RANGES.get(column, (90, 100))
+        # A slow walk around the middle of the range looks like a real KPI
+        walk = np.cumsum(self.rng.normal(0, (high - low) / 50, size))
+        middle = (low + high) / 2 + walk - walk.mean()
+        return np.clip(middle, low, high).round(4)
+
+    def grid(self, cells, timestamps):
+        frame = pd.DataFrame(
+            {
+                "cell": np.repeat(cells, len(timestamps)),
+                "timestamp": np.tile(timestamps, len(cells)),
+            }
+        )
+        frame["SITEID"] = frame["cell"].str[:6]
+        return frame
+
+    def daily(self, sections):
+        cells = [
+            f"{siteid}{suffix}"
+            for siteid in self.siteids
+            for suffix in self.lte_suffixes
+        ]
+        dates = pd.date_range(end=self.end_date, periods=self.days, freq="D")
+        frame = self.grid(cells, dates)
+        frame = frame.rename(columns={"cell": "EUtranCellFDD"})
+        frame["DATE_ID"] = frame.pop("timestamp").dt.date
+        frame["NEID"] = frame["SITEID"] + "_" + frame["EUtranCellFDD"].str[6:8]
+
+        kpis = dict.fromkeys(
+            column for _, _, y_param, yline in sections for column in (y_param, yline)
+        )
+        for column in kpis:
+            if column:
+                frame[column] = self.values(column, len(frame))
+        frame["MC Class"] = "MC1"
+        frame["Band"] = frame["EUtranCellFDD"].str[6:8]
+        frame["City"] = "SYNTH"
+        return self.page.split_sector(frame, "EUtranCellFDD")
+
+    def hourly(self):
+        cells = [
+            f"{siteid}{suffix}"
+            for siteid in self.siteids
+            for suffix in self.lte_suffixes
+        ]
+        hours = pd.date_range(
+            end=pd.Timestamp(self.end_date) + pd.Timedelta(hours=23),
+            periods=self.hourly_days * 24,
+            freq="h",
+        )
+        frame = self.grid(cells, hours)
+        frame = frame.rename(columns={"cell": "EUtranCellFDD", "timestamp": "datetime"})
+        frame["DATE_ID"] = frame["datetime"].dt.date
+        frame["hour_id"] = frame["datetime"].dt.hour
+        for column in HOURLY_KPIS:
+            frame[column] = self.values(column, len(frame))
+
+        frame = self.page.add_mulsec_category(frame)
+        frame["sector"] = map_unique(frame["EUtranCellFDD"], determine_sector)
+        return self.page.split_sector(frame, "EUtranCellFDD")
+
+    def gsm(self):
+        cells = [
+            f"{siteid}{band}{sector}"
+            for siteid in self.siteids
+            for band in GSM_BANDS
+            for sector in GSM_SECTORS
+        ]
+        dates = pd.date_range(end=self.end_date, periods=self.days, freq="D")
+        frame = self.grid(cells, dates)
+        frame = frame.rename(columns={"cell": "MOID"})
+        frame["GERANCELL"] = frame["MOID"]
+        frame["DATE_ID"] = frame.pop("timestamp").dt.date
+        for column in GSM_KPIS:
+            frame[column] = self.values(column, len(frame))
+        frame["Availability"] = frame["T_AVAIL"]
+        return frame
+
+
+class ChartBenchmark:
+    """Chart builder cases over one synthetic network."""
+
+    def __init__(self, network, sections, render_mode="auto", full_resolution=False):
+        self.page = network.page
+        self.sections = sections
+        self.daily_df = network.daily(sections)
+        self.hourly_df = network.hourly()
+        self.gsm_df = network.gsm()
+        self.siteids = network.siteids
+
+        self.chart_generator = self.page.ChartGenerator(render_mode=render_mode)
+        self.chart_generator.full_resolution = full_resolution
+        # Every build must be measured, never served from the cache
+        self.chart_generator.figure_cache = FigureCache(max_bytes=0)
+        self.gsm_chart_generator = GsmChartGenerator()
+
+    def prepared_daily(self):
+        return self.chart_generator.prepare(self.daily_df, "eutrancell_new", "DATE_ID")
+
+    def cases(self):
+        """``{name: (setup, build)}``; only ``build(setup())`` is timed."""
+        return {
+            "review.prepare": (lambda: None, self.review_prepare),
+            "review.sector_figures": (self.prepared_daily, self.review_sector_figures),
+            "review.kpi_compact_figure": (
+                self.prepared_daily,
+                self.review_kpi_compact_figures,
+            ),
+            "review.sector_compact_figure": (
+                self.prepared_daily,
+                self.review_sector_compact_figures,
+            ),
+            "review.mulsec_figure": (lambda: None, self.review_mulsec_figure),
+            "gsmreview.daily_figure": (lambda: None, self.gsmreview_daily_figures),
+            "prbutil.create_chart": (lambda: None, self.prbutil_charts),
+            "gsmdaily.sector_figure": (lambda: None, self.gsmdaily_figures),
+        }
+
+    def review_prepare(self, _):
+        prepared = self.prepared_daily()
+        self.chart_generator.section_columns(prepared, self.sections)
+        return []
+
+    def review_sector_figures(self, prepared):
+        """The per-sector figures the "Per KPI and sector" layout draws."""
+        chart_generator = self.chart_generator
+        figures = []
+        for _, kind, y_param, yline in self.sections:
+            split = prepared.kpi(y_param, yline)
+            if kind == "stacked":
+                figures += [
+                    chart_generator.stacked_area_figure(
+                        split,
+                        sector,
+                        prepared.cell_name,
+                        prepared.x_param,
+                        y_param,
+                        prepared.appearance_colors,
+                        yline,
+                    )
+                    for sector in split.sectors
+                ]
+                continue
+
+            build = (
+                chart_generator.daily_reverse_figure
+                if kind == "reverse"
+                else chart_generator.daily_figure
+            )
+            figures += [
+                build(split, sector, prepared.x_param, y_param, prepared.colors, yline)
+                for sector in prepared.nonzero_sectors(y_param)
+            ]
+        return figures
+
+    def review_kpi_compact_figures(self, prepared):
+        sectors = prepared.split.sectors
+        return [
+            self.chart_generator.kpi_compact_figure(prepared, section, sectors)
+            for section in self.sections
+        ]
+
+    def review_sector_compact_figures(self, prepared):
+        self.chart_generator.section_columns(prepared, self.sections)
+        return [
+            self.chart_generator.sector_compact_figure(
+                prepared, self.sections, sector, self.siteids[0]
+            )
+            for sector in prepared.split.sectors
+        ]
+
+    def review_mulsec_figure(self, _):
+        if not self.hourly_df["mulsec_category"].notna().any():
+            return []
+        return [
+            self.chart_generator.mulsec_figure(
+                self.hourly_df, "eutrancell_new", "datetime", *HOURLY_KPIS
+            )
+        ]
+
+    def gsmreview_daily_figures(self, _):
+        chart_generator = self.gsm_chart_generator
+        df = self.gsm_df.sort_values(by="DATE_ID")
+        figures = []
+        for y_param, yline in GSM_SECTIONS:
+            split = SectorCellSplit(
+                df,
+                "MOID",
+                map_unique(df["MOID"], chart_generator.determine_sector),
+                ["DATE_ID", y_param] + ([yline] if yline else []),
+                dtypes={y_param: float, **({yline: float} if yline else {})},
+            )
+            color_mapping = dict(
+                zip(
+                    sorted(split.cells),
+                    chart_generator.get_colors(len(split.cells)),
+                )
+            )
+            figures += [
+                chart_generator.daily_figure(
+                    split, sector, "DATE_ID", y_param, color_mapping, yline
+                )
+                for sector in split.sectors
+            ]
+        return figures
+
+    def prbutil_charts(self, _):
+        render_mode = self.chart_generator.render_mode
+        return [
+            create_chart(site_df, siteid, parameter, render_mode)
+            for siteid, site_df in self.hourly_df.groupby("SITEID")
+            for parameter in HOURLY_KPIS
+        ]
+
+    def gsmdaily_figures(self, _):
+        gsm_daily = GsmDaily(self.gsm_df.copy())
+        gsm_daily.transform_data()
+        return [gsm_daily.sector_figure(sector, [0, 103]) for sector in (1, 2, 3)]
+
+
+def payload_sizes(figures):
+    """Bytes sent to the browser as plain Plotly JSON and as typed arrays."""
+    return (
+        sum(len(fig.to_json()) for fig in figures),
+        sum(len(encode_figure(fig)) for fig in figures),
+    )
+
+
+def measure(setup, build, repeat):
+    timings = []
+    for _ in range(repeat):
+        state = setup()
+        started = time.perf_counter()
+        figures = build(state)
+        timings.append(time.perf_counter() - started)
+
+    # tracemalloc slows allocation down, so the peak gets its own run
+    state = setup()
+    tracemalloc.start()
+    build(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    json_bytes, binary_bytes = payload_sizes(figures)
+    return {
+        "figures": len(figures),
+        "traces": sum(len(fig.data) for fig in figures),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "json_bytes": json_bytes,
+        "binary_bytes": binary_bytes,
+        "peak_bytes": peak,
+    }
+
+
+def run(benchmark, repeat, selected=None):
+    results = {}
+    for name, (setup, build) in benchmark.cases().items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        results[name] = measure(setup, build, repeat)
+        print_result(name, results[name])
+    return results
+
+
+def human_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def print_result(name, result):
+    print(
+        f"{name:<30} {result['figures']:>4} figs {result['traces']:>5} traces "
+        f"{result['median_s'] * 1000:>9.1f}ms "
+        f"json {human_bytes(result['json_bytes']):>9} "
+        f"binary {human_bytes(result['binary_bytes']):>9} "
+        f"peak {human_bytes(result['peak_bytes']):>9}"
+    )
+
+
+def compare(results, baseline):
+    """Print each measure relative to the baseline; returns the worst time ratio."""
+    worst = 0.0
+    print(f"\n{'case':<30} " + " ".join(f"{key:>14}" for key in COMPARED))
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<30} (not in baseline)")
+            continue
+        ratios = []
+        for key in COMPARED:
+            ratio = result[key] / before[key] if before[key] else float("nan")
+            ratios.append(f"{ratio:>13.2f}x")
+        worst = max(worst, result["median_s"] / before["median_s"])
+        print(f"{name:<30} " + " ".join(ratios))
+    return worst
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark chart construction on a synthetic network."
+    )
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--bands", type=int, default=3, help="LTE bands per site")
+    parser.add_argument(
+        "--sectors", type=int, default=6, help="Sectors per band (4-6 are multisector)"
+    )
+    parser.add_argument("--days", type=int, default=90, help="Days of daily data")
+    parser.add_argument("--hourly-days", type=int, default=30)
+    parser.add_argument(
+        "--kpis", type=int, help="Number of daily KPI sections (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--render-mode", choices=["auto", "svg", "webgl"], default="auto"
+    )
+    parser.add_argument(
+        "--full-resolution",
+        action="store_true",
+        help="Keep every raw point instead of downsampling traces",
+    )
+    parser.add_argument(
+        "--case", action="append", help="Only run cases whose name contains this"
+    )
+    parser.add_argument("--save", help="Write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        help="Exit with an error when a case is this many times slower",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    page = load_review_page()
+    sections = page.DAILY_KPI_SECTIONS[: args.kpis]
+    config = {
+        "sites": args.sites,
+        "bands": args.bands,
+        "sectors": args.sectors,
+        "days": args.days,
+        "hourly_days": args.hourly_days,
+        "kpis": len(sections),
+        "repeat": args.repeat,
+        "render_mode": args.render_mode,
+        "full_resolution": args.full_resolution,
+    }
+
+    network = SyntheticNetwork(
+        page,
+        sites=args.sites,
+        bands=args.bands,
+        sectors=args.sectors,
+        days=args.days,
+        hourly_days=args.hourly_days,
+    )
+    benchmark = ChartBenchmark(
+        network, sections, args.render_mode, args.full_resolution
+    )
+    print(
+        f"{len(benchmark.daily_df)} daily rows, {len(benchmark.hourly_df)} hourly "
+        f"rows, {len(benchmark.gsm_df)} GSM rows"
+    )
+    results = run(benchmark, args.repeat, args.case)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"config": config, "environment": environment(), "results": results},
+                f,
+                indent=2,
+            )
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print("Warning: the baseline was recorded with a different configuration")
+        worst = compare(results, baseline)
+        if args.max_slowdown and worst > args.max_slowdown:
+            print(f"Slowest case is {worst:.2f}x the baseline", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
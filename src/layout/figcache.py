@@ -0,0 +1,94 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of rendered Plotly figures.
+
+    Figures are stored as built, keyed by a fingerprint of the data that went
+    into them plus the chart parameters, and the least recently used entries
+    are evicted once their estimated size exceeds ``max_bytes``. Every hit
+    returns a copy, so anything that changes on every rerun without touching
+    the traces (such as the OA date rule) should be left out of the key and
+    applied to the figure after it comes back from the cache.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def fingerprint(*parts):
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, np.ndarray | pd.Series | pd.Index):
+                values = np.asarray(part)
+                digest.update(str(values.dtype).encode())
+                digest.update(pd.util.hash_array(values.ravel()).tobytes())
+            else:
+                digest.update(repr(part).encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @classmethod
+    def payload_bytes(cls, value):
+        """Rough size of a figure's arrays and strings, without serializing it."""
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sum(cls.payload_bytes(item) for item in value.values())
+        if isinstance(value, list | tuple):
+            return sum(cls.payload_bytes(item) for item in value)
+        if isinstance(value, str):
+            return len(value)
+        return 8
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Copy the stored figure, which skips the JSON parse a reload costs
+        return go.Figure(entry[0])
+
+    def put(self, key, fig):
+        size = self.payload_bytes(fig.to_plotly_json())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            # Keep a private copy; the caller goes on to change the one it built
+            self._entries[key] = (go.Figure(fig), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+
+    def get_or_build(self, key, build):
+        fig = self.get(key)
+        if fig is None:
+            fig = build()
+            self.put(key, fig)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,137 @@
+import base64
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
+
+ENCODED_KEYS = ("x", "y", "z")
+FLOAT32_RTOL = 1e-6
+
+
+def typed_array(values, dtype):
+    values = np.ascontiguousarray(values, dtype=dtype)
+    return {
+        "dtype": values.dtype.str[1:],
+        "bdata": base64.b64encode(values.tobytes()).decode("ascii"),
+    }
+
+
+def epoch_ms(values):
+    """Dates and timestamps as float64 milliseconds since the epoch (NaT as NaN)."""
+    values = pd.to_datetime(pd.Series(values), errors="coerce")
+    milliseconds = values.to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    return np.where(values.isna(), np.nan, milliseconds.astype(np.float64))
+
+
+def is_datelike(values):
+    if np.issubdtype(values.dtype, np.datetime64):
+        return True
+    if values.dtype != object or not values.size:
+        return False
+    return all(isinstance(value, date | datetime) or value is None for value in values)
+
+
+def encode_values(values):
+    """
+    Encode one data array for plotly.js.
+
+    Returns ``(encoded, is_date)`` or ``None`` when the array is not numeric
+    or date-like and should stay as a JSON list. Floats go out as float32
+    when every value survives the cast within ``FLOAT32_RTOL``, integers
+    as int32 when they fit, and dates as float64 epoch milliseconds.
+    """
+    values = np.asarray(values)
+    if is_datelike(values):
+        return epoch_ms(values), True
+    if np.issubdtype(values.dtype, np.bool_) or not np.issubdtype(
+        values.dtype, np.number
+    ):
+        return None
+
+    if np.issubdtype(values.dtype, np.integer):
+        info = np.iinfo(np.int32)
+        if values.size and (values.min() < info.min or values.max() > info.max):
+            return values.astype(np.float64), False
+        return values.astype(np.int32), False
+
+    values = values.astype(np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        single = values.astype(np.float32)
+    if np.allclose(single, values, rtol=FLOAT32_RTOL, atol=0, equal_nan=True):
+        return single, False
+    return values, False
+
+
+def regular_step(values):
+    """The constant spacing of a NaN-free array, or None."""
+    if values.size < 3 or np.isnan(values).any():
+        return None
+    steps = np.diff(values)
+    if steps[0] != 0 and np.all(steps == steps[0]):
+        return steps[0].item()
+    return None
+
+
+def encode_trace(trace):
+    date_axes = set()
+    for key in ENCODED_KEYS:
+        if key not in trace or isinstance(trace[key], str | dict):
+            continue
+        encoded = encode_values(trace[key])
+        if encoded is None:
+            continue
+        values, is_date = encoded
+        if is_date:
+            date_axes.add(key)
+
+        step = regular_step(values) if key in ("x", "y") else None
+        if step is not None:
+            # Evenly spaced series only need their start and step
+            del trace[key]
+            trace[f"{key}0"] = values[0].item()
+            trace[f"d{key}"] = step
+        else:
+            trace[key] = typed_array(values, values.dtype)
+    return date_axes
+
+
+def encode_figure_dict(fig):
+    """
+    Plotly figure as a dict with trace data as base64 typed arrays.
+
+    Date axes fed with epoch milliseconds are pinned to ``type="date"`` so
+    plotly.js keeps formatting them as dates.
+    """
+    figure = fig.to_plotly_json()
+    layout = figure.setdefault("layout", {})
+    for trace in figure.get("data", []):
+        for key in encode_trace(trace):
+            axis = trace.get(f"{key}axis", key)
+            axis_name = f"{key}axis{axis[1:]}"
+            layout.setdefault(axis_name, {})["type"] = "date"
+    return figure
+
+
+def encode_figure(fig):
+    """The encoded figure as the JSON string sent to the browser."""
+    return json.dumps(encode_figure_dict(fig), cls=PlotlyJSONEncoder)
+
+
+class EncodedFigure(go.Figure):
+    """
+    Figure for ``st.plotly_chart`` whose trace data goes out as typed arrays.
+
+    ``st.plotly_chart`` serializes a Figure's ``to_dict()`` without
+    validating it again, so the encoded arrays reach the plotly.js bundled
+    with Streamlit (2.28 or later reads "bdata") unchanged.
+    """
+
+    def __init__(self, fig):
+        super().__init__()
+        self._encoded = encode_figure_dict(fig)
+
+    def to_dict(self):
+        return self._encoded
@@ -3,6 +3,17 @@ import folium
 import streamlit as st
 from branca.element import MacroElement, Template
 from colors import ColorPalette
+from geofeatures import (
+    RSRP_RANGES,
+    GridLayer,
+    bin_colors,
+    feature_style,
+    sector_collection,
+    sector_wedges,
+    spider_collection,
+)
+from mdtlod import LodGridLayer
+from mdttiles import TILE_LAYERS, tile_server
 
 
 class GeoApp:
@@ -13,6 +24,7 @@ class GeoApp:
         self.map_center = self.calculate_map_center()
         self.tile_options = self.define_tile_options()
         self.map = None
+        self.mdt_version = None
         self.ci_colors = self.assign_ci_colors()
 
     def get_unique_cis(self):
@@ -53,6 +65,44 @@ class GeoApp:
             tiles=self.tile_options[tile_provider],
             attr=tile_provider,
         )
+        self.add_mdt_tile_layers()
+
+    def add_mdt_tile_layers(self):
+        """
+        Pre-rendered MDT rasters, off by default, for large clusters.
+
+        Browsers fetch the tiles themselves, so the layers are only added
+        when the tile server has a configured ``public_url``.
+        """
+        server = tile_server()
+        if not server.public_url:
+            return
+        if self.driveless_data.empty or not all(
+            column in self.driveless_data.columns
+            for column in [
+                "lat_grid",
+                "long_grid",
+                "rsrp_mean",
+                "rsrq_mean",
+                "sample",
+                "ci",
+            ]
+        ):
+            return
+        try:
+            version = server.publish(self.driveless_data)
+        except OSError as e:
+            st.warning(f"MDT tile server unavailable: {e}")
+            return
+        self.mdt_version = version
+        for layer in TILE_LAYERS:
+            folium.TileLayer(
+                tiles=server.url(layer, version),
+                attr="MDT",
+                name=f"MDT {layer.upper()} raster",
+                overlay=True,
+                show=False,
+            ).add_to(self.map)
 
     def assign_ci_colors(self):
         """Assign colors to unique Cell IDs."""
@@ -68,98 +118,34 @@ class GeoApp:
 
     def get_rsrp_color(self, rsrp):
         """Determines the color representation based on the RSRP value."""
-        ranges = [
-            (-80, "blue"),
-            (-95, "#14380A"),
-            (-100, "#93FC7C"),
-            (-110, "yellow"),
-            (-115, "red"),
-        ]
-        for limit, color in ranges:
-            if rsrp >= limit:
-                return color
-        return "red"
+        return str(bin_colors([rsrp], RSRP_RANGES, "red")[0])
 
     def create_sector_polygon(self, lat, lon, azimuth, beamwidth, radius):
-        from math import asin, atan2, cos, degrees, radians, sin
-
-        lat_rad = radians(lat)
-        lon_rad = radians(lon)
-        azimuth_rad = radians(azimuth)
-        beamwidth_rad = radians(beamwidth)
-        num_points = 50
-        angle_step = beamwidth_rad / (num_points - 1)
-        start_angle = azimuth_rad - beamwidth_rad / 2
-        points = []
-
-        for i in range(num_points):
-            angle = start_angle + i * angle_step
-            lat_new = asin(
-                sin(lat_rad) * cos(radius / 6371)
-                + cos(lat_rad) * sin(radius / 6371) * cos(angle)
-            )
-            lon_new = lon_rad + atan2(
-                sin(angle) * sin(radius / 6371) * cos(lat_rad),
-                cos(radius / 6371) - sin(lat_rad) * sin(lat_new),
-            )
-            points.append([degrees(lat_new), degrees(lon_new)])
-
-        points.append([lat, lon])  # Return to the starting point for a complete polygon
-        return points
+        return sector_wedges([lat], [lon], [azimuth], [beamwidth], [radius])[0].tolist()
 
     def add_geocell_layer(self):
         geocell_layer = folium.FeatureGroup(name="Geocell Sites")
 
-        polygons = []
-        for _, row in self.geocell_data.iterrows():
-            color = self.get_ci_color(row["cellId"])
-            self.add_circle_marker(row, color, geocell_layer)
-            self.add_custom_marker(row, geocell_layer)
-            polygons.append((row, color))
+        colors = self.geocell_data["cellId"].map(self.ci_colors)
+        folium.GeoJson(
+            sector_collection(
+                self.geocell_data, colors, ["Site_ID", "Cell_Name", "cellId"]
+            ),
+            style_function=feature_style,
+            marker=folium.CircleMarker(radius=6, fill=True),
+            popup=folium.GeoJsonPopup(
+                fields=["Site_ID", "Cell_Name", "cellId"],
+                aliases=["Site:", "Cell:", "CI:"],
+                style="font-family: Arial; font-size: 16px;",
+            ),
+        ).add_to(geocell_layer)
 
-        # Add polygons after markers to prevent them from being sealed by circles
-        for row, color in polygons:
-            self.add_sector_polygon(row, color, geocell_layer)
+        # One label per site rather than one per cell
+        for _, row in self.geocell_data.drop_duplicates("Site_ID").iterrows():
+            self.add_custom_marker(row, geocell_layer)
 
         geocell_layer.add_to(self.map)
 
-    def create_popup_content(self, row):
-        return f"""
-        <div style="font-family: Arial; font-size: 16px;">
-            <b>Site:</b> {row['Site_ID']}<br>
-            <b>Cell:</b> {row['Cell_Name']}<br>
-            <b>CI:</b> {row['cellId']}
-        </div>
-        """
-
-    def add_sector_polygon(self, row, color, layer):
-        sector_polygon = self.create_sector_polygon(
-            row["Latitude"],
-            row["Longitude"],
-            row["Dir"],
-            row["Ant_BW"],
-            row["Ant_Size"],
-        )
-        folium.Polygon(
-            locations=sector_polygon,
-            color="black",
-            fill=True,
-            fill_color=color,
-            fill_opacity=1.0,
-        ).add_to(layer)
-
-    def add_circle_marker(self, row, color, layer):
-        popup_content = self.create_popup_content(row)
-        folium.CircleMarker(
-            location=[row["Latitude"], row["Longitude"]],
-            radius=6,
-            popup=folium.Popup(popup_content, max_width=250),
-            color=color,
-            fill=True,
-            fill_color=color,
-            fill_opacity=1.0,
-        ).add_to(layer)
-
     def add_custom_marker(self, row, layer):
         folium.Marker(
             location=[row["Latitude"], row["Longitude"]],
@@ -170,44 +156,39 @@ class GeoApp:
         ).add_to(layer)
 
     def add_driveless_layer(self, color_by_ci=True):
-        driveless_layer = folium.FeatureGroup(name="Driveless Data")
-
-        for _, row in self.driveless_data.iterrows():
-            if color_by_ci:
-                color = self.get_ci_color(row["ci"])
-            else:
-                color = self.get_rsrp_color(row["rsrp_mean"])
-            folium.CircleMarker(
-                location=[row["lat_grid"], row["long_grid"]],
-                radius=4,
-                popup=f"CI: {row['ci']} RSRP: {row['rsrp_mean']} dBm",
-                color=color,
-                fill=True,
-                fill_color=color,
-                fill_opacity=1,
-            ).add_to(driveless_layer)
-
-        driveless_layer.add_to(self.map)
+        if self.mdt_version is not None:
+            # Quadkey cells at the level of the current zoom, from the tile
+            # server; only published when it has a reachable address
+            LodGridLayer(
+                tile_server().lod_url(self.mdt_version),
+                self.ci_colors,
+                color_by_ci=color_by_ci,
+                rsrp_ranges=RSRP_RANGES,
+                name="Driveless Data",
+            ).add_to(self.map)
+            return
+
+        if color_by_ci:
+            colors = self.driveless_data["ci"].map(self.ci_colors).fillna("black")
+        else:
+            colors = bin_colors(self.driveless_data["rsrp_mean"], RSRP_RANGES, "red")
+
+        GridLayer(
+            self.driveless_data["lat_grid"],
+            self.driveless_data["long_grid"],
+            colors,
+            fields=self.driveless_data[["ci", "rsrp_mean"]],
+            popup="CI: {ci} RSRP: {rsrp_mean} dBm",
+            radius=4,
+            name="Driveless Data",
+        ).add_to(self.map)
 
     def add_spider_graph(self):
-        for _, row in self.driveless_data.iterrows():
-            geocell_match = self.geocell_data[
-                (self.geocell_data["cellId"] == row["ci"])
-                & (self.geocell_data["eNBId"] == row["enodebid"])
-            ]
-            if not geocell_match.empty:
-                geocell_lat = geocell_match["Latitude"].values[0]
-                geocell_lon = geocell_match["Longitude"].values[0]
-                color = self.get_ci_color(row["ci"])
-                folium.PolyLine(
-                    locations=[
-                        [row["lat_grid"], row["long_grid"]],
-                        [geocell_lat, geocell_lon],
-                    ],
-                    color=color,
-                    weight=1,
-                    opacity=0.5,
-                ).add_to(self.map)
+        folium.GeoJson(
+            spider_collection(self.driveless_data, self.geocell_data, self.ci_colors),
+            name="Spider Graph",
+            style_function=feature_style,
+        ).add_to(self.map)
 
     def display_map(self):
         folium.LayerControl().add_to(self.map)
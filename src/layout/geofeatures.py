@@ -0,0 +1,261 @@
+import json
+
+import numpy as np
+import pandas as pd
+from branca.element import Template
+from folium.map import Layer
+
+EARTH_RADIUS = 6371  # in kilometers
+# Decimal places kept in coordinates, about 0.1 m
+PRECISION = 6
+SECTOR_COLUMNS = ["Latitude", "Longitude", "Dir", "Ant_BW", "Ant_Size"]
+
+# (lower RSRP limit in dBm, color), highest first
+RSRP_RANGES = [
+    (-80, "blue"),
+    (-95, "#14380A"),
+    (-100, "#93FC7C"),
+    (-110, "yellow"),
+    (-115, "red"),
+]
+
+
+def sector_wedges(lat, lon, azimuth, beamwidth, radius, num_points=50):
+    """
+    Wedge outlines of many sectors in one NumPy pass.
+
+    Returns an ``(n, num_points + 1, 2)`` array of ``[lat, lon]`` points: an
+    arc of ``num_points`` across the beamwidth at ``radius`` kilometres,
+    centred on the azimuth, then the site itself.
+    """
+    lat, lon, azimuth, beamwidth, radius = (
+        np.asarray(values, dtype=float)[:, None]
+        for values in (lat, lon, azimuth, beamwidth, radius)
+    )
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    beamwidth_rad = np.radians(beamwidth)
+    angle_step = beamwidth_rad / (num_points - 1)
+    start_angle = np.radians(azimuth) - beamwidth_rad / 2
+    angle = start_angle + np.arange(num_points) * angle_step
+    distance = radius / EARTH_RADIUS
+
+    lat_new = np.arcsin(
+        np.sin(lat_rad) * np.cos(distance)
+        + np.cos(lat_rad) * np.sin(distance) * np.cos(angle)
+    )
+    lon_new = lon_rad + np.arctan2(
+        np.sin(angle) * np.sin(distance) * np.cos(lat_rad),
+        np.cos(distance) - np.sin(lat_rad) * np.sin(lat_new),
+    )
+    arc = np.stack([np.degrees(lat_new), np.degrees(lon_new)], axis=-1)
+    site = np.stack([lat, lon], axis=-1)
+    return np.concatenate([arc, site], axis=1)
+
+
+def feature_properties(frame, properties):
+    if not properties:
+        return [{} for _ in range(len(frame))]
+    values = frame[list(properties)]
+    return values.astype(object).where(values.notna(), None).to_dict("records")
+
+
+def sector_collection(frame, colors, properties=()):
+    """
+    GeoJSON FeatureCollection of the cells in ``frame``.
+
+    Each located cell gets a Point at the site and, when its azimuth,
+    beamwidth and size are known, a wedge Polygon. Points come first so the
+    wedges draw over them. Every feature carries the ``properties`` columns
+    and a Leaflet ``style`` in its colour from ``colors``.
+    """
+    colors = pd.Series(colors, index=frame.index).fillna("black").to_numpy()
+    located = frame[["Latitude", "Longitude"]].notna().all(axis=1).to_numpy()
+    wedged = frame[SECTOR_COLUMNS].notna().all(axis=1).to_numpy()
+    props = feature_properties(frame, properties)
+
+    points = np.round(frame[["Longitude", "Latitude"]].to_numpy(float), PRECISION)
+    wedges = sector_wedges(*(frame.loc[wedged, column] for column in SECTOR_COLUMNS))
+    # GeoJSON rings are [lon, lat] and end on their first point
+    rings = np.concatenate([wedges, wedges[:, :1]], axis=1)[..., ::-1]
+    rings = np.round(rings, PRECISION).tolist()
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": points[row].tolist()},
+            "properties": {
+                **props[row],
+                "style": {
+                    "color": colors[row],
+                    "fillColor": colors[row],
+                    "fillOpacity": 1.0,
+                },
+            },
+        }
+        for row in np.flatnonzero(located)
+    ]
+    features += [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+            "properties": {
+                **props[row],
+                "style": {
+                    "color": "black",
+                    "fillColor": colors[row],
+                    "fillOpacity": 1.0,
+                },
+            },
+        }
+        for row, ring in zip(np.flatnonzero(wedged), rings)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def feature_style(feature):
+    """``style_function`` for collections that carry their own style."""
+    return feature["properties"]["style"]
+
+
+def bin_colors(values, ranges, default):
+    """
+    Colour of each value from ``(lower limit, colour)`` ranges, highest first.
+
+    Vectorized form of a first-match ``if value >= limit`` scan; values that
+    match no range (and NaN) get ``default``.
+    """
+    values = np.asarray(values, dtype=float)
+    return np.select(
+        [values >= limit for limit, _ in ranges],
+        [color for _, color in ranges],
+        default=default,
+    )
+
+
+def compact(values):
+    values = pd.Series(values)
+    if pd.api.types.is_float_dtype(values):
+        values = values.round(PRECISION)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+class GridLayer(Layer):
+    """
+    Grid bins drawn from flat arrays onto one canvas renderer.
+
+    Coordinates, a palette index per bin and the popup columns are embedded
+    once as arrays, and the bins (squares of half-width ``size`` degrees,
+    or circles of ``radius`` pixels) are created in the browser. Popups are
+    filled in from ``popup``, a template such as ``"CI: {ci}"``, only when
+    a bin is clicked. This keeps the page small and responsive with
+    hundreds of thousands of bins, where one folium object per bin is not.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            var data = {{ this.data }};
+            var renderer = L.canvas({padding: 0.5});
+            var layer = L.layerGroup();
+            var popup = function(i) {
+                return data.popup.replace(/\\{(\\w+)\\}/g, function(_, field) {
+                    return data.fields[field][i];
+                });
+            };
+            for (var i = 0; i < data.lat.length; i++) {
+                var lat = data.lat[i], lon = data.lon[i];
+                var color = data.palette[data.color[i]];
+                var style = {
+                    renderer: renderer, color: color, fillColor: color,
+                    fill: true, fillOpacity: 1
+                };
+                var bin = data.size ? L.rectangle(
+                    [[lat - data.size, lon - data.size],
+                     [lat + data.size, lon + data.size]], style
+                ) : L.circleMarker([lat, lon], Object.assign({radius: data.radius}, style));
+                bin.bindPopup(popup.bind(null, i));
+                layer.addLayer(bin);
+            }
+            return layer;
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self,
+        lat,
+        lon,
+        colors,
+        fields=None,
+        popup="",
+        size=None,
+        radius=4,
+        name=None,
+        overlay=True,
+        control=True,
+        show=True,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "GridLayer"
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        located = ~(np.isnan(lat) | np.isnan(lon))
+        codes, palette = pd.factorize(pd.Series(np.asarray(colors)[located]))
+        fields = pd.DataFrame() if fields is None else fields[located]
+        self.data = json.dumps(
+            {
+                "lat": compact(lat[located]),
+                "lon": compact(lon[located]),
+                "color": codes.tolist(),
+                "palette": list(palette),
+                "fields": {column: compact(fields[column]) for column in fields},
+                "popup": popup,
+                "size": size,
+                "radius": radius,
+            },
+            separators=(",", ":"),
+        )
+
+
+def numeric_keys(frame, keys):
+    frame = frame.assign(
+        **{key: pd.to_numeric(frame[key], errors="coerce") for key in keys}
+    )
+    return frame.dropna(subset=keys)
+
+
+def spider_collection(driveless, geocell, colors):
+    """
+    Lines from every MDT bin to its serving cell, one MultiLineString per colour.
+
+    Bins are joined to the first geocell row with the same (eNBId, cellId)
+    in one merge, and each line takes its colour from ``colors`` by ci,
+    black when the ci has none.
+    """
+    cells = numeric_keys(
+        geocell[["eNBId", "cellId", "Latitude", "Longitude"]], ["eNBId", "cellId"]
+    ).drop_duplicates(["eNBId", "cellId"])
+    bins = numeric_keys(
+        driveless[["enodebid", "ci", "lat_grid", "long_grid"]], ["enodebid", "ci"]
+    )
+    lines = bins.merge(cells, left_on=["enodebid", "ci"], right_on=["eNBId", "cellId"])
+    ends = ["long_grid", "lat_grid", "Longitude", "Latitude"]
+    lines = lines.dropna(subset=ends)
+
+    coordinates = np.round(lines[ends].to_numpy(float), PRECISION).reshape(-1, 2, 2)
+    line_colors = lines["ci"].map(colors).fillna("black")
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiLineString",
+                "coordinates": coordinates[rows].tolist(),
+            },
+            "properties": {"style": {"color": color, "weight": 1, "opacity": 0.5}},
+        }
+        for color, rows in line_colors.groupby(line_colors, sort=False).indices.items()
+    ]
+    return {"type": "FeatureCollection", "features": features}
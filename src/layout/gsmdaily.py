@@ -73,6 +73,11 @@ class GsmDaily:
                 # st.markdown("</div>", unsafe_allow_html=True)
 
     def plot_sector_chart(self, sector, yaxis_range):
+        st.plotly_chart(
+            self.sector_figure(sector, yaxis_range), use_container_width=True
+        )
+
+    def sector_figure(self, sector, yaxis_range):
         sector_data = self.data[self.data["SECTOR"] == sector]
 
         fig = make_subplots(specs=[[{"secondary_y": False}]])
@@ -100,8 +105,7 @@ class GsmDaily:
             height=350,
         )
         fig.update_yaxes(secondary_y=False)
-
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
 
 def gsm_daily_page(df: pd.DataFrame):
@@ -10,7 +10,9 @@ import streamlit as st
 # import streamlit_antd_components as sac
 import toml
 
+from cellmap import gsm_sector, map_unique
 from colors import ColorPalette
+from mcomservice import GSMMCOM_COLUMNS, mcom_lookup
 from omegaconf import DictConfig, OmegaConf
 
 # from plotly.subplots import make_subplots
@@ -25,6 +27,7 @@ from streamlit_extras.stylable_container import stylable_container
 # from layout.styles import styling
 
 from styles import styling
+from traces import SectorCellSplit, nan_max, nan_mean, positive_min
 
 
 class Config:
@@ -121,24 +124,19 @@ class QueryManager:
             return pd.DataFrame()
 
     def get_mcom_siteid(self, siteid):
-        query = text(
-            """
-        SELECT "Site ID", "NE_ID", "Cell", "KABUPATEN"
-        FROM gsmmcom
-        WHERE "Site ID" LIKE :siteid
-        """
+        return mcom_lookup(
+            self.engine,
+            "gsmmcom",
+            "Site ID",
+            [siteid],
+            ["Site ID", "NE_ID", "Cell", "KABUPATEN"],
+            report=st.error,
         )
-        return self.fetch_data(query, {"siteid": siteid})
 
     def get_mcom_neid(self, neid):
-        query = text(
-            """
-        SELECT "Site ID", "NE_ID", "Cell", "Cell_Type", "KABUPATEN"
-        FROM gsmmcom
-        WHERE "NE_ID" LIKE :neid
-        """
+        return mcom_lookup(
+            self.engine, "gsmmcom", "NE_ID", [neid], GSMMCOM_COLUMNS, report=st.error
         )
-        return self.fetch_data(query, {"neid": neid})
 
     def get_gsmdaily(self, cells, start_date, end_date):
         like_conditions = " OR ".join(
@@ -198,52 +196,33 @@ class ChartGenerator:
         return [self.color_palette.get_color(i) for i in range(num_colors)]
 
     def determine_sector(self, cell: str) -> int:
-        sector_mapping = {
-            "E": 1,
-            "F": 2,
-            "G": 3,
-            "A": 1,
-            "B": 2,
-            "C": 3,
-            "S": 1,
-            "T": 2,
-            "U": 3,
-            "P": 1,
-            "Q": 2,
-            "R": 3,
-        }
-        last_char = cell[-1].upper()
-        return sector_mapping.get(last_char, 0)
+        return gsm_sector(cell)
 
     def create_charts_for_daily(
         self, df, cell_name, x_param, y_param, xrule=False, yline=None
     ):
         df = df.sort_values(by=x_param)
         df[y_param] = df[y_param].astype(float)
-        df["sector"] = df[cell_name].apply(self.determine_sector)
+        split = SectorCellSplit(
+            df,
+            cell_name,
+            map_unique(df[cell_name], self.determine_sector),
+            [x_param, y_param] + ([yline] if yline else []),
+            dtypes={y_param: float, **({yline: float} if yline else {})},
+        )
 
         color_mapping = {
             cell: color
             for cell, color in zip(
-                sorted(df[cell_name].unique()),
-                self.get_colors(len(df[cell_name].unique())),
+                sorted(split.cells),
+                self.get_colors(len(split.cells)),
             )
         }
 
-        sector_count = df["sector"].nunique()
-        cols = max(min(sector_count, 3), 1)
+        cols = max(min(len(split.sectors), 3), 1)
         columns = st.columns(cols)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
-            y_min = sector_data[sector_data[y_param] > 0][y_param].min()
-            y_max_value = sector_data[y_param].max()
-            y_max = (
-                100
-                if 95 < y_max_value <= 100
-                else y_max_value if y_max_value > 100 else y_max_value
-            )
-
+        for idx, sector in enumerate(split.sectors):
             with columns[idx % cols]:
                 with stylable_container(
                     key=f"container_with_border_{sector}",
@@ -259,39 +238,9 @@ class ChartGenerator:
                     container = st.container()
                     with container:
 
-                        fig = go.Figure()
-
-                        for cell in sector_data[cell_name].unique():
-                            cell_data = sector_data[sector_data[cell_name] == cell]
-                            color = color_mapping[cell]
-
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=cell_data[x_param],
-                                    y=cell_data[y_param],
-                                    mode="lines",
-                                    name=cell,
-                                    line=dict(color=color, width=3),
-                                    hovertemplate=(
-                                        f"<b>{cell}</b><br>"
-                                        f"<b>{y_param}:</b> %{{y}}<br>"
-                                        "<extra></extra>"
-                                    ),
-                                )
-                            )
-
-                        if yline:
-                            yline_value = sector_data[yline].mean()
-                            fig.add_hline(
-                                y=yline_value,
-                                line_dash="dashdot",
-                                line_color="#F70000",
-                                line_width=2,
-                            )
-                            if yline_value > y_max:
-                                y_max = yline_value
-                            elif yline_value < y_min:
-                                y_min = yline_value
+                        fig = self.daily_figure(
+                            split, sector, x_param, y_param, color_mapping, yline
+                        )
 
                         if xrule:
                             fig.add_vline(
@@ -301,70 +250,118 @@ class ChartGenerator:
                                 line_color="#808080",
                             )
 
-                        adjusted_y_min = y_min if y_min > 0 else 0.01
-                        yaxis_range = [adjusted_y_min, y_max]
+                        st.plotly_chart(fig, use_container_width=True)
 
-                        fig.update_layout(
-                            margin=dict(t=20, l=20, r=20, b=20),
-                            title_text=f"SECTOR {sector}",
-                            title_x=0.5,
-                            template="plotly_white",
-                            hoverlabel=dict(font_size=14, font_family="Vodafone"),
-                            hovermode="x unified",
-                            legend=dict(
-                                orientation="h",
-                                yanchor="top",
-                                y=-0.4,
-                                xanchor="center",
-                                x=0.5,
-                                itemclick="toggleothers",
-                                itemdoubleclick="toggle",
-                                itemsizing="constant",
-                                font=dict(size=14),
-                            ),
-                            paper_bgcolor="#F5F5F5",
-                            plot_bgcolor="#F5F5F5",
-                            width=600,
-                            height=350,
-                            showlegend=True,
-                            yaxis=dict(
-                                range=yaxis_range,
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                            xaxis=dict(
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                        )
+    def daily_figure(self, split, sector, x_param, y_param, color_mapping, yline=None):
+        sector_y = split.sector_column(sector, y_param)
+        y_min = positive_min(sector_y)
+        y_max_value = nan_max(sector_y)
+        y_max = (
+            100
+            if 95 < y_max_value <= 100
+            else y_max_value if y_max_value > 100 else y_max_value
+        )
 
-                        st.plotly_chart(fig, use_container_width=True)
+        fig = go.Figure()
+
+        for cell, cell_data in split.cell_groups(sector, [x_param, y_param]):
+            color = color_mapping[cell]
+
+            fig.add_trace(
+                go.Scatter(
+                    x=cell_data[x_param],
+                    y=cell_data[y_param],
+                    mode="lines",
+                    name=cell,
+                    line=dict(color=color, width=3),
+                    hovertemplate=(
+                        f"<b>{cell}</b><br>"
+                        f"<b>{y_param}:</b> %{{y}}<br>"
+                        "<extra></extra>"
+                    ),
+                )
+            )
+
+        if yline:
+            yline_value = nan_mean(split.sector_column(sector, yline))
+            fig.add_hline(
+                y=yline_value,
+                line_dash="dashdot",
+                line_color="#F70000",
+                line_width=2,
+            )
+            if yline_value > y_max:
+                y_max = yline_value
+            elif yline_value < y_min:
+                y_min = yline_value
+
+        adjusted_y_min = y_min if y_min > 0 else 0.01
+        yaxis_range = [adjusted_y_min, y_max]
+
+        fig.update_layout(
+            margin=dict(t=20, l=20, r=20, b=20),
+            title_text=f"SECTOR {sector}",
+            title_x=0.5,
+            template="plotly_white",
+            hoverlabel=dict(font_size=14, font_family="Vodafone"),
+            hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=14),
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            width=600,
+            height=350,
+            showlegend=True,
+            yaxis=dict(
+                range=yaxis_range,
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+            xaxis=dict(
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+        )
+
+        return fig
 
     def create_charts_for_stacked_area(
         self, df, cell_name, x_param, y_param, xrule=False, yline=None
     ):
         df = df.sort_values(by=x_param)
         df[y_param] = df[y_param].astype(float)
-        df["sector"] = df[cell_name].apply(self.determine_sector)
+        split = SectorCellSplit(
+            df,
+            cell_name,
+            map_unique(df[cell_name], self.determine_sector),
+            [x_param, y_param] + ([yline] if yline else []),
+            dtypes={y_param: float, **({yline: float} if yline else {})},
+        )
         color_mapping = {
             cell: color
             for cell, color in zip(
-                df[cell_name].unique(),
-                self.get_colors(len(df[cell_name].unique())),
+                split.cells,
+                self.get_colors(len(split.cells)),
             )
         }
 
-        sector_count = df["sector"].nunique()
-        cols = max(min(sector_count, 3), 1)
+        cols = max(min(len(split.sectors), 3), 1)
         columns = st.columns(cols)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
-
+        for idx, sector in enumerate(split.sectors):
             with columns[idx % cols]:
                 with stylable_container(
                     key=f"container_with_border_{sector}",
@@ -380,22 +377,29 @@ class ChartGenerator:
                     container = st.container()
                     with container:
 
-                        fig = px.area(
-                            sector_data,
-                            x=x_param,
-                            y=y_param,
-                            color=cell_name,
-                            color_discrete_map=color_mapping,
-                            hover_data={
-                                cell_name: True,
-                                y_param: True,
-                            },
-                        )
-                        fig.update_traces(
-                            hovertemplate=f"<b>{cell_name}:</b> %{{customdata[0]}}<br><b>{y_param}:</b> %{{y}}<extra></extra>"
-                        )
+                        fig = go.Figure()
+
+                        for cell, cell_data in split.cell_groups(
+                            sector, [x_param, y_param]
+                        ):
+                            fig.add_trace(
+                                go.Scatter(
+                                    x=cell_data[x_param],
+                                    y=cell_data[y_param],
+                                    mode="lines",
+                                    name=cell,
+                                    legendgroup=cell,
+                                    stackgroup="1",
+                                    line=dict(color=color_mapping[cell]),
+                                    hovertemplate=(
+                                        f"<b>{cell_name}:</b> {cell}<br>"
+                                        f"<b>{y_param}:</b> %{{y}}<extra></extra>"
+                                    ),
+                                )
+                            )
+                        fig.update_layout(xaxis_title=x_param, yaxis_title=y_param)
                         if yline:
-                            yline_value = sector_data[yline].mean()
+                            yline_value = nan_mean(split.sector_column(sector, yline))
                             fig.add_hline(
                                 y=yline_value,
                                 line_dash="dot",
@@ -548,23 +552,26 @@ class ChartGenerator:
     ):
         df = df.sort_values(by=x_param)
         df[y_param] = df[y_param].astype(float)
-        df["sector"] = df[cell_name].apply(self.determine_sector)
+        split = SectorCellSplit(
+            df,
+            cell_name,
+            map_unique(df[cell_name], self.determine_sector),
+            [x_param, y_param] + ([yline] if yline else []),
+            dtypes={y_param: float, **({yline: float} if yline else {})},
+        )
 
         color_mapping = {
             cell: color
             for cell, color in zip(
-                sorted(df[cell_name].unique()),
-                self.get_colors(len(df[cell_name].unique())),
+                sorted(split.cells),
+                self.get_colors(len(split.cells)),
             )
         }
 
-        sector_count = df["sector"].nunique()
-        cols = max(min(sector_count, 3), 1)
+        cols = max(min(len(split.sectors), 3), 1)
         columns = st.columns(cols)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
-
+        for idx, sector in enumerate(split.sectors):
             with columns[idx % cols]:
                 with stylable_container(
                     key=f"container_with_border_{sector}",
@@ -582,8 +589,9 @@ class ChartGenerator:
 
                         fig = go.Figure()
 
-                        for cell in sector_data[cell_name].unique():
-                            cell_data = sector_data[sector_data[cell_name] == cell]
+                        for cell, cell_data in split.cell_groups(
+                            sector, [x_param, y_param]
+                        ):
                             color = color_mapping[cell]
 
                             fig.add_trace(
@@ -602,17 +610,13 @@ class ChartGenerator:
                             )
 
                         if yline:
-                            yline_value = sector_data[yline].mean()
+                            yline_value = nan_mean(split.sector_column(sector, yline))
                             fig.add_hline(
                                 y=yline_value,
                                 line_dash="dashdot",
                                 line_color="#F70000",
                                 line_width=2,
                             )
-                            if yline_value > y_max:
-                                y_max = yline_value
-                            elif yline_value < y_min:
-                                y_min = yline_value
 
                         if xrule:
                             fig.add_vline(
@@ -0,0 +1,395 @@
+from math import atan2, cos, pi, radians, sin, sqrt
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+COORDINATE_COLUMNS = ["Latitude", "Longitude", "Dir"]
+
+
+def coordinate_arrays(data, coordinates=None):
+    """Latitude, Longitude and Dir as float arrays, or rows of the shared copy."""
+    if coordinates is not None:
+        return tuple(coordinates)
+    return tuple(data[column].to_numpy(dtype=float) for column in COORDINATE_COLUMNS)
+
+
+class InterSiteDistance:
+    # NumPy trigonometry can differ from math in the last bit, so the
+    # vectorized masks are widened by this much and the few survivors are
+    # rechecked with the scalar methods below
+    tolerance = 1e-6
+    # Source x target pairs evaluated per NumPy block
+    block_pairs = 500_000
+
+    def __init__(self, data, coordinates=None):
+        self.data = data
+        self.coordinates = coordinates
+        self.beamwidth = 60
+        self.earth_radius = 6371  # in kilometers
+        self._arrays = None
+
+    def calculate_distance(self, lat1, lon1, lat2, lon2):
+        if lat1 == lat2 and lon1 == lon2:
+            return 0
+        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+        a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+        c = 2 * atan2(sqrt(a), sqrt(1 - a))
+        distance = self.earth_radius * c
+        return round(distance, 2)
+
+    def calculate_bearing(self, lat1, lon1, lat2, lon2):
+        bearing = atan2(
+            sin(lon2 - lon1) * cos(lat2),
+            cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(lon2 - lon1),
+        )
+        return (bearing * 180 / pi + 360) % 360
+
+    def is_within_beamwidth(self, dir1, dir2):
+        beam_diff = abs(dir1 - dir2) % 360
+        min_diff = min(beam_diff, 360 - beam_diff)
+        return min_diff <= self.beamwidth
+
+    def calculate_remark(self, bearing, dir_source, beam_source):
+        max_beam_source = (dir_source + beam_source) % 360
+        min_beam_source = (dir_source - beam_source + 360) % 360
+
+        in_direction = (
+            min_beam_source <= bearing <= max_beam_source
+            or (bearing + 360 if bearing < min_beam_source else bearing)
+            <= max_beam_source
+        )
+
+        return "Indirection" if in_direction else "NotIndirection"
+
+    def arrays(self):
+        """Coordinates, azimuths and cell name codes of every mcom row."""
+        if self._arrays is None:
+            names = self.data["Cell_Name"].to_numpy()
+            codes, _ = pd.factorize(names)
+            lat, lon, azimuth = coordinate_arrays(self.data, self.coordinates)
+            self._arrays = {
+                "lat": lat,
+                "lon": lon,
+                "dir": azimuth,
+                "names": names,
+                "codes": codes,
+            }
+        return self._arrays
+
+    def candidate_block(self, sources):
+        """
+        Candidate mask and approximate distances for a block of source rows.
+
+        Every target that ``find_nearest_neighbors`` could accept is in the
+        mask: another cell, at another position, within the beamwidth and
+        in direction. The bearing keeps the degrees-as-radians arguments of
+        ``calculate_bearing`` so the same targets come out.
+        """
+        arrays = self.arrays()
+        lat, lon, azimuth = arrays["lat"], arrays["lon"], arrays["dir"]
+        lat1 = lat[sources, None]
+        lon1 = lon[sources, None]
+        dir1 = azimuth[sources, None]
+
+        beam_diff = np.abs(dir1 - azimuth) % 360
+        mask = np.minimum(beam_diff, 360 - beam_diff) <= self.beamwidth
+        mask &= arrays["codes"][sources, None] != arrays["codes"]
+        mask &= (lat1 != lat) | (lon1 != lon)
+
+        bearing = np.arctan2(
+            np.sin(lon - lon1) * np.cos(lat),
+            np.cos(lat1) * np.sin(lat)
+            - np.sin(lat1) * np.cos(lat) * np.cos(lon - lon1),
+        )
+        bearing = (bearing * 180 / np.pi + 360) % 360
+        max_beam = (dir1 + self.beamwidth) % 360 + self.tolerance
+        min_beam = (dir1 - self.beamwidth + 360) % 360 - self.tolerance
+        mask &= ((min_beam <= bearing) & (bearing <= max_beam)) | (
+            (min_beam <= bearing - 360) & (bearing - 360 <= max_beam)
+        )
+
+        rlat1, rlon1, rlat, rlon = map(np.radians, (lat1, lon1, lat, lon))
+        a = (
+            np.sin((rlat - rlat1) / 2) ** 2
+            + np.cos(rlat1) * np.cos(rlat) * np.sin((rlon - rlon1) / 2) ** 2
+        )
+        distance = self.earth_radius * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return mask, distance
+
+    def exact_neighbors(self, source, targets, distance):
+        """
+        The three nearest accepted targets, checked with the scalar methods.
+
+        Targets are visited by approximate distance and the walk stops once
+        no remaining target can round to a distance at or below the third
+        accepted one, so ties on distance still sort by cell name.
+        """
+        arrays = self.arrays()
+        lat, lon, azimuth = arrays["lat"], arrays["lon"], arrays["dir"]
+        lat1, lon1, dir1 = lat[source], lon[source], azimuth[source]
+
+        neighbors = []
+        for target in targets[np.argsort(distance[targets], kind="stable")]:
+            if len(neighbors) >= 3:
+                third = sorted(neighbors)[2][0]
+                if distance[target] > third + 0.005 + self.tolerance:
+                    break
+
+            target_distance = self.calculate_distance(
+                lat1, lon1, lat[target], lon[target]
+            )
+            if target_distance == 0 or not self.is_within_beamwidth(
+                dir1, azimuth[target]
+            ):
+                continue
+            bearing = self.calculate_bearing(lat1, lon1, lat[target], lon[target])
+            if self.calculate_remark(bearing, dir1, self.beamwidth) == "Indirection":
+                neighbors.append((target_distance, arrays["names"][target]))
+
+        return sorted(neighbors)[:3]
+
+    def nearest_neighbors(self, cell_names):
+        """``{cell_name: find_nearest_neighbors(cell_name)}`` in NumPy blocks."""
+        arrays = self.arrays()
+        # Like the .iloc[0] lookup, a cell is measured from its first row
+        first = pd.Series(arrays["names"]).drop_duplicates()
+        first_row = dict(zip(first.to_numpy(), first.index))
+
+        cell_names = list(cell_names)
+        step = max(1, self.block_pairs // max(len(arrays["names"]), 1))
+        result = {}
+        for start in range(0, len(cell_names), step):
+            block = cell_names[start : start + step]
+            sources = np.array([first_row[name] for name in block], dtype=np.int64)
+            mask, distance = self.candidate_block(sources)
+            for row, (name, source) in enumerate(zip(block, sources)):
+                result[name] = self.exact_neighbors(
+                    source, np.flatnonzero(mask[row]), distance[row]
+                )
+        return result
+
+    def find_nearest_neighbors(self, cell_name):
+        return self.nearest_neighbors([cell_name])[cell_name]
+
+    @staticmethod
+    def isd_from(neighbors):
+        if len(neighbors) < 2:
+            return None
+        distances = [dist for dist, _ in neighbors[:2]]
+        return round(sum(distances) / len(distances), 2)
+
+    def calculate_isd(self, cell_name):
+        return self.isd_from(self.find_nearest_neighbors(cell_name))
+
+    def calculate_all_isd(self, site_id):
+        filtered_data = self.data[self.data["NE_ID"] == site_id]
+        # The first row of each cell, in the order of Cell_Name.unique()
+        cells = filtered_data.drop_duplicates("Cell_Name")
+        cells = cells[cells["Cell_Name"].notna()]
+        neighbors = self.nearest_neighbors(cells["Cell_Name"])
+
+        isd_data = []
+        for cell in cells.to_dict("records"):
+            isd_value = self.isd_from(neighbors[cell["Cell_Name"]])
+            if isd_value is not None:
+                isd_data.append(
+                    {
+                        "siteid": cell["Site_ID"],
+                        "neid": cell["NE_ID"],
+                        "eutrancell": cell["Cell_Name"],
+                        "isd": isd_value,
+                        "enbid": cell.get("eNBId"),
+                        "ci": cell.get("cellId"),
+                    }
+                )
+
+        return pd.DataFrame(isd_data)
+
+
+class NeighborSectors:
+    # Radius queries and the vectorized bearing masks are widened by this
+    # much; every candidate is then rechecked with the scalar methods
+    tolerance = 1e-6
+    earth_radius = 6371  # in kilometers
+
+    def __init__(self, data, coordinates=None):
+        self.data = data
+        self.coordinates = coordinates
+        self.beamwidth = 60
+        self.max_distance = 15  # in kilometers
+        self.min_distance = 0  # minimum distance in kilometers
+        self._band_trees = None
+        self._arrays = None
+
+    def calculate_distance(self, lat1, lon1, lat2, lon2):
+        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+        a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+        c = 2 * atan2(sqrt(a), sqrt(1 - a))
+        distance = 6371 * c  # Earth radius in kilometers
+        return distance
+
+    def calculate_bearing(self, lat1, lon1, lat2, lon2):
+        bearing = atan2(
+            sin(lon2 - lon1) * cos(lat2),
+            cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(lon2 - lon1),
+        )
+        return (bearing * 180 / pi + 360) % 360
+
+    def calculate_remark(
+        self, bearing, dir_source, beam_source, dir_target, beam_target
+    ):
+        max_beam_source = (dir_source + beam_source) % 360
+        min_beam_source = (dir_source - beam_source + 360) % 360
+        max_beam_target = (dir_target + beam_target) % 360
+        min_beam_target = (dir_target - beam_target + 360) % 360
+
+        in_direction_source = (
+            min_beam_source <= bearing <= max_beam_source
+            or (bearing + 360 if bearing < min_beam_source else bearing)
+            <= max_beam_source
+        )
+        in_direction_target = (
+            min_beam_target <= bearing <= max_beam_target
+            or (bearing + 360 if bearing < min_beam_target else bearing)
+            <= max_beam_target
+        )
+
+        if in_direction_source and in_direction_target:
+            return "head_to_head"
+        elif in_direction_source:
+            return "indirection_source"
+        elif in_direction_target:
+            return "indirection_target"
+        else:
+            return "nondirectional"
+
+    def arrays(self):
+        if self._arrays is None:
+            lat, lon, azimuth = coordinate_arrays(self.data, self.coordinates)
+            self._arrays = {
+                "lat": lat,
+                "lon": lon,
+                "dir": azimuth,
+                "names": self.data["Cell_Name"].to_numpy(),
+                "neids": self.data["NE_ID"].to_numpy(),
+            }
+        return self._arrays
+
+    def band_trees(self):
+        """
+        A haversine BallTree per LTE band, built once per dataset.
+
+        Maps each band to its tree and the data rows it holds. Rows without
+        coordinates are left out; they can never be within range.
+        """
+        if self._band_trees is None:
+            arrays = self.arrays()
+            located = ~(np.isnan(arrays["lat"]) | np.isnan(arrays["lon"]))
+            self._band_trees = {}
+            for band, rows in self.data.groupby("LTE", sort=False).indices.items():
+                rows = rows[located[rows]]
+                if rows.size:
+                    points = np.radians(
+                        np.column_stack([arrays["lat"][rows], arrays["lon"][rows]])
+                    )
+                    self._band_trees[band] = (
+                        BallTree(points, metric="haversine"),
+                        rows,
+                    )
+        return self._band_trees
+
+    def in_direction(self, bearing, direction):
+        """Loose vectorized form of the in-direction test in calculate_remark."""
+        max_beam = (direction + self.beamwidth) % 360 + self.tolerance
+        min_beam = (direction - self.beamwidth + 360) % 360 - self.tolerance
+        return ((min_beam <= bearing) & (bearing <= max_beam)) | (
+            (min_beam <= bearing - 360) & (bearing - 360 <= max_beam)
+        )
+
+    def candidate_targets(self, source):
+        """
+        Same-band rows that may be head to head with the source row.
+
+        The band's BallTree returns the rows within ``max_distance``; the
+        bearing test then runs on just those, keeping the degrees-as-radians
+        arguments of ``calculate_bearing``. Rows come back in data order.
+        """
+        arrays = self.arrays()
+        lat, lon, azimuth = arrays["lat"], arrays["lon"], arrays["dir"]
+        band = self.band_trees().get(self.data["LTE"].iat[source])
+        if band is None or np.isnan(lat[source]) or np.isnan(lon[source]):
+            return np.array([], dtype=np.int64)
+
+        tree, rows = band
+        radius = (self.max_distance + self.tolerance) / self.earth_radius
+        hits = tree.query_radius(np.radians([[lat[source], lon[source]]]), r=radius)[0]
+        targets = np.sort(rows[hits])
+        targets = targets[arrays["names"][targets] != arrays["names"][source]]
+
+        lat1, lon1 = lat[source], lon[source]
+        lat2, lon2 = lat[targets], lon[targets]
+        bearing = np.arctan2(
+            np.sin(lon2 - lon1) * np.cos(lat2),
+            np.cos(lat1) * np.sin(lat2)
+            - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1),
+        )
+        bearing = (bearing * 180 / np.pi + 360) % 360
+        head_to_head = self.in_direction(bearing, azimuth[source]) & self.in_direction(
+            bearing, azimuth[targets]
+        )
+        return targets[head_to_head]
+
+    def find_neighbor_sectors(self, neid):
+        arrays = self.arrays()
+        lat, lon, azimuth = arrays["lat"], arrays["lon"], arrays["dir"]
+        neighbors = []
+
+        for source in np.flatnonzero(self.data["NE_ID"] == neid):
+            source_row = self.data.iloc[source]
+            potential_neighbors = []
+            for target in self.candidate_targets(source):
+                distance = self.calculate_distance(
+                    lat[source], lon[source], lat[target], lon[target]
+                )
+                if distance <= self.min_distance or distance > self.max_distance:
+                    continue
+
+                bearing_from_source = self.calculate_bearing(
+                    lat[source], lon[source], lat[target], lon[target]
+                )
+                bearing_from_target = (bearing_from_source - 180 + 360) % 360
+
+                remark = self.calculate_remark(
+                    bearing_from_source,
+                    azimuth[source],
+                    self.beamwidth,
+                    azimuth[target],
+                    self.beamwidth,
+                )
+
+                if remark == "head_to_head":
+                    potential_neighbors.append(
+                        {
+                            "siteid": source_row["Site_ID"],
+                            "neid": source_row["NE_ID"],
+                            "cellname": source_row["Cell_Name"],
+                            "adjneid": arrays["neids"][target],
+                            "adjcellname": arrays["names"][target],
+                            "distance": round(distance, 2),
+                            "bearing_from_source": round(bearing_from_source, 2),
+                            "bearing_from_target": round(bearing_from_target, 2),
+                            "remark": remark,
+                        }
+                    )
+
+            potential_neighbors = sorted(
+                potential_neighbors, key=lambda x: x["distance"]
+            )[:3]
+            neighbors.extend(potential_neighbors)
+
+        return pd.DataFrame(neighbors)
@@ -0,0 +1,106 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+from isdcalc import (
+    COORDINATE_COLUMNS,
+    InterSiteDistance,
+    NeighborSectors,
+    coordinate_arrays,
+)
+
+# Frame columns the calculators read besides the shared coordinates
+WORKER_COLUMNS = ["Site_ID", "NE_ID", "Cell_Name", "LTE", "eNBId", "cellId"]
+
+
+class SharedCoordinates:
+    """
+    Latitude, Longitude and Dir of every row in one shared memory block.
+
+    Workers attach to the block by name instead of receiving their own
+    pickled copy. The creating process unlinks it on exit.
+    """
+
+    def __init__(self, data):
+        self.shape = (len(COORDINATE_COLUMNS), len(data))
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=max(math.prod(self.shape) * 8, 1)
+        )
+        array = np.ndarray(self.shape, dtype=float, buffer=self.shm.buf)
+        array[:] = coordinate_arrays(data)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shm.close()
+        self.shm.unlink()
+
+
+_worker = {}
+
+
+def _init_worker(name, shape, data):
+    shm = shared_memory.SharedMemory(name=name)
+    coordinates = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    coordinates.flags.writeable = False
+    _worker.update(shm=shm, coordinates=coordinates, data=data)
+
+
+def _calculator(task):
+    if task not in _worker:
+        calculator = InterSiteDistance if task == "isd" else NeighborSectors
+        _worker[task] = calculator(_worker["data"], _worker["coordinates"])
+    return _worker[task]
+
+
+def _run_chunk(task, neids):
+    calculator = _calculator(task)
+    if task == "isd":
+        frames = [calculator.calculate_all_isd(neid) for neid in neids]
+    else:
+        frames = [calculator.find_neighbor_sectors(neid) for neid in neids]
+    frames = [frame for frame in frames if not frame.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run_parallel(data, task, neids, workers=None, chunk_size=None):
+    """
+    Run ``task`` ("isd" or "neighbors") for ``neids`` on a process pool.
+
+    NE_IDs are split into chunks, a few per worker, and every worker builds
+    its calculator once over the shared coordinates. Yields
+    ``(chunk index, NE_IDs in the chunk, result)`` as chunks finish, so
+    callers can show partial results and restore the input order.
+    """
+    neids = list(neids)
+    if not neids:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(neids))
+    chunk_size = chunk_size or math.ceil(len(neids) / (workers * 4))
+    chunks = [neids[i : i + chunk_size] for i in range(0, len(neids), chunk_size)]
+
+    with SharedCoordinates(data) as coordinates, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            coordinates.name,
+            coordinates.shape,
+            data[data.columns.intersection(WORKER_COLUMNS)],
+        ),
+    ) as pool:
+        futures = {
+            pool.submit(_run_chunk, task, chunk): index
+            for index, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            yield index, len(chunks[index]), future.result()
@@ -0,0 +1,215 @@
+import hashlib
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+MCOM_COLUMNS = [
+    "Site_ID",
+    "NODE_ID",
+    "NE_ID",
+    "Cell_Name",
+    "Longitude",
+    "Latitude",
+    "Dir",
+    "Ant_BW",
+    "Ant_Size",
+    "cellId",
+    "eNBId",
+    "KABUPATEN",
+    "LTE",
+]
+GSMMCOM_COLUMNS = ["Site ID", "NE_ID", "Cell", "Cell_Type", "KABUPATEN"]
+
+# Table -> (columns kept in memory, indexed keys); a tuple key is composite
+MASTER_TABLES = {
+    "mcom": (MCOM_COLUMNS, ["Site_ID", "NE_ID", "Cell_Name", ("eNBId", "cellId")]),
+    "gsmmcom": (GSMMCOM_COLUMNS, ["Site ID", "NE_ID", "Cell"]),
+}
+
+
+class MasterTable:
+    """
+    One master-data table held as columns with a hash index per key.
+
+    Each index maps a key value to the row positions holding it, so a
+    lookup is a few dict hits and one ``take``. Results keep the table's
+    row order and are fresh frames the caller may modify.
+    """
+
+    def __init__(self, frame, keys):
+        self.frame = frame.reset_index(drop=True)
+        self.indexes = {}
+        for key in keys:
+            columns = list(key) if isinstance(key, tuple) else key
+            self.indexes[key] = self.frame.groupby(
+                columns, sort=False, dropna=True
+            ).indices
+
+    def rows(self, positions, columns=None):
+        positions = np.sort(np.concatenate(positions)) if positions else []
+        frame = self.frame if columns is None else self.frame[columns]
+        return frame.take(positions).reset_index(drop=True)
+
+    def lookup(self, key, values, columns=None):
+        """Rows whose ``key`` equals any of ``values``."""
+        index = self.indexes[key]
+        positions = [index[value] for value in dict.fromkeys(values) if value in index]
+        return self.rows(positions, columns)
+
+    def contains(self, key, patterns, columns=None):
+        """Rows whose ``key`` contains any of ``patterns``, like ``LIKE '%p%'``."""
+        index = self.indexes[key]
+        patterns = [str(pattern) for pattern in patterns]
+        positions = [
+            rows
+            for value, rows in index.items()
+            if any(pattern in str(value) for pattern in patterns)
+        ]
+        return self.rows(positions, columns)
+
+
+class McomService:
+    """
+    Process-wide, indexed copy of mcom and gsmmcom.
+
+    Tables are read once on first use and then answered from memory. A
+    daemon thread checks a change signature every ``refresh_interval``
+    seconds and swaps in a freshly loaded table when it moves; readers
+    keep using the previous snapshot until then. The signature is the
+    PostgreSQL write counter of the table, or a checksum of its rows on
+    databases without one.
+    """
+
+    def __init__(self, engine, refresh_interval=300):
+        self.engine = engine
+        self.refresh_interval = refresh_interval
+        self._tables = {}
+        self._signatures = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def write_counter(self, name):
+        """Rows inserted, updated and deleted so far, or None off PostgreSQL."""
+        query = text(
+            """
+            SELECT n_tup_ins + n_tup_upd + n_tup_del
+            FROM pg_stat_user_tables
+            WHERE relname = :table
+            """
+        )
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(query, {"table": name}).scalar()
+        except Exception:
+            return None
+
+    def read(self, name):
+        columns, _ = MASTER_TABLES[name]
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        return pd.read_sql(text(f"SELECT {quoted} FROM {name}"), self.engine)
+
+    @staticmethod
+    def checksum(frame):
+        hashes = pd.util.hash_pandas_object(frame, index=False)
+        return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()
+
+    def load(self, name, frame=None):
+        _, keys = MASTER_TABLES[name]
+        # Read the counter first, so a write during the read triggers a reload
+        signature = self.write_counter(name)
+        if frame is None:
+            frame = self.read(name)
+        if signature is None:
+            signature = self.checksum(frame)
+        table = MasterTable(frame, keys)
+        with self._lock:
+            self._tables[name] = table
+            self._signatures[name] = signature
+        return table
+
+    def table(self, name):
+        table = self._tables.get(name)
+        if table is None:
+            table = self.load(name)
+            self.start()
+        return table
+
+    def lookup(self, name, key, values, columns=None, contains=False):
+        """Rows of table ``name`` matching ``values`` on ``key``; see MasterTable."""
+        table = self.table(name)
+        if contains:
+            return table.contains(key, values, columns)
+        return table.lookup(key, values, columns)
+
+    def refresh(self):
+        """Reload every loaded table whose signature changed."""
+        for name in list(self._tables):
+            counter = self.write_counter(name)
+            if counter is not None:
+                if counter != self._signatures.get(name):
+                    self.load(name)
+                continue
+            # Without a write counter compare the rows themselves, which also
+            # catches updates that keep the row count
+            frame = self.read(name)
+            if self.checksum(frame) != self._signatures.get(name):
+                self.load(name, frame)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None or not self.refresh_interval:
+                return
+            self._thread = threading.Thread(
+                target=self._watch, name="mcom-refresh", daemon=True
+            )
+        self._thread.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing mcom: {e}")
+
+    @property
+    def mcom(self):
+        return self.table("mcom")
+
+    @property
+    def gsmmcom(self):
+        return self.table("gsmmcom")
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def mcom_service(engine):
+    """The shared McomService of a database, created on first use."""
+    key = str(engine.url)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = McomService(engine)
+        return _services[key]
+
+
+def mcom_lookup(
+    engine, name, key, values, columns=None, *, contains=False, report=print
+):
+    """
+    McomService.lookup on the shared service of ``engine``.
+
+    Errors are passed to ``report`` (``st.error`` on the pages) and give an
+    empty frame, as the SQL fetches do.
+    """
+    try:
+        return mcom_service(engine).lookup(
+            name, key, values, columns, contains=contains
+        )
+    except Exception as e:
+        report(f"Error fetching data: {e}")
+        return pd.DataFrame()
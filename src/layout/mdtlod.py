@@ -0,0 +1,265 @@
+import json
+
+import numpy as np
+import pandas as pd
+from branca.element import Template
+from folium.map import Layer
+from geofeatures import compact
+
+MAX_LEVEL = 20
+MIN_LEVEL = 8
+# A level-L quadkey cell is 256 / 2**LEVEL_OFFSET px wide at zoom L - LEVEL_OFFSET
+LEVEL_OFFSET = 5
+LOD_COLUMNS = ["lat_grid", "long_grid", "sample", "rsrp_mean", "rsrq_mean", "ci"]
+
+
+def clamp_level(level):
+    return int(np.clip(level, MIN_LEVEL, MAX_LEVEL))
+
+
+def lod_level(zoom):
+    """Quadkey level drawn at a map zoom, about 8 px per cell."""
+    return clamp_level(zoom + LEVEL_OFFSET)
+
+
+def quadkey_tiles(lat, lon, level):
+    """
+    Tile x and y of the level-``level`` quadkey holding each point.
+
+    Truncating a bin's ``quadkey20`` to ``level`` digits names the same
+    tile; it is derived from the grid coordinates here because the stored
+    Float cannot hold all 20 base-4 digits exactly.
+    """
+    size = 2**level
+    lat = np.radians(np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511))
+    x = (np.asarray(lon, dtype=float) + 180) / 360 * size
+    y = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2 * size
+    return (
+        np.clip(x.astype(np.int64), 0, size - 1),
+        np.clip(y.astype(np.int64), 0, size - 1),
+    )
+
+
+def aggregate_level(frame, level):
+    """
+    MDT bins merged into level-``level`` quadkey cells.
+
+    RSRP and RSRQ are sample-weighted means over the bins that report them,
+    ``sample`` is the total, and ``ci`` is the cell with the most samples
+    in the quadkey. Returns one row per occupied quadkey with its tile
+    ``x`` and ``y``.
+    """
+    frame = frame.dropna(subset=["lat_grid", "long_grid"])
+    x, y = quadkey_tiles(frame["lat_grid"], frame["long_grid"], level)
+    keys, tiles = pd.factorize(x * 2**level + y, sort=True)
+    weights = pd.to_numeric(frame["sample"], errors="coerce").fillna(0).to_numpy()
+
+    result = {"x": tiles // 2**level, "y": tiles % 2**level}
+    result["sample"] = np.bincount(keys, weights=weights, minlength=len(tiles))
+    result["bins"] = np.bincount(keys, minlength=len(tiles))
+    for column in ["rsrp_mean", "rsrq_mean"]:
+        values = pd.to_numeric(frame[column], errors="coerce").to_numpy()
+        reported = ~np.isnan(values)
+        total = np.bincount(
+            keys[reported],
+            weights=values[reported] * weights[reported],
+            minlength=len(tiles),
+        )
+        weight = np.bincount(
+            keys[reported], weights=weights[reported], minlength=len(tiles)
+        )
+        result[column] = np.divide(
+            total, weight, out=np.full(len(tiles), np.nan), where=weight > 0
+        )
+
+    samples = pd.DataFrame({"key": keys, "ci": frame["ci"].to_numpy(), "w": weights})
+    dominant = (
+        samples.groupby(["key", "ci"], sort=False)["w"]
+        .sum()
+        .reset_index()
+        .sort_values(["key", "w"], ascending=[True, False], kind="stable")
+        .drop_duplicates("key")
+    )
+    result["ci"] = pd.Series(dominant["ci"].to_numpy(), index=dominant["key"]).reindex(
+        np.arange(len(tiles))
+    )
+    return pd.DataFrame(result).reset_index(drop=True)
+
+
+class LodPyramid:
+    """Quadkey aggregates of one MDT frame, built per level on first use."""
+
+    def __init__(self, frame):
+        self.frame = frame[LOD_COLUMNS]
+        self.levels = {}
+
+    def level(self, level):
+        level = clamp_level(level)
+        if level not in self.levels:
+            self.levels[level] = aggregate_level(self.frame, level)
+        return self.levels[level]
+
+    def window(self, level, west, south, east, north):
+        """Cells of ``level`` overlapping a lon/lat bounding box."""
+        level = clamp_level(level)
+        cells = self.level(level)
+        x0, y0 = quadkey_tiles([north], [west], level)
+        x1, y1 = quadkey_tiles([south], [east], level)
+        inside = cells["x"].between(x0[0], x1[0]) & cells["y"].between(y0[0], y1[0])
+        return cells[inside]
+
+
+def lod_json(cells, level):
+    """Compact column arrays of ``cells`` for LodGridLayer."""
+    data = {"level": level}
+    data.update(
+        {
+            column: compact(cells[column])
+            for column in ["x", "y", "sample", "rsrp_mean", "rsrq_mean", "ci"]
+        }
+    )
+    return json.dumps(data, separators=(",", ":"))
+
+
+class LodGridLayer(Layer):
+    """
+    MDT layer that loads the quadkey level matching the map zoom.
+
+    On every zoom or pan it fetches the cells of ``lod_level(zoom)`` inside
+    the view from ``url`` (a template with ``{level}``) and redraws them on
+    one canvas renderer, so a cluster-wide view only draws a few thousand
+    coarse cells and full-resolution bins appear as the user zooms in.
+    Cells are coloured by dominant CI from ``ci_colors`` or by RSRP from
+    ``rsrp_ranges``. Failed requests are logged to the browser console and
+    reported in a box on the map.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = (function() {
+            var options = {{ this.options }};
+            var map = {{ this._parent.get_name() }};
+            var renderer = L.canvas({padding: 0.5});
+            var layer = L.layerGroup();
+            var ciColors = {};
+            options.ci_colors.forEach(function(pair) {
+                ciColors[Number(pair[0])] = pair[1];
+            });
+            var color = function(data, i) {
+                if (options.color_by_ci) {
+                    return ciColors[Number(data.ci[i])] || "black";
+                }
+                var rsrp = data.rsrp_mean[i];
+                for (var r = 0; r < options.rsrp_ranges.length; r++) {
+                    if (rsrp !== null && rsrp >= options.rsrp_ranges[r][0]) {
+                        return options.rsrp_ranges[r][1];
+                    }
+                }
+                return "red";
+            };
+            var lat = function(y, size) {
+                var n = Math.PI * (1 - 2 * y / size);
+                return Math.atan(Math.sinh(n)) * 180 / Math.PI;
+            };
+            var popup = function(data, i) {
+                return "CI: " + data.ci[i] + "<br>RSRP: " + data.rsrp_mean[i]
+                    + " dBm<br>RSRQ: " + data.rsrq_mean[i]
+                    + " dB<br>Samples: " + data.sample[i];
+            };
+            var status = L.control({position: "bottomleft"});
+            status.onAdd = function() {
+                return L.DomUtil.create("div", "leaflet-control");
+            };
+            var showError = function(message) {
+                var box = status.getContainer();
+                box.style.cssText = "background: white; color: red; padding: 2px 6px;";
+                box.textContent = message;
+            };
+            var request = 0;
+            var refresh = function() {
+                if (!map.hasLayer(layer)) {
+                    return;
+                }
+                var zoom = map.getZoom();
+                var level = Math.min(
+                    options.max_level,
+                    Math.max(options.min_level, zoom + options.level_offset)
+                );
+                var url = options.url.replace("{level}", level)
+                    + "?bbox=" + map.getBounds().toBBoxString();
+                var current = ++request;
+                fetch(url).then(function(response) {
+                    if (!response.ok) {
+                        throw new Error("HTTP " + response.status);
+                    }
+                    return response.json();
+                }).then(function(data) {
+                    if (current !== request) {
+                        return;
+                    }
+                    status.remove();
+                    layer.clearLayers();
+                    var size = Math.pow(2, data.level);
+                    for (var i = 0; i < data.x.length; i++) {
+                        var fill = color(data, i);
+                        var cell = L.rectangle(
+                            [[lat(data.y[i] + 1, size), data.x[i] / size * 360 - 180],
+                             [lat(data.y[i], size), (data.x[i] + 1) / size * 360 - 180]],
+                            {renderer: renderer, color: fill, fillColor: fill,
+                             weight: 0, fillOpacity: 1}
+                        );
+                        cell.bindPopup(popup.bind(null, data, i));
+                        layer.addLayer(cell);
+                    }
+                }).catch(function(error) {
+                    if (current !== request) {
+                        return;
+                    }
+                    console.error("MDT cells: " + url, error);
+                    status.addTo(map);
+                    showError("MDT cells could not be loaded: " + error.message);
+                });
+            };
+            map.on("zoomend moveend", refresh);
+            layer.on("add", refresh);
+            layer.on("remove", function() {
+                status.remove();
+            });
+            return layer;
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self,
+        url,
+        ci_colors,
+        color_by_ci=True,
+        rsrp_ranges=(),
+        name=None,
+        overlay=True,
+        control=True,
+        show=True,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "LodGridLayer"
+        self.options = json.dumps(
+            {
+                "url": url,
+                "ci_colors": [
+                    [ci, color]
+                    for ci, color in zip(
+                        pd.to_numeric(pd.Series(list(ci_colors)), errors="coerce"),
+                        ci_colors.values(),
+                    )
+                    if not pd.isna(ci)
+                ],
+                "color_by_ci": color_by_ci,
+                "rsrp_ranges": [list(pair) for pair in rsrp_ranges],
+                "min_level": MIN_LEVEL,
+                "max_level": MAX_LEVEL,
+                "level_offset": LEVEL_OFFSET,
+            }
+        )
@@ -0,0 +1,303 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import toml
+from flask import Flask, Response, abort, request
+from geofeatures import RSRP_RANGES, bin_colors
+from mdtlod import LOD_COLUMNS, LodPyramid, clamp_level, lod_json
+from omegaconf import OmegaConf
+from PIL import Image, ImageColor, ImageDraw
+from werkzeug.serving import make_server
+
+TILE_SIZE = 256
+# Side of one MDT grid bin, in degrees
+BIN_SIZE = 0.00033
+
+RSRQ_RANGES = [
+    (-10, "blue"),
+    (-15, "#93FC7C"),
+    (-20, "yellow"),
+]
+SAMPLE_RANGES = [
+    (100, "blue"),
+    (50, "#14380A"),
+    (20, "#93FC7C"),
+    (5, "yellow"),
+]
+
+# Layer -> (ltemdt column, color ranges, color below the ranges, per-pixel aggregation)
+TILE_LAYERS = {
+    "rsrp": ("rsrp_mean", RSRP_RANGES, "red", "mean"),
+    "rsrq": ("rsrq_mean", RSRQ_RANGES, "red", "mean"),
+    "sample": ("sample", SAMPLE_RANGES, "red", "sum"),
+}
+
+
+def mercator(lat, lon):
+    """Web Mercator pixel position at zoom 0, where the world is one tile."""
+    lat = np.radians(np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511))
+    x = (np.asarray(lon, dtype=float) + 180) / 360 * TILE_SIZE
+    y = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2 * TILE_SIZE
+    return x, y
+
+
+def data_version(frame):
+    """Short content hash of the MDT rows, part of every tile's cache key."""
+    columns = list(dict.fromkeys(LOD_COLUMNS + [c for c, *_ in TILE_LAYERS.values()]))
+    hashes = pd.util.hash_pandas_object(frame[columns], index=False)
+    return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()[:16]
+
+
+class TileRenderer:
+    """
+    Rasterizes MDT grid values into 256 px slippy-map PNG tiles.
+
+    Bins falling on the same pixel are first reduced to one value with
+    ``np.bincount``, so a tile costs one pass over the bins plus at most one
+    draw per pixel, however many bins the cluster has.
+    """
+
+    def __init__(self, frame):
+        frame = frame.dropna(subset=["lat_grid", "long_grid"])
+        self.x, self.y = mercator(frame["lat_grid"], frame["long_grid"])
+        self.values = {
+            layer: pd.to_numeric(frame[column], errors="coerce").to_numpy(float)
+            for layer, (column, *_) in TILE_LAYERS.items()
+        }
+
+    def render(self, layer, z, x, y):
+        _, ranges, default, how = TILE_LAYERS[layer]
+        scale = 2**z
+        side = max(1.0, BIN_SIZE / 360 * TILE_SIZE * scale)
+        half = side / 2
+        px = self.x * scale - x * TILE_SIZE
+        py = self.y * scale - y * TILE_SIZE
+        values = self.values[layer]
+        inside = (
+            (px > -half)
+            & (px < TILE_SIZE + half)
+            & (py > -half)
+            & (py < TILE_SIZE + half)
+            & ~np.isnan(values)
+        )
+        px, py, values = px[inside], py[inside], values[inside]
+
+        column = np.clip(px.astype(int), 0, TILE_SIZE - 1)
+        row = np.clip(py.astype(int), 0, TILE_SIZE - 1)
+        bin_pixels = row * TILE_SIZE + column
+        totals = np.bincount(bin_pixels, weights=values, minlength=TILE_SIZE**2)
+        counts = np.bincount(bin_pixels, minlength=TILE_SIZE**2)
+        pixels = np.flatnonzero(counts)
+        values = totals[pixels]
+        if how == "mean":
+            values = values / counts[pixels]
+
+        colors = bin_colors(values, ranges, default)
+        palette, codes = np.unique(colors, return_inverse=True)
+        rgba = np.array(
+            [ImageColor.getrgb(color) + (255,) for color in palette], dtype=np.uint8
+        ).reshape(-1, 4)
+
+        if side <= 1.5:
+            image = np.zeros((TILE_SIZE * TILE_SIZE, 4), dtype=np.uint8)
+            image[pixels] = rgba[codes]
+            image = Image.fromarray(image.reshape(TILE_SIZE, TILE_SIZE, 4), "RGBA")
+        else:
+            image = Image.new("RGBA", (TILE_SIZE, TILE_SIZE), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            # Bins larger than a pixel are drawn at the mean position of the
+            # bins on that pixel, which may lie past the tile edge
+            bins = counts[pixels]
+            centre_x = np.bincount(bin_pixels, weights=px, minlength=TILE_SIZE**2)
+            centre_y = np.bincount(bin_pixels, weights=py, minlength=TILE_SIZE**2)
+            centre_x = centre_x[pixels] / bins
+            centre_y = centre_y[pixels] / bins
+            for cx, cy, code in zip(centre_x, centre_y, codes):
+                draw.rectangle(
+                    [cx - half, cy - half, cx + half, cy + half],
+                    fill=tuple(rgba[code]),
+                )
+
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue()
+
+
+class TileServer:
+    """
+    Local HTTP endpoint serving MDT tiles for folium TileLayers.
+
+    Frames are published under their data version; tiles are rendered on
+    first request and kept on disk under
+    ``cache_dir/<version>/<layer>/<z>/<x>/<y>.png``, so they outlive the
+    process and are never served for changed data. The same versions are
+    served as quadkey level-of-detail cells, as JSON, for LodGridLayer.
+
+    Only the ``max_versions`` most recently published versions are kept,
+    in memory and on disk. ``public_url`` is the address browsers reach
+    the server at; without it URLs point at localhost, which only works
+    when the browser runs on the Streamlit host.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8765,
+        cache_dir=None,
+        public_url=None,
+        max_versions=8,
+    ):
+        self.host = host
+        self.port = port
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "mdt-tiles")
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.base_url = self.public_url or f"http://localhost:{port}"
+        self.max_versions = max_versions
+        # version -> (TileRenderer, LodPyramid), least recently published first
+        self.published = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.app = Flask(__name__)
+        self.app.add_url_rule(
+            "/tiles/<layer>/<version>/<int:z>/<int:x>/<int:y>.png",
+            view_func=self.serve,
+        )
+        self.app.add_url_rule("/lod/<version>/<int:level>", view_func=self.serve_lod)
+
+    def publish(self, frame):
+        """Make ``frame`` available for tiles; returns its data version."""
+        version = data_version(frame)
+        with self._lock:
+            if version in self.published:
+                self.published.move_to_end(version)
+            else:
+                self.published[version] = (TileRenderer(frame), LodPyramid(frame))
+                while len(self.published) > self.max_versions:
+                    self.published.popitem(last=False)
+                self.prune_cache()
+        self.start()
+        return version
+
+    def prune_cache(self):
+        """
+        Delete cached tiles beyond the ``max_versions`` newest versions.
+
+        Published versions are always kept; tiles left by earlier processes
+        fill the remaining slots, most recently written first.
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        stale = sorted(
+            (entry for entry in entries if entry.name not in self.published),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in stale[max(self.max_versions - len(self.published), 0) :]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def lookup(self, version):
+        """The ``(TileRenderer, LodPyramid)`` of a published version, or None."""
+        with self._lock:
+            return self.published.get(version)
+
+    def url(self, layer, version):
+        return f"{self.base_url}/tiles/{layer}/{version}/{{z}}/{{x}}/{{y}}.png"
+
+    def lod_url(self, version):
+        return f"{self.base_url}/lod/{version}/{{level}}"
+
+    def tile(self, layer, version, z, x, y):
+        path = os.path.join(self.cache_dir, version, layer, str(z), str(x), f"{y}.png")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+
+        published = self.lookup(version)
+        if published is None:
+            return None
+        png = published[0].render(layer, z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a concurrent reader never sees half a file
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(png)
+        os.replace(temp_path, path)
+        return png
+
+    def serve(self, layer, version, z, x, y):
+        if layer not in TILE_LAYERS:
+            abort(404)
+        png = self.tile(layer, version, z, x, y)
+        if png is None:
+            abort(404)
+        return Response(
+            png, mimetype="image/png", headers={"Cache-Control": "max-age=86400"}
+        )
+
+    def serve_lod(self, version, level):
+        published = self.lookup(version)
+        if published is None:
+            abort(404)
+        pyramid = published[1]
+        level = clamp_level(level)
+        try:
+            west, south, east, north = map(float, request.args["bbox"].split(","))
+        except (KeyError, ValueError):
+            cells = pyramid.level(level)
+        else:
+            cells = pyramid.window(level, west, south, east, north)
+        # The map page is served from another origin than this endpoint
+        return Response(
+            lod_json(cells, level),
+            mimetype="application/json",
+            headers={"Access-Control-Allow-Origin": "*"},
+        )
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            server = make_server(self.host, self.port, self.app, threaded=True)
+            self._thread = threading.Thread(
+                target=server.serve_forever, name="mdt-tiles", daemon=True
+            )
+        self._thread.start()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def tile_settings(path=".streamlit/secrets.toml"):
+    """
+    TileServer arguments from the ``[mdt_tiles]`` section of the secrets.
+
+    Any of host, port, public_url, cache_dir and max_versions may be set;
+    the rest keep their defaults.
+    """
+    try:
+        with open(path) as f:
+            cfg = OmegaConf.create(toml.loads(f.read()))
+    except FileNotFoundError:
+        return {}
+    settings = OmegaConf.select(cfg, "mdt_tiles")
+    return OmegaConf.to_container(settings) if settings is not None else {}
+
+
+def tile_server():
+    """The process-wide TileServer, created on first use."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = TileServer(**tile_settings())
+        return _server
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+
+class NeighborGraph:
+    """
+    Neighbor relations as a compressed sparse row graph.
+
+    Cells are numbered once; ``indptr[i]:indptr[i + 1]`` slices
+    ``indices`` to the neighbors of cell ``i``. Expansion and aggregation
+    then work on integer arrays for all source cells at once instead of
+    merging frames tier by tier.
+    """
+
+    def __init__(self, names, indptr, indices):
+        self.names = names
+        self.index = pd.Index(names)
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, sources, targets, symmetric=False):
+        """Graph of ``sources[i] -> targets[i]``, e.g. cellname/adjcellname."""
+        codes, names = pd.factorize(
+            pd.concat([pd.Series(sources), pd.Series(targets)], ignore_index=True)
+        )
+        codes = codes.reshape(2, -1)
+        edges = codes[:, (codes >= 0).all(axis=0)]
+        if symmetric:
+            edges = np.hstack([edges, edges[::-1]])
+        edges = np.unique(edges, axis=1)
+        counts = np.bincount(edges[0], minlength=len(names))
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(np.asarray(names, dtype=object), indptr, edges[1])
+
+    @classmethod
+    def from_tier(cls, tier_data, symmetric=False):
+        return cls.from_edges(
+            tier_data["cellname"], tier_data["adjcellname"], symmetric
+        )
+
+    def codes(self, cells):
+        codes = self.index.get_indexer(pd.Index(cells))
+        return codes[codes >= 0]
+
+    def neighbors(self, nodes):
+        """Position of each node's neighbors in ``nodes`` and their codes."""
+        starts = self.indptr[nodes]
+        degrees = self.indptr[nodes + 1] - starts
+        owner = np.repeat(np.arange(len(nodes)), degrees)
+        offsets = np.arange(degrees.sum()) - np.repeat(
+            np.cumsum(degrees) - degrees, degrees
+        )
+        return owner, self.indices[starts[owner] + offsets]
+
+    def expand(self, cells, depth):
+        """
+        Every cell within ``depth`` hops of each of ``cells``.
+
+        Returns ``cellname``, ``member`` and ``hop`` columns; each member
+        appears once per source at its shortest hop, and the source itself
+        is member at hop 0.
+        """
+        sources = self.codes(cells)
+        size = len(self.names)
+        source = np.arange(len(sources))
+        member = sources
+        hops = [np.zeros(len(sources), dtype=int)]
+        seen = source * size + member
+        frontier_source, frontier = source, member
+        pairs_source, pairs_member = [source], [member]
+        for hop in range(1, depth + 1):
+            owner, reached = self.neighbors(frontier)
+            keys = np.unique(frontier_source[owner] * size + reached)
+            keys = keys[~np.isin(keys, seen)]
+            if not len(keys):
+                break
+            seen = np.concatenate([seen, keys])
+            frontier_source, frontier = keys // size, keys % size
+            pairs_source.append(frontier_source)
+            pairs_member.append(frontier)
+            hops.append(np.full(len(keys), hop))
+        pairs_source = np.concatenate(pairs_source)
+        return pd.DataFrame(
+            {
+                "cellname": self.names[sources[pairs_source]],
+                "member": self.names[np.concatenate(pairs_member)],
+                "hop": np.concatenate(hops),
+            }
+        )
+
+    def aggregate(
+        self, df, cells, depth, value, cell="cellname", date="date", how="mean"
+    ):
+        """
+        ``value`` of ``df`` aggregated per date over each cell's cluster.
+
+        The cluster of a cell is every neighbor from hop 1 to ``depth``,
+        without the cell itself. ``how`` is "mean" (missing values skipped)
+        or "sum". Returns ``cellname``, ``date``, ``value`` and ``cells``,
+        the number of cluster cells that reported on the date.
+        """
+        clusters = self.expand(cells, depth)
+        clusters = clusters[clusters["hop"] > 0]
+
+        kpi = df[[cell, date, value]].dropna()
+        member_codes, member_names = pd.factorize(kpi[cell])
+        date_codes, dates = pd.factorize(kpi[date], sort=True)
+        values = np.zeros((len(member_names), len(dates)))
+        reported = np.zeros((len(member_names), len(dates)))
+        np.add.at(values, (member_codes, date_codes), kpi[value].to_numpy(float))
+        np.add.at(reported, (member_codes, date_codes), 1)
+        if how == "mean":
+            # Several rows of one cell on a date count once, at their mean
+            values = np.divide(
+                values, reported, out=np.zeros_like(values), where=reported > 0
+            )
+            reported = (reported > 0).astype(float)
+
+        rows = pd.Index(member_names).get_indexer(clusters["member"])
+        clusters = clusters[rows >= 0]
+        rows = rows[rows >= 0]
+        source_codes, source_names = pd.factorize(clusters["cellname"])
+        totals = np.zeros((len(source_names), len(dates)))
+        counts = np.zeros((len(source_names), len(dates)))
+        np.add.at(totals, source_codes, values[rows])
+        np.add.at(counts, source_codes, reported[rows])
+        if how == "mean":
+            totals = np.divide(
+                totals, counts, out=np.full_like(totals, np.nan), where=counts > 0
+            )
+
+        result = pd.DataFrame(
+            {
+                "cellname": np.repeat(np.asarray(source_names), len(dates)),
+                "date": np.tile(np.asarray(dates), len(source_names)),
+                value: totals.ravel(),
+                "cells": counts.ravel().astype(int),
+            }
+        )
+        return result[result["cells"] > 0].reset_index(drop=True)
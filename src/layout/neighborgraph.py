@@ -0,0 +1,202 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import toml
+from isdcalc import InterSiteDistance, NeighborSectors
+from omegaconf import OmegaConf
+from sklearn.neighbors import BallTree
+from sqlalchemy import create_engine, text
+from utils.gentable import CellIsd, CellNeighbor, NeighborInput
+
+# mcom column -> neighbor_inputs column, for every value the graph depends on
+INPUT_COLUMNS = {
+    "Site_ID": "site_id",
+    "NE_ID": "ne_id",
+    "Cell_Name": "cell_name",
+    "Latitude": "latitude",
+    "Longitude": "longitude",
+    "Dir": "dir",
+    "LTE": "lte",
+    "eNBId": "enbid",
+    "cellId": "cellid",
+}
+NUMERIC_COLUMNS = ["Latitude", "Longitude", "Dir", "eNBId", "cellId"]
+
+EARTH_RADIUS = 6371  # in kilometers
+# Slack on every reach below, for rounding of the stored distances
+MARGIN = 0.02
+
+
+def normalize(frame):
+    """mcom rows in one dtype per column, so snapshots compare equal."""
+    frame = frame[list(INPUT_COLUMNS)].copy()
+    for column in INPUT_COLUMNS:
+        if column in NUMERIC_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype(float)
+        else:
+            frame[column] = frame[column].astype(object).where(frame[column].notna())
+    return frame.reset_index(drop=True)
+
+
+def site_fingerprints(frame):
+    """One order-independent hash of the input rows of each site."""
+    hashes = pd.util.hash_pandas_object(frame.fillna(""), index=False)
+    return hashes.groupby(frame["Site_ID"].to_numpy()).agg(
+        lambda rows: hash(tuple(np.sort(rows.to_numpy())))
+    )
+
+
+def changed_sites(old, new):
+    """Sites that were added, removed or had any input row change."""
+    old_prints = site_fingerprints(old)
+    new_prints = site_fingerprints(new)
+    sites = old_prints.index.union(new_prints.index)
+    old_prints = old_prints.reindex(sites)
+    new_prints = new_prints.reindex(sites)
+    return set(sites[old_prints.ne(new_prints)])
+
+
+def distance_to(frame, positions):
+    """Kilometres from each row of ``frame`` to the nearest of ``positions``."""
+    distance = np.full(len(frame), np.inf)
+    positions = positions.dropna(subset=["Latitude", "Longitude"])
+    located = frame[["Latitude", "Longitude"]].notna().all(axis=1).to_numpy()
+    if positions.empty or not located.any():
+        return distance
+    tree = BallTree(
+        np.radians(positions[["Latitude", "Longitude"]].to_numpy()),
+        metric="haversine",
+    )
+    nearest, _ = tree.query(
+        np.radians(frame.loc[located, ["Latitude", "Longitude"]].to_numpy()), k=1
+    )
+    distance[located] = nearest[:, 0] * EARTH_RADIUS
+    return distance
+
+
+def in_sight(new, positions, rows):
+    """
+    Which ``rows`` of ``new`` have any of ``positions`` in their beam.
+
+    Uses the widened candidate mask of ``InterSiteDistance``, so a row is
+    only left out when none of the positions could be one of its ISD
+    neighbors.
+    """
+    calculator = InterSiteDistance(pd.concat([new, positions], ignore_index=True))
+    step = max(1, calculator.block_pairs // max(len(calculator.data), 1))
+    seen = np.zeros(len(rows), dtype=bool)
+    for start in range(0, len(rows), step):
+        mask, _ = calculator.candidate_block(rows[start : start + step])
+        seen[start : start + step] = mask[:, len(new) :].any(axis=1)
+    return seen
+
+
+def affected_neids(old, new, changed, isd):
+    """
+    NE_IDs whose neighbors or ISD may differ after ``changed`` sites moved.
+
+    Head-to-head neighbors only reach ``NeighborSectors.max_distance``. ISD
+    averages the two nearest in-direction cells, so it can only change when
+    a changed cell is within twice the stored ISD; cells without an ISD row
+    have no such bound and are recomputed when a changed cell is in their
+    beam.
+    """
+    positions = pd.concat(
+        [old[old["Site_ID"].isin(changed)], new[new["Site_ID"].isin(changed)]],
+        ignore_index=True,
+    )
+    distance = distance_to(new, positions)
+    reach = new["Cell_Name"].map(2 * isd.groupby("eutrancell")["isd"].max())
+    affected = (
+        new["Site_ID"].isin(changed).to_numpy()
+        | (distance <= NeighborSectors(new).max_distance + MARGIN)
+        | (distance <= reach.to_numpy() + MARGIN)
+    )
+    unbounded = np.flatnonzero(reach.isna().to_numpy() & ~affected)
+    affected[unbounded] = in_sight(new, positions, unbounded)
+    neids = set(new.loc[affected, "NE_ID"].dropna())
+    return neids | set(old.loc[old["Site_ID"].isin(changed), "NE_ID"].dropna())
+
+
+def records(frame):
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def compute(data, neids):
+    """Head-to-head neighbors and ISD of the cells of ``neids``."""
+    neighbor_calculator = NeighborSectors(data)
+    isd_calculator = InterSiteDistance(data)
+    neighbor_dfs, isd_dfs = [], []
+    for neid in neids:
+        neighbor_dfs.append(neighbor_calculator.find_neighbor_sectors(neid))
+        isd_dfs.append(isd_calculator.calculate_all_isd(neid))
+    neighbors = pd.concat(neighbor_dfs, ignore_index=True) if neids else None
+    isd = pd.concat(isd_dfs, ignore_index=True) if neids else None
+    return neighbors, isd
+
+
+def refresh_neighbor_graph(engine, full=False):
+    """
+    Bring cell_neighbors and cell_isd up to date with mcom.
+
+    The mcom rows used last time are kept in neighbor_inputs. Only the
+    NE_IDs near sites whose rows changed since then are recomputed, unless
+    ``full`` is set or there is no previous run. Everything happens in one
+    transaction. Returns the number of NE_IDs recomputed.
+    """
+    tables = [CellNeighbor.__table__, CellIsd.__table__, NeighborInput.__table__]
+    neighbor_table, isd_table, input_table = tables
+    quoted = ", ".join(f'"{column}"' for column in INPUT_COLUMNS)
+    with engine.begin() as conn:
+        for table in tables:
+            table.create(conn, checkfirst=True)
+        new = normalize(pd.read_sql(text(f"SELECT {quoted} FROM mcom"), conn))
+        old = pd.read_sql(text("SELECT * FROM neighbor_inputs"), conn)
+        old = normalize(old.rename(columns={v: k for k, v in INPUT_COLUMNS.items()}))
+
+        if full or old.empty:
+            neids = set(new["NE_ID"].dropna()) | set(old["NE_ID"].dropna())
+        else:
+            changed = changed_sites(old, new)
+            if not changed:
+                return 0
+            isd = pd.read_sql(text("SELECT eutrancell, isd FROM cell_isd"), conn)
+            neids = affected_neids(old, new, changed, isd)
+
+        current = sorted(neids & set(new["NE_ID"].dropna()))
+        neighbors, isd = compute(new, current)
+        for table, result in ((neighbor_table, neighbors), (isd_table, isd)):
+            conn.execute(table.delete().where(table.c.neid.in_(sorted(neids))))
+            if result is not None and not result.empty:
+                conn.execute(table.insert(), records(result))
+
+        conn.execute(input_table.delete())
+        if not new.empty:
+            conn.execute(
+                input_table.insert(), records(new.rename(columns=INPUT_COLUMNS))
+            )
+    return len(neids)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Refresh the cell_neighbors and cell_isd tables from mcom"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="recompute every NE_ID in mcom"
+    )
+    args = parser.parse_args()
+
+    with open(".streamlit/secrets.toml") as f:
+        cfg = OmegaConf.create(toml.loads(f.read()))
+    db_cfg = cfg.connections.postgresql
+    engine = create_engine(
+        f"{db_cfg.dialect}://{db_cfg.username}:{db_cfg.password}@{db_cfg.host}:{db_cfg.port}/{db_cfg.database}"
+    )
+    count = refresh_neighbor_graph(engine, full=args.full)
+    print(f"{count} NE_IDs recomputed")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 import streamlit as st
 import streamlit_antd_components as sac
 import toml
+from cellmap import derive_column, ensure_cell_attributes, lte_sector
 from omegaconf import DictConfig, OmegaConf
 from plotly.subplots import make_subplots
 from sqlalchemy import create_engine, text
@@ -81,6 +82,10 @@ class LTEDataFilterApp:
         self.session = session
         self.engine = engine
         self.data = None
+        try:
+            ensure_cell_attributes(engine)
+        except Exception as e:
+            st.error(f"Error preparing cell attributes: {e}")
         self.initialize_app()
 
     def initialize_app(self):
@@ -242,12 +247,20 @@ class LTEDataFilterApp:
             query_conditions.append('"DATE_ID" BETWEEN :start_date AND :end_date')
 
             where_clause = " AND ".join(query_conditions)
-            query = text(f"SELECT * FROM ltedaily WHERE {where_clause}")
+            query = text(
+                f"""
+                SELECT ltedaily.*, ca.sector AS "SECTOR"
+                FROM ltedaily
+                LEFT JOIN cell_attributes ca
+                    ON ca.cell_name = ltedaily."EutranCell" AND ca.technology = 'LTE'
+                WHERE {where_clause}
+                """
+            )
             params = {f"site_{i}": f"%{site}%" for i, site in enumerate(selected_sites)}
             params.update({"start_date": start_date, "end_date": end_date})
 
             df = pd.read_sql_query(query, self.engine, params=params)
-            df["SECTOR"] = df["EutranCell"].apply(self.determine_sector)
+            df = derive_column(df, "SECTOR", "EutranCell", self.determine_sector)
             self.data = df
             self.lte_daily_page(self.data)
         else:
@@ -262,19 +275,7 @@ class LTEDataFilterApp:
 
     @staticmethod
     def determine_sector(cell: str) -> int:
-        sector_mapping = {
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 1,
-            "5": 2,
-            "6": 3,
-            "7": 1,
-            "8": 2,
-            "9": 3,
-        }
-        last_char = cell[-1].upper()
-        return sector_mapping.get(last_char, 0)
+        return lte_sector(cell)
 
     @staticmethod
     def get_header(cell):
@@ -1,15 +1,16 @@
 import os
 
 import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
 import streamlit_antd_components as sac
 import toml
+from cellmap import derive_column, ensure_cell_attributes, lte_sector, site_id_of
 from omegaconf import DictConfig, OmegaConf
 from plotly.subplots import make_subplots
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from streamlit_extras.mandatory_date_range import date_range_picker
+from traces import scatter_class
 
 st.set_page_config(layout="wide")
 
@@ -38,29 +39,11 @@ def create_session(cfg: DictConfig):
 
 
 def add_site_id_column(df, eutrancellfdd_col):
-    def extract_site_id(cell_id):
-        if cell_id.startswith(("E_", "E-", "N_", "N-")):
-            cell_id = cell_id[2:]
-        return cell_id[:6]
-
-    df["site_id"] = df[eutrancellfdd_col].apply(extract_site_id)
-    return df
+    return derive_column(df, "site_id", eutrancellfdd_col, site_id_of)
 
 
 def determine_sector(cell: str) -> int:
-    sector_mapping = {
-        "1": 1,
-        "2": 2,
-        "3": 3,
-        "4": 1,
-        "5": 2,
-        "6": 3,
-        "7": 1,
-        "8": 2,
-        "9": 3,
-    }
-    last_char = cell[-1].upper()
-    return sector_mapping.get(last_char, 0)
+    return lte_sector(cell)
 
 
 def colors():
@@ -102,13 +85,15 @@ def colors():
     ]
 
 
-def create_chart(df, site, parameter):
+def create_chart(df, site, parameter, render_mode="auto"):
     def format_x_axis(date_id, hour_id):
         return date_id.astype(str) + " " + hour_id.astype(str).str.zfill(2) + ":00:00"
 
+    scatter = scatter_class(len(df), render_mode)
+
     def add_cell_trace(fig, x_axis, y_values, cell_name, color):
         fig.add_trace(
-            go.Scatter(
+            scatter(
                 x=x_axis,
                 y=y_values,
                 mode="lines",
@@ -201,6 +186,7 @@ def main():
 
     if engine is not None:
         try:
+            ensure_cell_attributes(engine)
             script_dir = os.path.dirname(__file__)
             sitelist_path = os.path.join(script_dir, "test_sitelist.txt")
 
@@ -239,8 +225,13 @@ def main():
                         "EUtranCellFDD",
                         hour_id,
                         "DL_Resource_Block_Utilizing_Rate",
-                        "Active User"
+                        "Active User",
+                        ca.site_id,
+                        ca.sector
                     FROM ltehourly
+                    LEFT JOIN cell_attributes ca
+                        ON ca.cell_name = ltehourly."EUtranCellFDD"
+                        AND ca.technology = 'LTE'
                     WHERE ({like_conditions})
                     AND "DATE_ID" BETWEEN :start_date AND :end_date
                     """
@@ -265,7 +256,7 @@ def main():
         if df is not None:
             df = add_site_id_column(df, "EUtranCellFDD")
 
-            df["sector"] = df["EUtranCellFDD"].apply(determine_sector)
+            df = derive_column(df, "sector", "EUtranCellFDD", determine_sector)
 
             for site in selected_sites:
                 site_df = df[df["site_id"] == site]
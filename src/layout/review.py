@@ -1,5 +1,6 @@
 import math
 import os
+from functools import partial
 
 import numpy as np
 import pandas as pd
@@ -8,18 +9,127 @@ import plotly.graph_objects as go
 import streamlit as st
 import streamlit_antd_components as sac
 import toml
+from cellmap import (
+    add_mulsec_category,
+    ensure_cell_attributes,
+    lte_sector,
+    split_sector,
+)
 from colors import ColorPalette
+from figcache import figure_cache
+from figencode import EncodedFigure
+from mcomservice import MCOM_COLUMNS, mcom_lookup
+from neighborcluster import NeighborGraph
 from omegaconf import DictConfig, OmegaConf
 from plotly.subplots import make_subplots
 from review.geoapp import GeoApp
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.orm import sessionmaker
 from streamlit_extras.mandatory_date_range import date_range_picker
 from streamlit_extras.stylable_container import stylable_container
 from styles import styling
+from traces import (
+    LTTB_TARGET_POINTS,
+    WEBGL_POINT_THRESHOLD,
+    PreparedFrame,
+    lttb_indices,
+    nan_max,
+    nan_mean,
+    nan_min,
+    positive_min,
+    scatter_class,
+)
 
 pd.options.mode.copy_on_write = True
 
+# st.fragment is experimental_fragment before Streamlit 1.37; releases older
+# than 1.33 have neither and rerun the whole page
+fragment = getattr(
+    st, "fragment", getattr(st, "experimental_fragment", lambda func: func)
+)
+
+REVERSE_HOVER_COLUMNS = ["MC Class", "Band", "City"]
+
+CHART_LAYOUTS = {
+    "split": "Per KPI and sector",
+    "sector": "All KPIs per sector",
+    "kpi": "All sectors per KPI",
+}
+
+# (title, chart kind, y_param, yline) for every KPI section of the review page
+DAILY_KPI_SECTIONS = [
+    ("Service Availability for Site {siteid}", "daily", "Availability", None),
+    ("RRC Success Rate for Site {siteid}", "daily", "RRC_SR", "CSSR"),
+    ("E-RAB Setup Success Rate for Site {siteid}", "daily", "ERAB_SR", "CSSR"),
+    ("Session Setup Success Rate for Site {siteid}", "daily", "SSSR", "CSSR"),
+    (
+        "Session Abnormal Release Sectoral for Site {siteid}",
+        "daily",
+        "SAR",
+        "Service Drop Rate",
+    ),
+    (
+        "CQI Distribution (Non-Homogeneous) Sectoral for Site {siteid}",
+        "daily",
+        "avgcqinonhom",
+        "CQI",
+    ),
+    (
+        "Spectral Efficiency Analysis Sectoral for Site {siteid}",
+        "daily",
+        "SE_DAILY",
+        "SE",
+    ),
+    (
+        "Intra-Frequency Handover Performance Sectoral for Site {siteid} (%)",
+        "daily",
+        "Intra_HO_Exe_SR",
+        "Intra Freq HOSR",
+    ),
+    (
+        "Inter-Frequency Handover Performance Sectoral for Site {siteid} (%)",
+        "daily",
+        "Inter_HO_Exe_SR",
+        "Inter Freq HOSR",
+    ),
+    (
+        "Average UL RSSI Sectoral for Site {siteid} (dBm)",
+        "reverse",
+        "UL_INT_PUSCH_y",
+        "UL_INT_PUSCH_x",
+    ),
+    (
+        "Throughput (Mbps) Sectoral for Site {siteid}",
+        "daily",
+        "CellDownlinkAverageThroughput",
+        None,
+    ),
+    (
+        "Payload Distribution Sectoral for Site {siteid} (Gpbs)",
+        "stacked",
+        "Payload_Total(Gb)",
+        None,
+    ),
+]
+
+HOURLY_KPI_SECTIONS = [
+    (
+        "PRB Utilization Site {siteid}",
+        "daily",
+        "DL_Resource_Block_Utilizing_Rate",
+        None,
+    ),
+    ("Active User Site {siteid}", "daily", "Active User", None),
+]
+
+# KPI -> (table, cell column, daily value column, aggregation over a cluster)
+CLUSTER_KPIS = {
+    "CQI": ("ltebusyhour", "EUtranCellFDD", "CQI", "mean"),
+    "PRB": ("ltehourly", "EUtranCellFDD", "DL_Resource_Block_Utilizing_Rate", "mean"),
+    "Payload": ("ltedaily", "EutranCell", "Payload_Total(Gb)", "sum"),
+}
+CLUSTER_DEPTHS = [1, 2, 3]
+
 
 class Config:
     def load(self):
@@ -93,6 +203,29 @@ class StreamlitInterface:
         )
         return date_range
 
+    def select_chart_layout(self):
+        return st.selectbox(
+            "CHART LAYOUT",
+            list(CHART_LAYOUTS),
+            format_func=CHART_LAYOUTS.get,
+            key="chart_layout",
+        )
+
+    def select_binary_payload(self):
+        return st.toggle(
+            "Binary chart data",
+            value=False,
+            key="binary_payload",
+            help="Send chart data as typed arrays instead of JSON text.",
+        )
+
+    def select_full_resolution(self):
+        return st.toggle(
+            "Full resolution",
+            key="full_resolution",
+            help="Plot every raw point instead of the downsampled series.",
+        )
+
     def select_xrule_date(self):
         if "xrule_date" not in st.session_state:
             st.session_state["xrule_date"] = pd.Timestamp.today()
@@ -115,36 +248,17 @@ class QueryManager:
             return pd.DataFrame()
 
     def get_mcom_data(self, siteid):
-        query = text(
-            """
-        SELECT "Site_ID", "NODE_ID", "NE_ID", "Cell_Name", "Longitude", "Latitude", "Dir", "Ant_BW",
-               "Ant_Size", "cellId", "eNBId", "KABUPATEN", "LTE"
-        FROM mcom
-        WHERE "Site_ID" LIKE :siteid
-        """
+        return mcom_lookup(
+            self.engine, "mcom", "Site_ID", [siteid], MCOM_COLUMNS, report=st.error
         )
-        return self.fetch_data(query, {"siteid": siteid})
 
     def get_mcom_neid(self, neid):
-        query = text(
-            """
-        SELECT "Site_ID", "NODE_ID", "NE_ID", "Cell_Name", "Longitude", "Latitude", "Dir", "Ant_BW",
-               "Ant_Size", "cellId", "eNBId", "KABUPATEN", "LTE"
-        FROM mcom
-        WHERE "NE_ID" LIKE :neid
-        """
+        return mcom_lookup(
+            self.engine, "mcom", "NE_ID", [neid], MCOM_COLUMNS, report=st.error
         )
-        return self.fetch_data(query, {"neid": neid})
 
-    def get_ltedaily_data(self, siteid, neids, start_date, end_date):
-        query = text(
-            """
-            SELECT *
-            FROM ltedaily
-            WHERE "SITEID" LIKE :siteid
-            AND "DATE_ID" BETWEEN :start_date AND :end_date
-            """
-        )
+    @st.cache_data(ttl=600)
+    def get_ltedaily_data(_self, siteid, neids, start_date, end_date):
         params = {"siteid": siteid, "start_date": start_date, "end_date": end_date}
 
         if neids:
@@ -153,8 +267,10 @@ class QueryManager:
             )
             query = text(
                 f"""
-                SELECT *
+                SELECT ltedaily.*, ca.band AS eutrancell_new
                 FROM ltedaily
+                LEFT JOIN cell_attributes ca
+                    ON ca.cell_name = ltedaily."EutranCell" AND ca.technology = 'LTE'
                 WHERE "SITEID" LIKE :siteid
                 AND ({neid_conditions})
                 AND "DATE_ID" BETWEEN :start_date AND :end_date
@@ -164,16 +280,19 @@ class QueryManager:
         else:
             query = text(
                 """
-                SELECT *
+                SELECT ltedaily.*, ca.band AS eutrancell_new
                 FROM ltedaily
+                LEFT JOIN cell_attributes ca
+                    ON ca.cell_name = ltedaily."EutranCell" AND ca.technology = 'LTE'
                 WHERE "SITEID" LIKE :siteid
                 AND "DATE_ID" BETWEEN :start_date AND :end_date
                 """
             )
 
-        return self.fetch_data(query, params)
+        return _self.fetch_data(query, params)
 
-    def get_ltedaily_payload(self, selected_sites, start_date, end_date):
+    @st.cache_data(ttl=600)
+    def get_ltedaily_payload(_self, selected_sites, start_date, end_date):
         like_conditions = " OR ".join(
             [f'"SITEID" LIKE :site_{i}' for i in range(len(selected_sites))]
         )
@@ -194,7 +313,7 @@ class QueryManager:
         params = {f"site_{i}": f"%{site}%" for i, site in enumerate(selected_sites)}
         params.update({"start_date": start_date, "end_date": end_date})
 
-        return self.fetch_data(query, params=params)
+        return _self.fetch_data(query, params=params)
 
     @st.cache_data(ttl=600)
     def get_ltehourly_data(_self, selected_sites, end_date):
@@ -209,8 +328,13 @@ class QueryManager:
             "EUtranCellFDD",
             hour_id,
             "DL_Resource_Block_Utilizing_Rate",
-            "Active User"
+            "Active User",
+            ca.band AS eutrancell_new,
+            ca.mulsec_category,
+            ca.cell_name IS NOT NULL AS has_attributes
         FROM ltehourly
+        LEFT JOIN cell_attributes ca
+            ON ca.cell_name = ltehourly."EUtranCellFDD" AND ca.technology = 'LTE'
         WHERE ({like_conditions})
         AND "DATE_ID" BETWEEN :start_date AND :end_date
         """
@@ -220,7 +344,8 @@ class QueryManager:
 
         return _self.fetch_data(query, params=params)
 
-    def get_target_data(self, city, band):
+    @st.cache_data(ttl=600)
+    def get_target_data(_self, city, band):
         # def get_target_data(self, city, band):
         query = text(
             """
@@ -229,7 +354,7 @@ class QueryManager:
         WHERE "City" = :city AND "Band" = :band
         """
         )
-        return self.fetch_data(
+        return _self.fetch_data(
             # query, {"city": city, "mc_class": mc_class, "band": band}
             query,
             {"city": city, "band": band},
@@ -277,25 +402,93 @@ class QueryManager:
         return _self.fetch_data(query, params=params)
 
     def get_mcom_tastate(self, selected_neids):
-        like_conditions = " OR ".join(
-            [f'"NE_ID" LIKE :neid_{i}' for i in range(len(selected_neids))]
+        return mcom_lookup(
+            self.engine,
+            "mcom",
+            "NE_ID",
+            selected_neids,
+            ["Site_ID", "NE_ID", "Cell_Name", "cellId", "eNBId"],
+            contains=True,
+            report=st.error,
         )
+
+    @st.cache_data(ttl=600)
+    def get_cell_neighbors(_self, siteid):
         query = text(
-            f"""
-        SELECT
-        "Site_ID",
-        "NE_ID",
-        "Cell_Name",
-        "cellId",
-        "eNBId"
-        FROM mcom
-        WHERE ({like_conditions})
+            """
+            SELECT
+                siteid,
+                neid,
+                cellname,
+                adjneid,
+                adjcellname,
+                distance,
+                bearing_from_source,
+                bearing_from_target,
+                remark
+            FROM cell_neighbors
+            WHERE siteid = :siteid
+            ORDER BY id
+            """
+        )
+        return _self.fetch_data(query, params={"siteid": siteid})
+
+    @st.cache_data(ttl=600)
+    def get_cell_isd(_self, siteid):
+        query = text(
+            """
+            SELECT siteid, neid, eutrancell, isd, enbid, ci
+            FROM cell_isd
+            WHERE siteid = :siteid
+            ORDER BY id
+            """
+        )
+        return _self.fetch_data(query, params={"siteid": siteid})
+
+    def get_neighbor_version(self):
+        """
+        Row count and last id of cell_neighbors.
+
+        neighborgraph.py deletes and reinserts a site's rows, so every
+        rewrite gets new ids and changes this pair.
         """
+        query = text(
+            "SELECT COUNT(*) AS row_count, MAX(id) AS last_id FROM cell_neighbors"
         )
-        params = {f"neid_{i}": f"%{neid}%" for i, neid in enumerate(selected_neids)}
-        return self.fetch_data(query, params=params)
+        version = self.fetch_data(query)
+        return tuple(version.iloc[0].tolist()) if not version.empty else None
+
+    def get_neighbor_edges(self):
+        query = text("SELECT cellname, adjcellname FROM cell_neighbors")
+        return self.fetch_data(query)
+
+    @st.cache_resource(max_entries=1)
+    def get_neighbor_graph(_self, version):
+        """NeighborGraph of cell_neighbors, rebuilt only when ``version`` changes."""
+        edges = _self.get_neighbor_edges()
+        return NeighborGraph.from_tier(edges) if not edges.empty else None
+
+    @st.cache_data(ttl=600)
+    def get_cluster_kpi(_self, cells, kpi, start_date, end_date):
+        """Daily value of a CLUSTER_KPIS entry for ``cells``."""
+        table, cell_column, value_column, _ = CLUSTER_KPIS[kpi]
+        query = text(
+            f"""
+            SELECT
+                "DATE_ID" AS date,
+                "{cell_column}" AS cellname,
+                AVG("{value_column}") AS value
+            FROM {table}
+            WHERE "{cell_column}" IN :cells
+            AND "DATE_ID" BETWEEN :start_date AND :end_date
+            GROUP BY "DATE_ID", "{cell_column}"
+            """
+        ).bindparams(bindparam("cells", expanding=True))
+        params = {"cells": list(cells), "start_date": start_date, "end_date": end_date}
+        return _self.fetch_data(query, params=params)
 
-    def get_vswr_data(self, selected_sites, end_date):
+    @st.cache_data(ttl=600)
+    def get_vswr_data(_self, selected_sites, end_date):
         like_conditions = " OR ".join(
             [f'"NE_NAME" LIKE :site_{i}' for i in range(len(selected_sites))]
         )
@@ -321,9 +514,10 @@ class QueryManager:
         params = {f"site_{i}": f"%{site}%" for i, site in enumerate(selected_sites)}
         params.update({"start_date": start_date, "end_date": end_date})
 
-        return self.fetch_data(query, params=params)
+        return _self.fetch_data(query, params=params)
 
-    def get_busyhour(self, selected_sites, end_date):
+    @st.cache_data(ttl=600)
+    def get_busyhour(_self, selected_sites, end_date):
         like_conditions = " OR ".join(
             [f'"EUtranCellFDD" LIKE :site_{i}' for i in range(len(selected_sites))]
         )
@@ -333,8 +527,11 @@ class QueryManager:
         SELECT
             "DATE_ID",
             "EUtranCellFDD",
-            "CQI"
+            "CQI",
+            ca.band AS eutrancell_new
         FROM ltebusyhour
+        LEFT JOIN cell_attributes ca
+            ON ca.cell_name = ltebusyhour."EUtranCellFDD" AND ca.technology = 'LTE'
         WHERE ({like_conditions})
         AND "DATE_ID" BETWEEN :start_date AND :end_date
         """
@@ -342,9 +539,10 @@ class QueryManager:
         params = {f"site_{i}": f"%{site}%" for i, site in enumerate(selected_sites)}
         params.update({"start_date": start_date, "end_date": end_date})
 
-        return self.fetch_data(query, params=params)
+        return _self.fetch_data(query, params=params)
 
-    def get_cqi_cluster(self, eutrancellfdd, start_date, end_date):
+    @st.cache_data(ttl=600)
+    def get_cqi_cluster(_self, eutrancellfdd, start_date, end_date):
         query = text(
             """
             SELECT
@@ -362,15 +560,28 @@ class QueryManager:
             "end_date": end_date,
         }
         try:
-            return pd.read_sql(query, self.engine, params=params)
+            return pd.read_sql(query, _self.engine, params=params)
         except Exception as e:
             st.error(f"Error fetching data: {e}")
             return pd.DataFrame()
 
 
 class ChartGenerator:
-    def __init__(self):
+    def __init__(
+        self,
+        render_mode="auto",
+        webgl_threshold=WEBGL_POINT_THRESHOLD,
+        max_points=LTTB_TARGET_POINTS,
+    ):
         self.color_palette = ColorPalette()
+        self.figure_cache = figure_cache
+        self.render_mode = render_mode
+        self.webgl_threshold = webgl_threshold
+        self.max_points = max_points
+        # None follows the "Full resolution" toggle; headless callers set a bool
+        self.full_resolution = None
+        # None follows the "Binary chart data" toggle
+        self.binary_payload = None
 
     def get_colors(self, num_colors):
         return [self.color_palette.get_color(i) for i in range(num_colors)]
@@ -392,21 +603,16 @@ class ChartGenerator:
         return ", ".join(sorted_sectors)
 
     def determine_sector(self, cell: str) -> int:
-        sector_mapping = {
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 1,
-            "5": 2,
-            "6": 3,
-            "7": 1,
-            "8": 2,
-            "9": 3,
-        }
-        last_char = cell[-1].upper()
-        return sector_mapping.get(last_char, 0)
+        return lte_sector(cell)
 
     def create_charts_vswr(self, df, x1_param, x2_param, y_param, nename):
+        fig = self.vswr_figure(df, x1_param, x2_param, y_param)
+
+        container = st.container()
+        with container:
+            st.plotly_chart(fig, use_container_width=True)
+
+    def vswr_figure(self, df, x1_param, x2_param, y_param):
         # Calculate the average y_param for each combination of x1_param and x2_param
         avg_df = df.groupby([x1_param, x2_param])[y_param].mean().reset_index()
 
@@ -462,12 +668,27 @@ class ChartGenerator:
             ),
             margin=dict(l=20, r=20, t=40, b=20),
         )
-
-        container = st.container()
-        with container:
-            st.plotly_chart(fig, use_container_width=True)
+        return fig
 
     def cqiclusterchart(self, df, tier_data, xrule=None):
+        fig = self.cqicluster_figure(df, tier_data, xrule)
+
+        with stylable_container(
+            key="container_with_border",
+            css_styles="""
+                {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px)
+                }
+                """,
+        ):
+            container = st.container()
+            with container:
+                st.plotly_chart(fig, use_container_width=True)
+
+    def cqicluster_figure(self, df, tier_data, xrule=None):
         df = df.rename(
             columns={"DATE_ID": "date", "EUtranCellFDD": "cellname", "CQI": "cqi"}
         )
@@ -544,7 +765,7 @@ class ChartGenerator:
 
             if xrule:
                 fig.add_vline(
-                    x=st.session_state["xrule"],
+                    x=xrule,
                     line_width=2,
                     line_dash="dash",
                     row=1,
@@ -573,6 +794,13 @@ class ChartGenerator:
             ),
         )
 
+        return fig
+
+    def clusterchart(self, cell_data, clusters, kpi, xrule=None):
+        fig = self.cluster_figure(cell_data, clusters, kpi, xrule)
+        if fig is None:
+            return
+
         with stylable_container(
             key="container_with_border",
             css_styles="""
@@ -584,9 +812,97 @@ class ChartGenerator:
                 }
                 """,
         ):
-            container = st.container()
-            with container:
-                st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+    def cluster_figure(self, cell_data, clusters, kpi, xrule=None):
+        """
+        Each cell's daily KPI against its cluster, one subplot per cell.
+
+        ``clusters`` maps a depth to ``NeighborGraph.aggregate`` output; every
+        depth is drawn as its own line.
+        """
+        cellnames = sorted(cell_data["cellname"].unique())
+        if not cellnames:
+            return None
+        colors = self.get_colors(len(cellnames) + len(clusters))
+        fig = make_subplots(rows=1, cols=len(cellnames), shared_yaxes=True)
+
+        for i, cellname in enumerate(cellnames):
+            cell_value = cell_data[cell_data["cellname"] == cellname].sort_values(
+                "date"
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=cell_value["date"],
+                    y=cell_value["value"],
+                    mode="lines",
+                    line=dict(color=colors[i], dash="dashdot", width=5),
+                    name=f"{cellname}",
+                    hovertemplate=(
+                        f"<b>{cellname}</b><br>"
+                        f"<b>{kpi} :</b> %{{y}}<br>"
+                        "<extra></extra>"
+                    ),
+                ),
+                row=1,
+                col=i + 1,
+            )
+
+            for j, (depth, cluster) in enumerate(sorted(clusters.items())):
+                cluster_value = cluster[cluster["cellname"] == cellname].sort_values(
+                    "date"
+                )
+                fig.add_trace(
+                    go.Scatter(
+                        x=cluster_value["date"],
+                        y=cluster_value["value"],
+                        customdata=cluster_value["cells"],
+                        mode="lines",
+                        line=dict(color=colors[len(cellnames) + j]),
+                        name=f"{cellname} - Tier 1-{depth}",
+                        hovertemplate=(
+                            f"<b>{cellname} Tier 1-{depth}</b><br>"
+                            f"<b>{kpi} :</b> %{{y}}<br>"
+                            "<b>Cells :</b> %{customdata}<br>"
+                            "<extra></extra>"
+                        ),
+                    ),
+                    row=1,
+                    col=i + 1,
+                )
+
+            if xrule:
+                fig.add_vline(
+                    x=xrule,
+                    line_width=2,
+                    line_dash="dash",
+                    row=1,
+                    col=i + 1,
+                )
+        fig.update_layout(
+            plot_bgcolor="#F5F5F5",
+            paper_bgcolor="#F5F5F5",
+            margin=dict(l=20, r=20, t=40, b=20),
+            hoverlabel=dict(font_size=16, font_family="Vodafone"),
+            hovermode="x unified",
+            height=350,
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                bgcolor="#F5F5F5",
+                bordercolor="#F5F5F5",
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=14),
+            ),
+        )
+
+        return fig
 
     # def create_charts_tastate(self, df):
     #     plot_columns = [
@@ -676,6 +992,24 @@ class ChartGenerator:
 
     # MARK: tastate bar
     def create_charts_tastate(self, df, sector):
+        fig = self.tastate_figure(df, sector)
+
+        with stylable_container(
+            key="container_with_border",
+            css_styles="""
+                {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px)
+                }
+                """,
+        ):
+            container = st.container()
+            with container:
+                st.plotly_chart(fig, use_container_width=True)
+
+    def tastate_figure(self, df, sector):
         plot_columns = [
             "perc_300",
             "perc_500",
@@ -785,51 +1119,83 @@ class ChartGenerator:
         for i in fig["layout"]["annotations"]:
             i["font"] = dict(size=14)
 
-        with stylable_container(
-            key="container_with_border",
-            css_styles="""
-                {
-                    background-color: #F5F5F5;
-                    border: 2px solid rgba(49, 51, 63, 0.2);
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-        ):
-            container = st.container()
-            with container:
-                st.plotly_chart(fig, use_container_width=True)
+        return fig
+
+    def add_xrule(self, fig, x=None):
+        fig.add_vline(
+            x=st.session_state["xrule"] if x is None else x,
+            line_width=2,
+            line_dash="dash",
+            line_color="#808080",
+        )
+
+    def show(self, fig):
+        """Draw a figure, sending trace data as base64 typed arrays when enabled."""
+        binary_payload = self.binary_payload
+        if binary_payload is None:
+            binary_payload = st.session_state.get("binary_payload", False)
+        if binary_payload:
+            fig = EncodedFigure(fig)
+        st.plotly_chart(fig, use_container_width=True)
+
+    def legend_args(self, cell, legend=None):
+        """Legend settings for a cell trace; a shared legend lists each cell once."""
+        if legend is None:
+            return {}
+        shown = cell in legend
+        legend.add(cell)
+        return {"legendgroup": cell, "showlegend": not shown}
+
+    def scatter_for(self, points):
+        return scatter_class(points, self.render_mode, self.webgl_threshold)
+
+    def prepare(self, df, cell_name, x_param):
+        """Wrap a DataFrame in a PreparedFrame; prepared frames pass through."""
+        if isinstance(df, PreparedFrame):
+            return df
+        return PreparedFrame(
+            df, cell_name, x_param, self.determine_sector, self.get_colors
+        )
+
+    def trace_points(self):
+        """Per-trace point budget, or None when full resolution is switched on."""
+        full_resolution = self.full_resolution
+        if full_resolution is None:
+            full_resolution = st.session_state.get("full_resolution", False)
+        return None if full_resolution else self.max_points
+
+    def sector_scatter(self, split, sector):
+        max_points = self.trace_points() or np.inf
+        return self.scatter_for(
+            sum(min(count, max_points) for _, count in split.sector_cells(sector))
+        )
+
+    def cached_sector_figure(self, kind, split, sector, columns, params, build):
+        """Return the cached figure for one sector, building it on a miss."""
+        key = self.figure_cache.fingerprint(
+            kind,
+            sector,
+            params,
+            self.trace_points(),
+            self.sector_scatter(split, sector).__name__,
+            split.sector_cells(sector),
+            *(split.sector_column(sector, column) for column in columns),
+        )
+        return self.figure_cache.get_or_build(key, build)
 
     def create_charts_for_daily(
         self, df, cell_name, x_param, y_param, xrule=False, yline=None
     ):
-        df = df.sort_values(by=x_param)
-        df[y_param] = df[y_param].astype(float)
-        df = df[df[y_param] != 0]
-        df["sector"] = df[cell_name].apply(self.determine_sector)
-
-        color_mapping = {
-            cell: color
-            for cell, color in zip(
-                sorted(df[cell_name].unique()),
-                self.get_colors(len(df[cell_name].unique())),
-            )
-        }
+        prepared = self.prepare(df, cell_name, x_param)
+        split = prepared.kpi(y_param, yline)
+        plotted = [x_param, y_param] + ([yline] if yline else [])
+        sectors = prepared.nonzero_sectors(y_param)
+        color_mapping = prepared.colors
 
-        sector_count = df["sector"].nunique()
-        cols = max(min(sector_count, 3), 1)
+        cols = max(min(len(sectors), 3), 1)
         columns = st.columns(cols)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
-            y_min = sector_data[sector_data[y_param] > 0][y_param].min()
-            y_max_value = sector_data[y_param].max()
-            y_max = (
-                100
-                if 95 < y_max_value <= 100
-                else y_max_value if y_max_value > 100 else y_max_value
-            )
-
+        for idx, sector in enumerate(sectors):
             with columns[idx % cols]:
                 with stylable_container(
                     key=f"container_with_border_{sector}",
@@ -844,246 +1210,341 @@ class ChartGenerator:
                 ):
                     container = st.container()
                     with container:
-                        fig = go.Figure()
-
-                        for cell in sector_data[cell_name].unique():
-                            cell_data = sector_data[sector_data[cell_name] == cell]
-                            color = color_mapping[cell]
-
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=cell_data[x_param],
-                                    y=cell_data[y_param],
-                                    mode="lines",
-                                    name=cell,
-                                    line=dict(color=color, width=2),
-                                    hovertemplate=(
-                                        f"<b>{cell}</b><br>"
-                                        f"<b>{y_param}:</b> %{{y}}<br>"
-                                        "<extra></extra>"
-                                    ),
-                                )
-                            )
-
-                        if yline:
-                            yline_value = sector_data[yline].mean()
-                            fig.add_hline(
-                                y=yline_value,
-                                line_dash="dashdot",
-                                line_color="#F70000",
-                                line_width=2,
-                            )
-                            if yline_value > y_max:
-                                y_max = yline_value
-                            elif yline_value < y_min:
-                                y_min = yline_value
-
-                        if xrule:
-                            fig.add_vline(
-                                x=st.session_state["xrule"],
-                                line_width=2,
-                                line_dash="dash",
-                                line_color="#808080",
-                            )
-
-                        adjusted_y_min = y_min if y_min > 0 else 0.01
-                        yaxis_range = [adjusted_y_min, y_max]
-
-                        fig.update_layout(
-                            margin=dict(t=20, l=20, r=20, b=20),
-                            title_text=f"SECTOR {sector}",
-                            title_x=0.4,
-                            template="plotly_white",
-                            hoverlabel=dict(font_size=14, font_family="Vodafone"),
-                            # hovermode="x unified",
-                            legend=dict(
-                                orientation="h",
-                                yanchor="top",
-                                y=-0.4,
-                                xanchor="center",
-                                x=0.5,
-                                itemclick="toggleothers",
-                                itemdoubleclick="toggle",
-                                itemsizing="constant",
-                                font=dict(size=14),
-                                traceorder="normal",
-                            ),
-                            paper_bgcolor="#F5F5F5",
-                            plot_bgcolor="#F5F5F5",
-                            width=600,
-                            height=350,
-                            showlegend=True,
-                            yaxis=dict(
-                                range=yaxis_range,
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                            xaxis=dict(
-                                tickfont=dict(
-                                    size=14,  # Updated size for x-axis tick labels
-                                    color="#000000",
-                                ),
+                        fig = self.cached_sector_figure(
+                            "daily",
+                            split,
+                            sector,
+                            plotted,
+                            (x_param, y_param, yline, color_mapping),
+                            partial(
+                                self.daily_figure,
+                                split,
+                                sector,
+                                x_param,
+                                y_param,
+                                color_mapping,
+                                yline,
                             ),
                         )
 
-                        st.plotly_chart(fig, use_container_width=True)
-
-    def create_charts_for_daily_reverse(
-        self, df, cell_name, x_param, y_param, xrule=False, yline=None, y_range=None
+                        if xrule:
+                            self.add_xrule(fig)
+
+                        self.show(fig)
+
+    def add_daily_traces(
+        self,
+        fig,
+        split,
+        sector,
+        *,
+        x_param,
+        y_param,
+        color_mapping,
+        yline=None,
+        subplot=None,
+        legend=None,
     ):
-        df = df.sort_values(by=x_param)
-        df["sector"] = df[cell_name].apply(self.determine_sector)
-
-        df[y_param] = df[y_param].astype(float)
-        df = df[df[y_param] != 0]
+        """
+        Add one sector's daily KPI traces to ``fig`` and return its y range.
 
-        color_mapping = {
-            cell: color
-            for cell, color in zip(
-                sorted(df[cell_name].unique()),
-                self.get_colors(len(df[cell_name].unique())),
-            )
-        }
+        ``subplot`` holds the ``row``/``col`` of a subplot figure, and
+        ``legend`` is the set of cells already shown in a shared legend.
+        """
+        subplot = subplot or {}
+        sector_y = split.sector_column(sector, y_param)
+        nonzero = sector_y != 0
+        sector_y = sector_y[nonzero]
+        y_min = positive_min(sector_y)
+        y_max_value = nan_max(sector_y)
+        y_max = (
+            100
+            if 95 < y_max_value <= 100
+            else y_max_value if y_max_value > 100 else y_max_value
+        )
 
-        sector_count = df["sector"].nunique()
-        cols = min(sector_count, 3)
-        columns = st.columns(cols)
+        scatter = self.sector_scatter(split, sector)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
+        for cell, cell_data in split.cell_groups(
+            sector,
+            [x_param, y_param],
+            xy=(x_param, y_param),
+            max_points=self.trace_points(),
+            nonzero=y_param,
+        ):
+            color = color_mapping[cell]
 
-            y_min = sector_data[y_param].min()
-            y_max = sector_data[y_param].max()
+            fig.add_trace(
+                scatter(
+                    x=cell_data[x_param],
+                    y=cell_data[y_param],
+                    mode="lines",
+                    name=cell,
+                    line=dict(color=color, width=2),
+                    hovertemplate=(
+                        f"<b>{cell}</b><br>"
+                        f"<b>{y_param}:</b> %{{y}}<br>"
+                        "<extra></extra>"
+                    ),
+                    **self.legend_args(cell, legend),
+                ),
+                **subplot,
+            )
 
-            with columns[idx % cols]:
-                with stylable_container(
-                    key=f"container_with_border_{sector}",
-                    css_styles="""
-                                {
-                                    background-color: #F5F5F5;
-                                    border: 2px solid rgba(49, 51, 63, 0.2);
-                                    border-radius: 0.5rem;
-                                    padding: calc(1em - 1px)
-                                }
-                                """,
-                ):
-                    container = st.container()
-                    with container:
-                        fig = go.Figure()
-
-                        for cell in sector_data[cell_name].unique():
-                            cell_data = sector_data[sector_data[cell_name] == cell]
-                            color = color_mapping[cell]
-
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=cell_data[x_param],
-                                    y=cell_data[y_param],
-                                    mode="lines",
-                                    name=cell,
-                                    line=dict(color=color, width=2),
-                                    hovertemplate=(
-                                        f"<b>{cell}</b><br>"
-                                        f"<b>{y_param}:</b> %{{y}}<br>"
-                                        f"<b>MC Class:</b> %{{customdata[0]}}<br>"
-                                        f"<b>Band:</b> %{{customdata[1]}}<br>"
-                                        f"<b>City:</b> %{{customdata[2]}}<br>"
-                                        "<extra></extra>"
-                                    ),
-                                    customdata=np.stack(
-                                        (
-                                            cell_data["MC Class"],
-                                            cell_data["Band"],
-                                            cell_data["City"],
-                                        ),
-                                        axis=-1,
-                                    ),
-                                )
-                            )
-
-                        if yline:
-                            yline_value = sector_data[yline].mean()
-                            fig.add_hline(
-                                y=yline_value,
-                                line_dash="dashdot",
-                                line_color="#F70000",
-                                line_width=2,
-                            )
-                            # Adjust y_max if yline_value is greater
-                            if yline_value > y_max:
-                                y_max = yline_value
+        if yline:
+            yline_value = nan_mean(split.sector_column(sector, yline)[nonzero])
+            fig.add_hline(
+                y=yline_value,
+                line_dash="dashdot",
+                line_color="#F70000",
+                line_width=2,
+                **subplot,
+            )
+            if yline_value > y_max:
+                y_max = yline_value
+            elif yline_value < y_min:
+                y_min = yline_value
 
-                        if xrule:
-                            fig.add_vline(
-                                x=st.session_state["xrule"],
-                                line_width=2,
-                                line_dash="dash",
-                                line_color="#808080",
-                            )
-
-                        yaxis_range = [y_max, y_min]
-
-                        fig.update_layout(
-                            margin=dict(t=20, l=20, r=20, b=20),
-                            title_text=f"SECTOR {sector}",
-                            title_x=0.4,
-                            template="plotly_white",
-                            hoverlabel=dict(font_size=16, font_family="Vodafone"),
-                            hovermode="x unified",
-                            legend=dict(
-                                orientation="h",
-                                yanchor="top",
-                                y=-0.2,
-                                xanchor="center",
-                                x=0.5,
-                                itemclick="toggleothers",
-                                itemdoubleclick="toggle",
-                                itemsizing="constant",
-                                font=dict(size=16),
-                            ),
-                            paper_bgcolor="#F5F5F5",
-                            plot_bgcolor="#F5F5F5",
-                            width=600,
-                            height=350,
-                            showlegend=True,
-                            xaxis=dict(
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                            yaxis=dict(
-                                autorange="reversed",
-                                range=yaxis_range,
-                                tickfont=dict(size=14, color="#000000"),
-                            ),
-                        )
+        adjusted_y_min = y_min if y_min > 0 else 0.01
+        return [adjusted_y_min, y_max]
 
-                        st.plotly_chart(fig, use_container_width=True)
+    def daily_figure(self, split, sector, x_param, y_param, color_mapping, yline=None):
+        fig = go.Figure()
+        yaxis_range = self.add_daily_traces(
+            fig,
+            split,
+            sector,
+            x_param=x_param,
+            y_param=y_param,
+            color_mapping=color_mapping,
+            yline=yline,
+        )
 
-    def create_charts_for_stacked_area(
+        fig.update_layout(
+            margin=dict(t=20, l=20, r=20, b=20),
+            title_text=f"SECTOR {sector}",
+            title_x=0.4,
+            template="plotly_white",
+            hoverlabel=dict(font_size=14, font_family="Vodafone"),
+            # hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=14),
+                traceorder="normal",
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            width=600,
+            height=350,
+            showlegend=True,
+            yaxis=dict(
+                range=yaxis_range,
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+            xaxis=dict(
+                tickfont=dict(
+                    size=14,  # Updated size for x-axis tick labels
+                    color="#000000",
+                ),
+            ),
+        )
+        return fig
+
+    def create_charts_for_daily_reverse(
         self, df, cell_name, x_param, y_param, xrule=False, yline=None, y_range=None
     ):
-        df = df.sort_values(by=x_param)
-        df[y_param] = df[y_param].astype(float)
-        df["sector"] = df[cell_name].apply(self.determine_sector)
-        color_mapping = {
-            cell: color
-            for cell, color in zip(
-                df[cell_name].unique(),
-                self.get_colors(len(df[cell_name].unique())),
-            )
-        }
+        prepared = self.prepare(df, cell_name, x_param)
+        split = prepared.kpi(y_param, yline)
+        plotted = [x_param, y_param, *REVERSE_HOVER_COLUMNS] + (
+            [yline] if yline else []
+        )
+        sectors = prepared.nonzero_sectors(y_param)
+        color_mapping = prepared.colors
 
-        sector_count = df["sector"].nunique()
-        cols = min(sector_count, 3)
+        cols = max(min(len(sectors), 3), 1)
         columns = st.columns(cols)
 
-        for idx, sector in enumerate(sorted(df["sector"].unique())):
-            sector_data = df[df["sector"] == sector]
+        for idx, sector in enumerate(sectors):
+            with columns[idx % cols]:
+                with stylable_container(
+                    key=f"container_with_border_{sector}",
+                    css_styles="""
+                                {
+                                    background-color: #F5F5F5;
+                                    border: 2px solid rgba(49, 51, 63, 0.2);
+                                    border-radius: 0.5rem;
+                                    padding: calc(1em - 1px)
+                                }
+                                """,
+                ):
+                    container = st.container()
+                    with container:
+                        fig = self.cached_sector_figure(
+                            "daily_reverse",
+                            split,
+                            sector,
+                            plotted,
+                            (x_param, y_param, yline, color_mapping),
+                            partial(
+                                self.daily_reverse_figure,
+                                split,
+                                sector,
+                                x_param,
+                                y_param,
+                                color_mapping,
+                                yline,
+                            ),
+                        )
+
+                        if xrule:
+                            self.add_xrule(fig)
+
+                        self.show(fig)
+
+    def add_daily_reverse_traces(
+        self,
+        fig,
+        split,
+        sector,
+        *,
+        x_param,
+        y_param,
+        color_mapping,
+        yline=None,
+        subplot=None,
+        legend=None,
+    ):
+        """Add one sector's reversed-axis KPI traces and return its y range."""
+        subplot = subplot or {}
+        sector_y = split.sector_column(sector, y_param)
+        nonzero = sector_y != 0
+        sector_y = sector_y[nonzero]
+        y_min = nan_min(sector_y)
+        y_max = nan_max(sector_y)
+
+        scatter = self.sector_scatter(split, sector)
+
+        for cell, cell_data in split.cell_groups(
+            sector,
+            [x_param, y_param, *REVERSE_HOVER_COLUMNS],
+            xy=(x_param, y_param),
+            max_points=self.trace_points(),
+            nonzero=y_param,
+        ):
+            color = color_mapping[cell]
+
+            fig.add_trace(
+                scatter(
+                    x=cell_data[x_param],
+                    y=cell_data[y_param],
+                    mode="lines",
+                    name=cell,
+                    line=dict(color=color, width=2),
+                    hovertemplate=(
+                        f"<b>{cell}</b><br>"
+                        f"<b>{y_param}:</b> %{{y}}<br>"
+                        f"<b>MC Class:</b> %{{customdata[0]}}<br>"
+                        f"<b>Band:</b> %{{customdata[1]}}<br>"
+                        f"<b>City:</b> %{{customdata[2]}}<br>"
+                        "<extra></extra>"
+                    ),
+                    customdata=np.stack(
+                        [cell_data[column] for column in REVERSE_HOVER_COLUMNS],
+                        axis=-1,
+                    ),
+                    **self.legend_args(cell, legend),
+                ),
+                **subplot,
+            )
+
+        if yline:
+            yline_value = nan_mean(split.sector_column(sector, yline)[nonzero])
+            fig.add_hline(
+                y=yline_value,
+                line_dash="dashdot",
+                line_color="#F70000",
+                line_width=2,
+                **subplot,
+            )
+            # Adjust y_max if yline_value is greater
+            if yline_value > y_max:
+                y_max = yline_value
+
+        return [y_max, y_min]
+
+    def daily_reverse_figure(
+        self, split, sector, x_param, y_param, color_mapping, yline=None
+    ):
+        fig = go.Figure()
+        yaxis_range = self.add_daily_reverse_traces(
+            fig,
+            split,
+            sector,
+            x_param=x_param,
+            y_param=y_param,
+            color_mapping=color_mapping,
+            yline=yline,
+        )
+
+        fig.update_layout(
+            margin=dict(t=20, l=20, r=20, b=20),
+            title_text=f"SECTOR {sector}",
+            title_x=0.4,
+            template="plotly_white",
+            hoverlabel=dict(font_size=16, font_family="Vodafone"),
+            hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.2,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=16),
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            width=600,
+            height=350,
+            showlegend=True,
+            xaxis=dict(
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+            yaxis=dict(
+                autorange="reversed",
+                range=yaxis_range,
+                tickfont=dict(size=14, color="#000000"),
+            ),
+        )
+        return fig
+
+    def create_charts_for_stacked_area(
+        self, df, cell_name, x_param, y_param, xrule=False, yline=None, y_range=None
+    ):
+        prepared = self.prepare(df, cell_name, x_param)
+        split = prepared.kpi(y_param, yline)
+        plotted = [x_param, y_param] + ([yline] if yline else [])
+        color_mapping = prepared.appearance_colors
 
+        cols = max(min(len(split.sectors), 3), 1)
+        columns = st.columns(cols)
+
+        for idx, sector in enumerate(split.sectors):
             with columns[idx % cols]:
                 with stylable_container(
                     key=f"container_with_border_{sector}",
@@ -1098,83 +1559,396 @@ class ChartGenerator:
                 ):
                     container = st.container()
                     with container:
-
-                        fig = px.area(
-                            sector_data,
-                            x=x_param,
-                            y=y_param,
-                            color=cell_name,
-                            color_discrete_map=color_mapping,
-                            hover_data={
-                                cell_name: True,
-                                y_param: True,
-                            },
-                        )
-                        fig.update_traces(
-                            hovertemplate=f"<b>{cell_name}:</b> %{{customdata[0]}}<br><b>{y_param}:</b> %{{y}}<extra></extra>"
+                        fig = self.cached_sector_figure(
+                            "stacked_area",
+                            split,
+                            sector,
+                            plotted,
+                            (cell_name, x_param, y_param, yline, color_mapping),
+                            partial(
+                                self.stacked_area_figure,
+                                split,
+                                sector,
+                                cell_name,
+                                x_param,
+                                y_param,
+                                color_mapping,
+                                yline,
+                            ),
                         )
-                        if yline:
-                            yline_value = sector_data[yline].mean()
-                            fig.add_hline(
-                                y=yline_value,
-                                line_dash="dot",
-                                line_color="#F70000",
-                                line_width=2,
-                            )
 
                         if xrule:
-                            fig.add_vline(
-                                x=st.session_state["xrule"],
-                                line_width=2,
-                                line_dash="dash",
-                                line_color="#808080",
-                            )
-
-                        fig.update_layout(
-                            margin=dict(t=20, l=20, r=20, b=20),
-                            title_text=f"SECTOR {sector}",
-                            title_x=0.4,
-                            xaxis_title=None,
-                            yaxis_title=None,
-                            template="plotly_white",
-                            hoverlabel=dict(font_size=16, font_family="Vodafone"),
-                            hovermode="x unified",
-                            legend=dict(
-                                orientation="h",
-                                yanchor="top",
-                                y=-0.5,
-                                xanchor="center",
-                                x=0.5,
-                                itemclick="toggleothers",
-                                itemdoubleclick="toggle",
-                                itemsizing="constant",
-                                font=dict(size=16),
-                                title=None,
-                            ),
-                            yaxis=dict(
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                            xaxis=dict(
-                                tickfont=dict(
-                                    size=14,
-                                    color="#000000",
-                                ),
-                            ),
-                            paper_bgcolor="#F5F5F5",
-                            plot_bgcolor="#F5F5F5",
-                            width=600,
-                            height=350,
-                            showlegend=True,
-                        )
+                            self.add_xrule(fig)
+
+                        self.show(fig)
+
+    def add_stacked_area_traces(
+        self,
+        fig,
+        split,
+        sector,
+        *,
+        cell_name,
+        x_param,
+        y_param,
+        color_mapping,
+        yline=None,
+        subplot=None,
+        legend=None,
+    ):
+        """Add one sector's stacked-area traces to ``fig``."""
+        subplot = subplot or {}
+        # Each subplot needs its own stack
+        stackgroup = "-".join(str(value) for value in subplot.values()) or "1"
+
+        for cell, cell_data in split.cell_groups(sector, [x_param, y_param]):
+            fig.add_trace(
+                go.Scatter(
+                    x=cell_data[x_param],
+                    y=cell_data[y_param],
+                    mode="lines",
+                    name=cell,
+                    stackgroup=stackgroup,
+                    line=dict(color=color_mapping[cell]),
+                    hovertemplate=(
+                        f"<b>{cell_name}:</b> {cell}<br>"
+                        f"<b>{y_param}:</b> %{{y}}<extra></extra>"
+                    ),
+                    **{"legendgroup": cell, **self.legend_args(cell, legend)},
+                ),
+                **subplot,
+            )
+        if yline:
+            yline_value = nan_mean(split.sector_column(sector, yline))
+            fig.add_hline(
+                y=yline_value,
+                line_dash="dot",
+                line_color="#F70000",
+                line_width=2,
+                **subplot,
+            )
+
+    def stacked_area_figure(
+        self, split, sector, cell_name, x_param, y_param, color_mapping, yline=None
+    ):
+        fig = go.Figure()
+        self.add_stacked_area_traces(
+            fig,
+            split,
+            sector,
+            cell_name=cell_name,
+            x_param=x_param,
+            y_param=y_param,
+            color_mapping=color_mapping,
+            yline=yline,
+        )
+
+        fig.update_layout(
+            margin=dict(t=20, l=20, r=20, b=20),
+            title_text=f"SECTOR {sector}",
+            title_x=0.4,
+            xaxis_title=None,
+            yaxis_title=None,
+            template="plotly_white",
+            hoverlabel=dict(font_size=16, font_family="Vodafone"),
+            hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.5,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=16),
+                title=None,
+            ),
+            yaxis=dict(
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+            xaxis=dict(
+                tickfont=dict(
+                    size=14,
+                    color="#000000",
+                ),
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            width=600,
+            height=350,
+            showlegend=True,
+        )
+        return fig
+
+    def section_columns(self, prepared, sections):
+        """Columns plotted by a list of KPI sections, gathered as floats."""
+        columns = [prepared.x_param]
+        for _, kind, y_param, yline in sections:
+            prepared.kpi(y_param, yline)
+            columns += [y_param] + ([yline] if yline else [])
+            if kind == "reverse":
+                columns += REVERSE_HOVER_COLUMNS
+        return list(dict.fromkeys(columns))
+
+    def add_kpi_traces(self, fig, prepared, section, sector, subplot, legend):
+        """
+        Add one KPI section for one sector to a subplot.
+
+        Returns the y-axis settings for that subplot, or None when the
+        sector has nothing to plot for the KPI.
+        """
+        _, kind, y_param, yline = section
+        split = prepared.kpi(y_param, yline)
+        if kind == "stacked":
+            # Same colours as the split layout's stacked charts
+            self.add_stacked_area_traces(
+                fig,
+                split,
+                sector,
+                cell_name=prepared.cell_name,
+                x_param=prepared.x_param,
+                y_param=y_param,
+                color_mapping=prepared.appearance_colors,
+                yline=yline,
+                subplot=subplot,
+                legend=legend,
+            )
+            return {}
+
+        if sector not in prepared.nonzero_sectors(y_param):
+            return None
+        if kind == "reverse":
+            yaxis_range = self.add_daily_reverse_traces(
+                fig,
+                split,
+                sector,
+                x_param=prepared.x_param,
+                y_param=y_param,
+                color_mapping=prepared.colors,
+                yline=yline,
+                subplot=subplot,
+                legend=legend,
+            )
+            return dict(autorange="reversed", range=yaxis_range)
+        yaxis_range = self.add_daily_traces(
+            fig,
+            split,
+            sector,
+            x_param=prepared.x_param,
+            y_param=y_param,
+            color_mapping=prepared.colors,
+            yline=yline,
+            subplot=subplot,
+            legend=legend,
+        )
+        return dict(range=yaxis_range)
+
+    def compact_layout(self, fig, height):
+        fig.update_layout(
+            margin=dict(t=40, l=20, r=20, b=20),
+            template="plotly_white",
+            hoverlabel=dict(font_size=14, font_family="Vodafone"),
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.05,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=14),
+                traceorder="normal",
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            height=height,
+            showlegend=True,
+        )
+        fig.update_xaxes(tickfont=dict(size=14, color="#000000"))
+        fig.update_yaxes(tickfont=dict(size=14, color="#000000"))
+
+    def sector_compact_figure(self, prepared, sections, sector, siteid):
+        fig = make_subplots(
+            rows=len(sections),
+            cols=1,
+            shared_xaxes=True,
+            subplot_titles=[title.format(siteid=siteid) for title, *_ in sections],
+            vertical_spacing=0.3 / len(sections),
+        )
+        legend = set()
+        for row, section in enumerate(sections, start=1):
+            subplot = {"row": row, "col": 1}
+            yaxis = self.add_kpi_traces(fig, prepared, section, sector, subplot, legend)
+            if yaxis:
+                fig.update_yaxes(**yaxis, **subplot)
+
+        self.compact_layout(fig, height=260 * len(sections))
+        fig.update_layout(title_text=f"SECTOR {sector}", title_x=0.4)
+        return fig
+
+    def kpi_compact_figure(self, prepared, section, sectors):
+        fig = make_subplots(
+            rows=1,
+            cols=len(sectors),
+            shared_xaxes="all",
+            subplot_titles=[f"SECTOR {sector}" for sector in sectors],
+            horizontal_spacing=0.03,
+        )
+        legend = set()
+        for col, sector in enumerate(sectors, start=1):
+            subplot = {"row": 1, "col": col}
+            yaxis = self.add_kpi_traces(fig, prepared, section, sector, subplot, legend)
+            if yaxis:
+                fig.update_yaxes(**yaxis, **subplot)
+
+        self.compact_layout(fig, height=400)
+        return fig
+
+    def create_charts_by_sector(self, prepared, sections, siteid, xrule=False):
+        """All KPI sections of one sector stacked in a single figure."""
+        columns = self.section_columns(prepared, sections)
+        sectors = prepared.split.sectors
+
+        cols = max(min(len(sectors), 3), 1)
+        chart_columns = st.columns(cols)
+
+        for idx, sector in enumerate(sectors):
+            with chart_columns[idx % cols]:
+                with stylable_container(
+                    key=f"container_with_border_{sector}",
+                    css_styles="""
+                                {
+                                    background-color: #F5F5F5;
+                                    border: 2px solid rgba(49, 51, 63, 0.2);
+                                    border-radius: 0.5rem;
+                                    padding: calc(1em - 1px)
+                                }
+                                """,
+                ):
+                    fig = self.cached_sector_figure(
+                        "sector_compact",
+                        prepared.split,
+                        sector,
+                        columns,
+                        (
+                            sections,
+                            siteid,
+                            prepared.colors,
+                            prepared.appearance_colors,
+                        ),
+                        partial(
+                            self.sector_compact_figure,
+                            prepared,
+                            sections,
+                            sector,
+                            siteid,
+                        ),
+                    )
+                    if xrule:
+                        self.add_xrule(fig)
+                    self.show(fig)
+
+    def create_chart_across_sectors(self, prepared, section, xrule=False):
+        """One KPI section for every sector in a single figure."""
+        columns = self.section_columns(prepared, [section])
+        split = prepared.split
+        sectors = split.sectors
+        if not sectors:
+            return
+
+        key = self.figure_cache.fingerprint(
+            "kpi_compact",
+            section,
+            prepared.colors,
+            prepared.appearance_colors,
+            self.trace_points(),
+            [
+                (
+                    sector,
+                    self.sector_scatter(split, sector).__name__,
+                    split.sector_cells(sector),
+                )
+                for sector in sectors
+            ],
+            *(split.column(column) for column in columns),
+        )
+        fig = self.figure_cache.get_or_build(
+            key, partial(self.kpi_compact_figure, prepared, section, sectors)
+        )
+        if xrule:
+            self.add_xrule(fig)
+
+        with stylable_container(
+            key="container_with_border",
+            css_styles="""
+                {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px)
+                }
+                """,
+        ):
+            self.show(fig)
+
+    def render_kpi_sections(
+        self, prepared, sections, siteid, layout="split", xrule=False
+    ):
+        """
+        Render a list of ``(title, kind, y_param, yline)`` KPI sections.
+
+        ``layout`` is ``"split"`` for one figure per KPI and sector,
+        ``"sector"`` for one figure per sector holding every KPI, or
+        ``"kpi"`` for one figure per KPI holding every sector.
+        """
+        if layout == "sector":
+            self.create_charts_by_sector(prepared, sections, siteid, xrule)
+            return
 
-                        st.plotly_chart(fig, use_container_width=True)
+        charts = {
+            "daily": self.create_charts_for_daily,
+            "reverse": self.create_charts_for_daily_reverse,
+            "stacked": self.create_charts_for_stacked_area,
+        }
+        for section in sections:
+            title, kind, y_param, yline = section
+            st.markdown(
+                *styling(
+                    f"📶 {title.format(siteid=siteid)}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
+            if layout == "kpi":
+                self.create_chart_across_sectors(prepared, section, xrule)
+            else:
+                charts[kind](
+                    df=prepared,
+                    cell_name=prepared.cell_name,
+                    x_param=prepared.x_param,
+                    y_param=y_param,
+                    yline=yline,
+                    xrule=xrule,
+                )
 
     def create_charts_for_stacked_area_neid(
         self, df, neid, x_param, y_param, xrule=False
     ):
+        fig = self.stacked_area_neid_figure(df, neid, x_param, y_param)
+        if xrule:
+            self.add_xrule(fig)
+
+        container = st.container()
+        with container:
+            st.plotly_chart(fig, use_container_width=True)
+
+    def stacked_area_neid_figure(self, df, neid, x_param, y_param):
         df[y_param] = df[y_param].astype(float)
         df_agg = df.groupby([x_param, neid], as_index=False)[y_param].sum()
 
@@ -1188,66 +1962,55 @@ class ChartGenerator:
             )
         }
 
-        container = st.container()
-        with container:
-            fig = px.area(
-                df_agg,
-                x=x_param,
-                y=y_param,
-                color=neid,
-                color_discrete_map=color_mapping,
-                hover_data={neid: True, y_param: True},
-            )
+        fig = px.area(
+            df_agg,
+            x=x_param,
+            y=y_param,
+            color=neid,
+            color_discrete_map=color_mapping,
+            hover_data={neid: True, y_param: True},
+        )
 
-            fig.update_traces(hovertemplate=f"<b>{neid}:</b>%{{y}}<extra></extra>")
-
-            fig.update_layout(
-                xaxis_title=None,
-                yaxis_title=None,
-                margin=dict(t=20, l=20, r=20, b=20),
-                # template="plotly_white",
-                hoverlabel=dict(font_size=16, font_family="Vodafone"),
-                hovermode="x unified",
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.2,
-                    xanchor="center",
-                    x=0.5,
-                    itemclick="toggleothers",
-                    itemdoubleclick="toggle",
-                    itemsizing="constant",
-                    font=dict(size=16),
-                    title=None,
-                ),
-                yaxis=dict(
-                    tickfont=dict(
-                        size=14,  # Updated size for y-axis tick labels
-                        color="#000000",
-                    ),
+        fig.update_traces(hovertemplate=f"<b>{neid}:</b>%{{y}}<extra></extra>")
+
+        fig.update_layout(
+            xaxis_title=None,
+            yaxis_title=None,
+            margin=dict(t=20, l=20, r=20, b=20),
+            # template="plotly_white",
+            hoverlabel=dict(font_size=16, font_family="Vodafone"),
+            hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.2,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=16),
+                title=None,
+            ),
+            yaxis=dict(
+                tickfont=dict(
+                    size=14,  # Updated size for y-axis tick labels
+                    color="#000000",
                 ),
-                xaxis=dict(
-                    tickfont=dict(
-                        size=14,  # Updated size for x-axis tick labels
-                        color="#000000",
-                    ),
+            ),
+            xaxis=dict(
+                tickfont=dict(
+                    size=14,  # Updated size for x-axis tick labels
+                    color="#000000",
                 ),
-                paper_bgcolor="#F5F5F5",
-                plot_bgcolor="#F5F5F5",
-                width=600,
-                height=350,
-                showlegend=True,
-            )
-
-            if xrule:
-                fig.add_vline(
-                    x=st.session_state["xrule"],
-                    line_width=2,
-                    line_dash="dash",
-                    line_color="#808080",
-                )
-
-            st.plotly_chart(fig, use_container_width=True)
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+            width=600,
+            height=350,
+            showlegend=True,
+        )
+        return fig
 
     def create_charts_for_mulsec(self, df, cell_name, x_param, y_param, y_param2):
         try:
@@ -1261,146 +2024,389 @@ class ChartGenerator:
                 st.error("The site does not have a multisector.")
                 return
 
-            # Filter out rows where mulsec_category is None
-            df = df[df["mulsec_category"].notna()]
+            fig = self.mulsec_figure(df, cell_name, x_param, y_param, y_param2)
 
-            # Sort and convert the y_param and y_param2 columns to float
-            df = df.sort_values(by=x_param)
-            df[y_param] = df[y_param].astype(float)
-            df[y_param2] = df[y_param2].astype(float)
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
+                    {
+                        background-color: #F5F5F5;
+                        border: 2px solid rgba(49, 51, 63, 0.2);
+                        border-radius: 0.5rem;
+                        padding: calc(1em - 1px)
+                    }
+                    """,
+            ):
+                container = st.container()
+                with container:
+                    self.show(fig)
 
-            unique_cells = df[cell_name].unique().tolist()
+        except KeyError as e:
+            st.error(f"KeyError: {e}")
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
 
-            color_mapping = {
-                cell: color
-                for cell, color in zip(
-                    sorted(
-                        df[cell_name].unique()
-                    ),  # Sort the unique values of cell_name
-                    self.get_colors(len(df[cell_name].unique())),
-                )
-            }
+    def mulsec_figure(self, df, cell_name, x_param, y_param, y_param2):
+        # Filter out rows where mulsec_category is None
+        df = df[df["mulsec_category"].notna()]
 
-            mulsec_groups = df.groupby("mulsec_category")
-            num_groups = len(mulsec_groups)
+        # Sort and convert the y_param and y_param2 columns to float
+        df = df.sort_values(by=x_param)
+        df[y_param] = df[y_param].astype(float)
+        df[y_param2] = df[y_param2].astype(float)
 
-            # Determine the number of columns
-            cols = num_groups
-            rows = 2
+        unique_cells = df[cell_name].unique().tolist()
 
-            fig = make_subplots(
-                rows=rows,
-                cols=cols,
-                subplot_titles=[
-                    f"{group} - PRB Utilization" for group, _ in mulsec_groups
-                ]
-                + [f"{group} - Active Users" for group, _ in mulsec_groups],
-                shared_xaxes=True,
-                vertical_spacing=0.1,
-                horizontal_spacing=0.03,
+        color_mapping = {
+            cell: color
+            for cell, color in zip(
+                sorted(df[cell_name].unique()),  # Sort the unique values of cell_name
+                self.get_colors(len(df[cell_name].unique())),
             )
+        }
 
-            for idx, (mulsec, group) in enumerate(mulsec_groups):
-                col = idx + 1
-
-                for cell in group[cell_name].unique():
-                    cell_data = group[group[cell_name] == cell]
-                    color = color_mapping[cell]
-
-                    # Plot y_param in the first row
-                    fig.add_trace(
-                        go.Scatter(
-                            x=cell_data[x_param],
-                            y=cell_data[y_param],
-                            mode="lines",
-                            name=cell,
-                            line=dict(color=color, width=2),
-                            legendgroup=cell,
-                            hovertemplate=(
-                                f"<b>{cell}</b><br>"
-                                f"<b>%{{x}}</b><br>"
-                                f"<b>PRB:</b> %{{y}}<br>"
-                                "<extra></extra>"
-                            ),
+        mulsec_groups = df.groupby("mulsec_category")
+        num_groups = len(mulsec_groups)
+
+        # Determine the number of columns
+        cols = num_groups
+        rows = 2
+
+        fig = make_subplots(
+            rows=rows,
+            cols=cols,
+            subplot_titles=[f"{group} - PRB Utilization" for group, _ in mulsec_groups]
+            + [f"{group} - Active Users" for group, _ in mulsec_groups],
+            shared_xaxes=True,
+            vertical_spacing=0.1,
+            horizontal_spacing=0.03,
+        )
+
+        # Two rows per cell, one for each parameter
+        max_points = self.trace_points()
+        points = df[cell_name].value_counts()
+        if max_points:
+            points = points.clip(upper=max_points)
+        scatter = self.scatter_for(2 * points.sum())
+
+        for idx, (mulsec, group) in enumerate(mulsec_groups):
+            col = idx + 1
+
+            for cell in group[cell_name].unique():
+                cell_data = group[group[cell_name] == cell]
+                color = color_mapping[cell]
+                prb_data = cell_data.iloc[
+                    lttb_indices(cell_data[x_param], cell_data[y_param], max_points)
+                ]
+                user_data = cell_data.iloc[
+                    lttb_indices(cell_data[x_param], cell_data[y_param2], max_points)
+                ]
+
+                # Plot y_param in the first row
+                fig.add_trace(
+                    scatter(
+                        x=prb_data[x_param],
+                        y=prb_data[y_param],
+                        mode="lines",
+                        name=cell,
+                        line=dict(color=color, width=2),
+                        legendgroup=cell,
+                        hovertemplate=(
+                            f"<b>{cell}</b><br>"
+                            f"<b>%{{x}}</b><br>"
+                            f"<b>PRB:</b> %{{y}}<br>"
+                            "<extra></extra>"
                         ),
-                        row=1,
-                        col=col,
-                    )
+                    ),
+                    row=1,
+                    col=col,
+                )
 
-                    # Plot y_param2 in the second row
-                    fig.add_trace(
-                        go.Scatter(
-                            x=cell_data[x_param],
-                            y=cell_data[y_param2],
-                            mode="lines",
-                            name=f"{cell} ({y_param2})",
-                            line=dict(color=color, width=2),
-                            legendgroup=cell,
-                            showlegend=False,
-                            hovertemplate=(
-                                f"<b>{cell}</b><br>"
-                                f"<b>%{{x}}</b><br>"
-                                f"<b>PRB:</b> %{{y}}<br>"
-                                "<extra></extra>"
-                            ),
+                # Plot y_param2 in the second row
+                fig.add_trace(
+                    scatter(
+                        x=user_data[x_param],
+                        y=user_data[y_param2],
+                        mode="lines",
+                        name=f"{cell} ({y_param2})",
+                        line=dict(color=color, width=2),
+                        legendgroup=cell,
+                        showlegend=False,
+                        hovertemplate=(
+                            f"<b>{cell}</b><br>"
+                            f"<b>%{{x}}</b><br>"
+                            f"<b>PRB:</b> %{{y}}<br>"
+                            "<extra></extra>"
                         ),
-                        row=2,
-                        col=col,
-                    )
+                    ),
+                    row=2,
+                    col=col,
+                )
 
-            fig.update_layout(
-                showlegend=True,
-                height=600,
-                template="plotly_white",
-                # hovermode="x unified",
-                margin=dict(l=20, r=20, t=20, b=5),
-                hoverlabel=dict(font_size=16, font_family="Vodafone"),
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.1,
-                    xanchor="center",
-                    x=0.5,
-                    itemclick="toggleothers",
-                    itemdoubleclick="toggle",
-                    itemsizing="constant",
-                    font=dict(size=14),
-                    title=None,
-                ),
-                paper_bgcolor="#F5F5F5",
-                plot_bgcolor="#F5F5F5",
+        fig.update_layout(
+            showlegend=True,
+            height=600,
+            template="plotly_white",
+            # hovermode="x unified",
+            margin=dict(l=20, r=20, t=20, b=5),
+            hoverlabel=dict(font_size=16, font_family="Vodafone"),
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.1,
+                xanchor="center",
+                x=0.5,
+                itemclick="toggleothers",
+                itemdoubleclick="toggle",
+                itemsizing="constant",
+                font=dict(size=14),
+                title=None,
+            ),
+            paper_bgcolor="#F5F5F5",
+            plot_bgcolor="#F5F5F5",
+        )
+        return fig
+
+
+class App:
+    def __init__(self):
+        self.config = Config().load()
+        self.database_session = DatabaseSession(self.config)
+        self.query_manager = None
+        self.dataframe_manager = DataFrameManager()
+        self.streamlit_interface = StreamlitInterface()
+        self.chart_generator = ChartGenerator()
+        self.geodata = None
+        self.chart_layout = "split"
+
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.project_root = os.path.dirname(os.path.dirname(current_dir))
+        self.assets_image = os.path.join(self.project_root, "assets/")
+
+    def site_folder(self, siteid):
+        return os.path.join(self.project_root, "sites", siteid)
+
+    @staticmethod
+    def load_site_table(data, siteid, table):
+        if data.empty:
+            st.error(
+                f"No {table} rows for site {siteid}; run neighborgraph.py to build them"
+            )
+            return None
+        return data
+
+    @staticmethod
+    def merge_tastate(mcom_data, ltetastate_data):
+        """ltetastate rows joined to their mcom cells on ci and eNodeB id."""
+        mcom_ta = mcom_data.rename(columns={"cellId": "ci", "eNBId": "enodebid"})
+        keys = ["ci", "enodebid"]
+        mcom_ta[keys] = mcom_ta[keys].astype(float)
+        ltetastate_data = ltetastate_data.copy()
+        ltetastate_data[keys] = ltetastate_data[keys].astype(float)
+        return pd.merge(
+            mcom_ta.set_index(keys),
+            ltetastate_data.set_index(keys),
+            on=keys,
+            how="inner",
+        )
+
+    @staticmethod
+    def calculate_rf(df_isd_data, df_tastate_data):
+        try:
+            df_isd_data["ta_overshoot"] = df_isd_data["isd"] + (
+                0.1 * df_isd_data["isd"]
+            )
+            df_isd_data["ta_undershoot"] = df_isd_data["isd"] / 3
+            df_isd_data["ta_overlap"] = df_isd_data["isd"] / 2 + (
+                0.2 * df_isd_data["isd"]
+            )
+
+            df_merged = pd.merge(
+                df_isd_data,
+                df_tastate_data,
+                left_on=["ci", "enbid"],
+                right_on=["ci", "enodebid"],
+            )
+
+            conditions = [
+                (df_merged["isd"] > 5),
+                (df_merged["perc90_ta_distance_km"] > df_merged["isd"]),
+                (df_merged["perc90_ta_distance_km"] < 0.5 * df_merged["isd"]),
+                (df_merged["perc90_ta_distance_km"] > 0.5 * df_merged["ta_overlap"]),
+                (df_merged["perc90_ta_distance_km"] == 0.5 * df_merged["ta_overlap"]),
+            ]
+
+            choices = [
+                "📐 Open Area",
+                "📈 TA Overshoot",
+                "📉 TA Undershoot",
+                "❌ TA Overlap",
+                "✔️ TA Proper",
+            ]
+
+            df_merged["final_ta_status"] = np.select(
+                conditions, choices, default="Open Area"
             )
 
-            with stylable_container(
-                key="container_with_border",
-                css_styles="""
-                    {
-                        background-color: #F5F5F5;
-                        border: 2px solid rgba(49, 51, 63, 0.2);
-                        border-radius: 0.5rem;
-                        padding: calc(1em - 1px)
-                    }
-                    """,
-            ):
-                container = st.container()
-                with container:
-                    st.plotly_chart(fig, use_container_width=True)
+            # Select final columns
+            final_df = df_merged[
+                [
+                    "siteid",
+                    "neid",
+                    "eutrancell",
+                    "isd",
+                    "ta_overshoot",
+                    "ta_undershoot",
+                    "ta_overlap",
+                    "final_ta_status",
+                ]
+            ]
+
+            return final_df
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return None
+
+    @staticmethod
+    def display_image_or_message(column, folder_path, image_name, message_prefix):
+        image_path = os.path.join(folder_path, image_name)
+        if os.path.exists(image_path):
+            column.image(image_path, caption=None, use_column_width=True)
+        else:
+            column.write(f"{message_prefix}: {image_path}")
+
+    @staticmethod
+    def display_styled_markdown(
+        column, text, font_size=24, text_align="left", tag="h6"
+    ):
+        styling_args = {
+            "font_size": font_size,
+            "text_align": text_align,
+            "tag": tag,
+        }
+        column.markdown(*styling(text, **styling_args))
+
+    @st.cache_data(ttl=600)
+    def load_ltedaily(_self, selected_sites, selected_neids, start_date, end_date):
+        """LTE daily KPIs of the selected sites joined with their cell targets."""
+        combined_target_data = []
+        combined_ltedaily_data = []
+        for siteid in selected_sites:
+            mcom_data = _self.query_manager.get_mcom_data(siteid)
+            for _, row in mcom_data.iterrows():
+                target_data = _self.query_manager.get_target_data(
+                    row["KABUPATEN"],
+                    # row["MC_class"],
+                    row["LTE"],
+                )
+                target_data["EutranCell"] = row["Cell_Name"]
+                combined_target_data.append(target_data)
+
+            combined_ltedaily_data.append(
+                _self.query_manager.get_ltedaily_data(
+                    siteid, selected_neids, start_date, end_date
+                )
+            )
+
+        if not combined_target_data or not combined_ltedaily_data:
+            return None
+
+        combined_target_df = pd.concat(combined_target_data, ignore_index=True)
+        combined_ltedaily_df = pd.concat(combined_ltedaily_data, ignore_index=True)
+
+        # Combine target data with ltedaily data
+        combined_target_ltedaily_df = pd.merge(
+            combined_target_df,
+            combined_ltedaily_df,
+            on="EutranCell",
+            how="right",
+        )
+        return split_sector(combined_target_ltedaily_df, "EutranCell")
+
+    @st.cache_data(ttl=600)
+    def load_ltehourly(_self, selected_sites, end_date):
+        """Hourly PRB and active users with datetime, multisector and band labels."""
+        ltehourly_data = _self.query_manager.get_ltehourly_data(
+            selected_sites, end_date
+        )
+        if ltehourly_data.empty:
+            return ltehourly_data
+
+        ltehourly_data["datetime"] = pd.to_datetime(
+            ltehourly_data["DATE_ID"].astype(str)
+            + " "
+            + ltehourly_data["hour_id"].astype(str).str.zfill(2),
+            format="%Y-%m-%d %H",
+        )
+        joined = ltehourly_data.pop("has_attributes").astype(bool)
+        ltehourly_data_mulsec = add_mulsec_category(ltehourly_data, ~joined)
+        return split_sector(ltehourly_data_mulsec, "EUtranCellFDD")
+
+    def load_cqi_tier(self, siteid, start_date, end_date):
+        """Tier list of a site and the busy-hour CQI of every cell in it."""
+        tier_data = self.load_site_table(
+            self.query_manager.get_cell_neighbors(siteid), siteid, "cell_neighbors"
+        )
+        if tier_data is None:
+            return None, None
+
+        unique_eutrancellfdd = sorted(
+            set(tier_data["cellname"].unique()).union(
+                set(tier_data["adjcellname"].unique())
+            )
+        )
+        all_data = pd.concat(
+            [
+                self.query_manager.get_cqi_cluster(eutrancellfdd, start_date, end_date)
+                for eutrancellfdd in unique_eutrancellfdd
+            ],
+            ignore_index=True,
+        )
+        self.dataframe_manager.add_dataframe(f"cqitier_{siteid}", all_data)
+        return tier_data, all_data
+
+    def render_cluster(self, tier_data, start_date, end_date, xrule):
+        """Site cells against their k-hop neighbor cluster for a chosen KPI."""
+        version = self.query_manager.get_neighbor_version()
+        if version is None:
+            return
+        graph = self.query_manager.get_neighbor_graph(version)
+        if graph is None:
+            return
 
-        except KeyError as e:
-            st.error(f"KeyError: {e}")
-        except Exception as e:
-            st.error(f"An error occurred: {e}")
+        col1, col2, _ = st.columns([1, 1, 4])
+        kpi = col1.selectbox("CLUSTER KPI", list(CLUSTER_KPIS), key="cluster_kpi")
+        depth = col2.selectbox("CLUSTER DEPTH", CLUSTER_DEPTHS, key="cluster_depth")
 
+        cluster = self.load_cluster(graph, tier_data, kpi, depth, start_date, end_date)
+        if cluster is None:
+            st.write(f"No {kpi} data for the cluster.")
+            return
+        self.chart_generator.clusterchart(*cluster, kpi, xrule)
 
-class App:
-    def __init__(self):
-        self.config = Config().load()
-        self.database_session = DatabaseSession(self.config)
-        self.query_manager = None
-        self.dataframe_manager = DataFrameManager()
-        self.streamlit_interface = StreamlitInterface()
-        self.chart_generator = ChartGenerator()
-        self.geodata = None
+    def load_cluster(self, graph, tier_data, kpi, depth, start_date, end_date):
+        """
+        Daily ``kpi`` of the site cells and of their tier 1-n clusters.
+
+        Returns the site cells' rows and ``{tier: aggregate}`` for every
+        tier up to ``depth``, or None when the cluster has no data.
+        """
+        cells = tier_data["cellname"].unique()
+        members = graph.expand(cells, depth)["member"].unique()
+        cluster_data = self.query_manager.get_cluster_kpi(
+            sorted(members), kpi, start_date, end_date
+        )
+        if cluster_data.empty:
+            return None
+        cluster_data["date"] = pd.to_datetime(cluster_data["date"])
+
+        how = CLUSTER_KPIS[kpi][3]
+        clusters = {
+            tier: graph.aggregate(cluster_data, cells, tier, "value", how=how)
+            for tier in range(1, depth + 1)
+        }
+        return cluster_data[cluster_data["cellname"].isin(cells)], clusters
 
     def run(self):
         session, engine = self.database_session.create_session()
@@ -1408,179 +2414,24 @@ class App:
             return
 
         self.query_manager = QueryManager(engine)
+        try:
+            ensure_cell_attributes(engine)
+        except Exception as e:
+            st.error(f"Error preparing cell attributes: {e}")
 
         script_dir = os.path.dirname(__file__)
 
         sitelist_path = os.path.join(script_dir, "test_sitelist.csv")
         sitelist = self.streamlit_interface.load_sitelist(sitelist_path)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(current_dir))
-        assets_image = os.path.join(project_root, "assets/")
-
-        # MARK: apply mulsec logic to dataframe
-        st.cache_data(ttl=1200)
-
-        eutran_mapping = {
-            "L23_F1_S1": ["ME1", "ME01"],
-            "L23_F2_S1": ["MF1", "MF01"],
-            "L23_F1_S2": ["ME2", "ME02"],
-            "L23_F2_S2": ["MF2", "MF02"],
-            "L23_F1_S3": ["ME3", "ME03"],
-            "L23_F2_S3": ["MF3", "MF03"],
-            "L23_F1_S4": ["ME4", "ME04"],
-            "L23_F2_S4": ["MF4", "MF04"],
-            "L23_F1_S5": ["ME5", "ME05"],
-            "L23_F2_S5": ["MF5", "MF05"],
-            "L23_F1_S6": ["ME6", "ME06"],
-            "L23_F2_S6": ["MF6", "MF06"],
-            "L23_F3_S1": ["MI1", "MI01"],
-            "L23_F3_S2": ["MI2", "MI02"],
-            "L23_F3_S3": ["MI3", "MI03"],
-            "L23_MIMO_50_F3_S1": ["MV01"],
-            "L23_MIMO_50_F3_S2": ["MV02"],
-            "L23_MIMO_50_F3_S3": ["MV03"],
-            "L23_MIMO_F1_S1": ["VE01"],
-            "L23_MIMO_F1_S2": ["VE02"],
-            "L23_MIMO_F1_S3": ["VE03"],
-            "L23_MIMO_F2_S1": ["VF01"],
-            "L23_MIMO_F2_S2": ["VF02"],
-            "L23_MIMO_F2_S3": ["VF03"],
-            "L23_MIMO_F3_S1": ["VV01"],
-            "L23_MIMO_F3_S2": ["VV02"],
-            "L23_MIMO_F3_S3": ["VV03"],
-            "L9_S1": ["MT1", "MT01"],
-            "L9_S2": ["MT2", "MT02"],
-            "L9_S3": ["MT3", "MT03"],
-            "L9_S4": ["MT4", "MT04"],
-            "L9_S5": ["MT5", "MT05"],
-            "L9_S6": ["MT6", "MT06"],
-            "L18_S1": ["ML1", "ML01"],
-            "L18_S2": ["ML2", "ML02"],
-            "L18_S3": ["ML3", "ML03"],
-            "L18_S4": ["ML4", "ML04"],
-            "L18_S5": ["ML5", "ML05"],
-            "L18_S6": ["ML6", "ML06"],
-            "L21_S1": ["MR1", "MR01"],
-            "L21_S2": ["MR2", "MR02"],
-            "L21_S3": ["MR3", "MR03"],
-            "L21_S4": ["MR4", "MR04"],
-            "L21_S5": ["MR5", "MR05"],
-            "L21_S6": ["MR6", "MR06"],
-        }
-
-        reverse_mapping = {v: k for k, vals in eutran_mapping.items() for v in vals}
-
-        def find_mapping(value):
-            for suffix in reverse_mapping:
-                if value.endswith(suffix):
-                    return reverse_mapping[suffix]
-            return "Unknown"
-
-        def split_sector(df, col, new_col="eutrancell_new"):
-            # Apply the find_mapping function to each row
-            df[new_col] = df[col].apply(find_mapping)
-            return df
-
-        def add_mulsec_category(df):
-            def get_mulsec_category(cell, cells):
-                try:
-                    cell = cell.upper()
-                    cells_upper = [c.upper() for c in cells]
-
-                    if cell.endswith(("MT04", "MT4")) and any(
-                        c.endswith(("MT01", "MT1")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 1", ("MT01", "MT1")
-                    elif cell.endswith(("MT05", "MT5")) and any(
-                        c.endswith(("MT02", "MT2")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 2", ("MT02", "MT2")
-                    elif cell.endswith(("MT06", "MT6")) and any(
-                        c.endswith(("MT03", "MT3")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 3", ("MT03", "MT3")
-                    elif cell.endswith(("ML04", "ML4")) and any(
-                        c.endswith(("ML01", "ML1")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 1", ("ML01", "ML1")
-                    elif cell.endswith(("ML05", "ML5")) and any(
-                        c.endswith(("ML02", "ML2")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 2", ("ML02", "ML2")
-                    elif cell.endswith(("ML06", "ML6")) and any(
-                        c.endswith(("ML03", "ML3")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 3", ("ML03", "ML3")
-                    elif cell.endswith(("MR04", "MR4")) and any(
-                        c.endswith(("MR01", "MR1")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 1", ("MR01", "MR1")
-                    elif cell.endswith(("MR05", "MR5")) and any(
-                        c.endswith(("MR02", "MR2")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 2", ("MR02", "MR2")
-                    elif cell.endswith(("MR06", "MR6")) and any(
-                        c.endswith(("MR03", "MR3")) for c in cells_upper
-                    ):
-                        return "MULSEC SEC 3", ("MR03", "MR3")
-                    else:
-                        return None, None
-                except Exception as e:
-                    print(f"Error in get_mulsec_category: {e}")
-                    return None, None
-
-            def find_partner_and_assign(df, cell, category, partner_suffixes):
-                try:
-                    cell_upper = cell.upper()
-                    partner_cells = [
-                        c
-                        for c in df["EUtranCellFDD"]
-                        if any(
-                            c.upper().endswith(suffix) for suffix in partner_suffixes
-                        )
-                    ]
-                    if partner_cells:
-                        df.loc[
-                            df["EUtranCellFDD"].str.upper() == cell_upper,
-                            "mulsec_category",
-                        ] = category
-                        df.loc[
-                            df["EUtranCellFDD"]
-                            .str.upper()
-                            .isin([p.upper() for p in partner_cells]),
-                            "mulsec_category",
-                        ] = category
-                except KeyError as e:
-                    print(f"KeyError in find_partner_and_assign: {e}")
-                except Exception as e:
-                    print(f"Error in find_partner_and_assign: {e}")
-
-            try:
-                # Ensure 'mulsec_category' column exists
-                if "mulsec_category" not in df.columns:
-                    df["mulsec_category"] = None
-
-                # First pass to determine all possible mulsec categories
-                for cell in df["EUtranCellFDD"]:
-                    category, partner_suffixes = get_mulsec_category(
-                        cell, df["EUtranCellFDD"]
-                    )
-                    if category:
-                        find_partner_and_assign(df, cell, category, partner_suffixes)
-            except KeyError as e:
-                print(f"KeyError in add_mulsec_category: {e}")
-            except Exception as e:
-                print(f"Error in add_mulsec_category: {e}")
-
-            return df
 
         (
             col1,
             col2,
             col3,
             col4,
+            col5,
             _,
-        ) = st.columns([1, 1, 1, 1, 3])
+        ) = st.columns([1, 1, 1, 1, 1, 2])
         with col1:
             date_range = self.streamlit_interface.select_date_range()
             st.session_state["date_range"] = date_range
@@ -1597,1325 +2448,909 @@ class App:
             xrule = self.streamlit_interface.select_xrule_date()
             st.session_state["xrule"] = xrule
 
-        # Fetch data for each selected site
+        with col5:
+            self.chart_layout = self.streamlit_interface.select_chart_layout()
+            self.streamlit_interface.select_full_resolution()
+            self.streamlit_interface.select_binary_payload()
+
+        # The query outlives the button click so sections can be opened later
         if st.button("Run Query"):
             if selected_sites and date_range:
                 start_date, end_date = date_range
-                combined_target_data = []
-                combined_ltetastate_data = []
-                combined_ltedaily_data = []
-
-                # Fetch MCOM data
-                def load_tier_data(tier_path):
-                    try:
-                        tier_data = pd.read_csv(tier_path)
-                    except FileNotFoundError:
-                        st.error(f"File does not exist: {tier_path}")
-                        tier_data = None
-                    except pd.errors.EmptyDataError:
-                        st.write(f"The file {tier_path} is empty.")
-                        tier_data = None
-                    except Exception as e:
-                        st.write(f"An error occurred while reading {tier_path}: {e!s}")
-                        tier_data = None
-                    return tier_data
-
-                def load_isd_data(isd_path):
-                    try:
-                        isd_data = pd.read_csv(isd_path)
-                    except FileNotFoundError:
-                        st.error(f"File does not exist: {isd_path}")
-                        isd_data = None
-                    except pd.errors.EmptyDataError:
-                        st.write(f"The file {isd_path} is empty.")
-                        isd_data = None
-                    except Exception as e:
-                        st.write(f"An error occurred while reading {isd_path}: {e!s}")
-                        isd_data = None
-                    return isd_data
-
-                def calculate_rf(df_isd_data, df_tastate_data):
-                    try:
-                        df_isd_data["ta_overshoot"] = df_isd_data["isd"] + (
-                            0.1 * df_isd_data["isd"]
-                        )
-                        df_isd_data["ta_undershoot"] = df_isd_data["isd"] / 3
-                        df_isd_data["ta_overlap"] = df_isd_data["isd"] / 2 + (
-                            0.2 * df_isd_data["isd"]
-                        )
-
-                        df_merged = pd.merge(
-                            df_isd_data,
-                            df_tastate_data,
-                            left_on=["ci", "enbid"],
-                            right_on=["ci", "enodebid"],
-                        )
-
-                        conditions = [
-                            (df_merged["isd"] > 5),
-                            (df_merged["perc90_ta_distance_km"] > df_merged["isd"]),
-                            (
-                                df_merged["perc90_ta_distance_km"]
-                                < 0.5 * df_merged["isd"]
-                            ),
-                            (
-                                df_merged["perc90_ta_distance_km"]
-                                > 0.5 * df_merged["ta_overlap"]
-                            ),
-                            (
-                                df_merged["perc90_ta_distance_km"]
-                                == 0.5 * df_merged["ta_overlap"]
-                            ),
-                        ]
+                st.session_state["review_query"] = {
+                    "selected_sites": list(selected_sites),
+                    "selected_neids": list(selected_neids),
+                    "start_date": start_date,
+                    "end_date": end_date,
+                }
 
-                        choices = [
-                            "📐 Open Area",
-                            "📈 TA Overshoot",
-                            "📉 TA Undershoot",
-                            "❌ TA Overlap",
-                            "✔️ TA Proper",
-                        ]
+        query = st.session_state.get("review_query")
+        if query:
+            self.render_report(query)
+            session.close()
+        else:
+            if "mcom_data" in st.session_state and "ltemdtdata" in st.session_state:
+                self.geodata = GeoApp(
+                    st.session_state.mcom_data, st.session_state.ltemdtdata
+                )
+                self.geodata.run_geo_app()
 
-                        df_merged["final_ta_status"] = np.select(
-                            conditions, choices, default="Open Area"
-                        )
+    def render_report(self, query):
+        """
+        Render the report section picked in the tab bar.
 
-                        # Select final columns
-                        final_df = df_merged[
-                            [
-                                "siteid",
-                                "neid",
-                                "eutrancell",
-                                "isd",
-                                "ta_overshoot",
-                                "ta_undershoot",
-                                "ta_overlap",
-                                "final_ta_status",
-                            ]
-                        ]
+        Only the open section queries and draws anything. On Streamlit 1.33
+        and later sections run as fragments, so widgets inside one rerun
+        that section alone; the cached loaders make reopening a section
+        cheap.
+        """
+        sections = {
+            "Overview": self.render_overview,
+            "KPI": self.render_daily_kpis,
+            "Payload": self.render_payload,
+            "CQI": self.render_cqi,
+            "PRB & Users": self.render_prb,
+            "VSWR": self.render_vswr,
+            "MDT & TA": self.render_mdt,
+            "Drive Test": self.render_drive_test,
+        }
+        section = sac.tabs(
+            [sac.TabsItem(label=label) for label in sections],
+            align="center",
+            key="review_section",
+        )
+        sections.get(section, self.render_overview)(**query)
 
-                        return final_df
+    @fragment
+    def render_overview(self, selected_sites, selected_neids, start_date, end_date):
+        for siteid in selected_sites:
+            folder = self.site_folder(siteid)
+            if not os.path.exists(folder):
+                st.error(f"Folder does not exist: {folder}")
 
-                    except Exception as e:
-                        print(f"An error occurred: {e}")
-                        return None
+            sac.divider(color="black", align="center")
+            col1, col2, _ = st.columns([1, 1, 5])
 
-                # Define a function to display images or messages
-                def display_image_or_message(
-                    column, folder_path, image_name, message_prefix
+            with col1.container():
+                with stylable_container(
+                    key="erilogo",
+                    css_styles="""
+                        img {
+                            display: block;
+                            margin-left: auto;
+                            margin-right: auto;
+                            width: 100%;
+                            position: relative;
+                            top: 5px;
+                        }
+                    """,
                 ):
-                    image_path = os.path.join(folder_path, image_name)
-                    if os.path.exists(image_path):
-                        column.image(image_path, caption=None, use_column_width=True)
-                    else:
-                        column.write(f"{message_prefix}: {image_path}")
+                    st.image(self.assets_image + "eri.png")
 
-                # Define a function to style and display markdown
-                def display_styled_markdown(
-                    column, text, font_size=24, text_align="left", tag="h6"
+            with col2.container():
+                with stylable_container(
+                    key="tsellogo",
+                    css_styles="""
+                        img {
+                            display: block;
+                            margin-left: auto;
+                            margin-right: auto;
+                            width: 100%;
+                            position: relative;
+                            top: 0px;  /* Adjust this value as needed */
+                        }
+                    """,
                 ):
-                    styling_args = {
-                        "font_size": font_size,
-                        "text_align": text_align,
-                        "tag": tag,
-                    }
-                    column.markdown(*styling(text, **styling_args))
-
-                for siteid in selected_sites:
-                    folder = os.path.join(project_root, "sites", siteid)
-                    tier_path = os.path.join(folder, "tier.csv")
-                    isd_path = os.path.join(folder, "isd.csv")
-
-                    if os.path.exists(folder):
-                        tier_data = load_tier_data(tier_path)
-                    else:
-                        st.error(f"Folder does not exist: {folder}")
-                        tier_data = None
-
-                    if os.path.exists(folder):
-                        isd_data = load_isd_data(isd_path)
-                    else:
-                        st.error(f"Folder does not exist: {folder}")
-                        isd_data = None
+                    st.image(self.assets_image + "tsel.png")
+            st.markdown("# ")
+            col1, col2 = st.columns([2, 1])
 
-                    # st.write(f"ISD data: {isd_data}")
+            # Display styled markdowns
+            self.display_styled_markdown(col1, f"📝 Naura Site {siteid}")
+            self.display_styled_markdown(col2, f"⚠️ Alarm Site {siteid}")
 
-                    if tier_data is not None:
-                        unique_eutrancellfdd = sorted(
-                            set(tier_data["cellname"].unique()).union(
-                                set(tier_data["adjcellname"].unique())
-                            )
-                        )
-                        all_data = pd.concat(
-                            [
-                                self.query_manager.get_cqi_cluster(
-                                    eutrancellfdd, start_date, end_date
-                                )
-                                for eutrancellfdd in unique_eutrancellfdd
-                            ],
-                            ignore_index=True,
-                        )
-
-                        self.dataframe_manager.add_dataframe(
-                            f"cqitier_{siteid}", all_data
-                        )
-
-                    sac.divider(color="black", align="center")
-                    col1, col2, _ = st.columns([1, 1, 5])
-
-                    with col1.container():
-                        with stylable_container(
-                            key="erilogo",
-                            css_styles="""
-                                img {
-                                    display: block;
-                                    margin-left: auto;
-                                    margin-right: auto;
-                                    width: 100%;
-                                    position: relative;
-                                    top: 5px;
-                                }
-                            """,
-                        ):
-                            st.image(assets_image + "eri.png")
-
-                    with col2.container():
-                        with stylable_container(
-                            key="tsellogo",
-                            css_styles="""
-                                img {
-                                    display: block;
-                                    margin-left: auto;
-                                    margin-right: auto;
-                                    width: 100%;
-                                    position: relative;
-                                    top: 0px;  /* Adjust this value as needed */
-                                }
-                            """,
-                        ):
-                            st.image(assets_image + "tsel.png")
-                    st.markdown("# ")
-                    col1, col2 = st.columns([2, 1])
-
-                    # Display styled markdowns
-                    display_styled_markdown(col1, f"📝 Naura Site {siteid}")
-                    display_styled_markdown(col2, f"⚠️ Alarm Site {siteid}")
-
-                    # Create containers with borders
-                    con1 = col1.container(border=True)
-                    con2 = col2.container(border=True)
-
-                    if os.path.exists(folder):
-                        display_image_or_message(
-                            con1, folder, "naura.jpg", "Please upload the image"
-                        )
-                        display_image_or_message(
-                            con2, folder, "alarm.jpg", "Please upload the image"
-                        )
-                    else:
-                        st.error(f"Path does not exist: {folder}")
+            # Create containers with borders
+            con1 = col1.container(border=True)
+            con2 = col2.container(border=True)
 
-                    mcom_data = self.query_manager.get_mcom_data(siteid)
-                    self.dataframe_manager.add_dataframe(
-                        f"mcom_data_{siteid}", mcom_data
-                    )
-                    # st.table(mcom_data)
+            if os.path.exists(folder):
+                self.display_image_or_message(
+                    con1, folder, "naura.jpg", "Please upload the image"
+                )
+                self.display_image_or_message(
+                    con2, folder, "alarm.jpg", "Please upload the image"
+                )
+            else:
+                st.error(f"Path does not exist: {folder}")
+
+    @fragment
+    def render_daily_kpis(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        final_data_ltedaily = self.load_ltedaily(
+            selected_sites, selected_neids, start_date, end_date
+        )
+        if final_data_ltedaily is None:
+            st.error("No LTE daily data for the selected sites.")
+            return
+        self.dataframe_manager.add_dataframe("final_data_ltedaily", final_data_ltedaily)
 
-                    for _, row in mcom_data.iterrows():
-                        target_data = self.query_manager.get_target_data(
-                            row["KABUPATEN"],
-                            # row["MC_class"],
-                            row["LTE"],
-                        )
-                        target_data["EutranCell"] = row["Cell_Name"]
-                        combined_target_data.append(target_data)
+        prepared_ltedaily = self.chart_generator.prepare(
+            final_data_ltedaily, "eutrancell_new", "DATE_ID"
+        )
+        # FLAG: Start Charts
+        self.chart_generator.render_kpi_sections(
+            prepared_ltedaily,
+            DAILY_KPI_SECTIONS,
+            siteid,
+            layout=self.chart_layout,
+            xrule=True,
+        )
 
-                    # Fetch LTE daily data for each site
-                    ltedaily_data = self.query_manager.get_ltedaily_data(
-                        siteid, selected_neids, start_date, end_date
-                    )
-                    combined_ltedaily_data.append(ltedaily_data)
-                    self.dataframe_manager.add_dataframe(
-                        f"ltedaily_data_{siteid}", ltedaily_data
-                    )
+    @fragment
+    def render_payload(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        payload_data = self.query_manager.get_ltedaily_payload(
+            selected_sites, start_date, end_date
+        )
+        self.dataframe_manager.add_dataframe("payload_data", payload_data)
 
-                # Combine target data and display
-                if combined_target_data:
-                    combined_target_df = pd.concat(
-                        combined_target_data, ignore_index=True
-                    )
-                    self.dataframe_manager.add_dataframe(
-                        "combined_target_data", combined_target_df
-                    )
-                    self.dataframe_manager.display_dataframe(
-                        "combined_target_df", "target"
-                    )
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.markdown(
+                *styling(
+                    f"📶 Payload Distribution by Frequency for Site  {siteid} (Gpbs)",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
 
-                # Combine ltetastate data and display
-                if combined_ltetastate_data:
-                    combined_ltetastate_df = pd.concat(
-                        combined_ltetastate_data, ignore_index=True
-                    )
-                    self.dataframe_manager.add_dataframe(
-                        "combined_ltetastate_data", combined_ltetastate_df
-                    )
+        with col2:
+            st.markdown(
+                *styling(
+                    f"📶 Total Site Payload Overview for Site {siteid} (Gpbs)",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
+        # TAG: - Payload Neid
+        col1, col2 = st.columns([1, 1])
+        con1 = col1.container()
+        con2 = col2.container()
+        with con1:
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
+                    {
+                        background-color: #F5F5F5;
+                        border: 2px solid rgba(49, 51, 63, 0.2);
+                        border-radius: 0.5rem;
+                        padding: calc(1em - 1px)
+                    }
+                    """,
+            ):
+                self.chart_generator.create_charts_for_stacked_area_neid(
+                    df=payload_data,
+                    neid="NEID",
+                    x_param="DATE_ID",
+                    y_param="Payload_Total(Gb)",
+                    xrule=True,
+                )
 
-                # Combine ltedaily data and display
-                if combined_ltedaily_data:
-                    combined_ltedaily_df = pd.concat(
-                        combined_ltedaily_data, ignore_index=True
-                    )
-                    self.dataframe_manager.add_dataframe(
-                        "combined_ltedaily_data", combined_ltedaily_df
-                    )
+        with con2:
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
+                    {
+                        background-color: #F5F5F5;
+                        border: 2px solid rgba(49, 51, 63, 0.2);
+                        border-radius: 0.5rem;
+                        padding: calc(1em - 1px)
+                    }
+                    """,
+            ):
+                self.chart_generator.create_charts_for_stacked_area_neid(
+                    df=payload_data,
+                    neid="SITEID",
+                    x_param="DATE_ID",
+                    y_param="Payload_Total(Gb)",
+                    xrule=True,
+                )
 
-                    # Combine target data with ltedaily data
-                    combined_target_ltedaily_df = pd.merge(
-                        combined_target_df,
-                        combined_ltedaily_df,
-                        on="EutranCell",
-                        how="right",
-                    )
-                    # st.table(combined_target_ltedaily_df)
-                    final_data_ltedaily = split_sector(
-                        combined_target_ltedaily_df, "EutranCell"
-                    )
-                    # st.write(final_data_ltedaily)
-                    # self.dataframe_manager.add_dataframe(
-                    #     "combined_target_ltedaily_data", combined_target_ltedaily_df
-                    # )
-
-                    # FLAG: Start Charts
-                    st.markdown(
-                        *styling(
-                            f"📶 Service Availability for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="Availability",
-                        xrule=True,
-                    )
-                    st.markdown(
-                        *styling(
-                            f"📶 RRC Success Rate for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+    @fragment
+    def render_cqi(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        xrule = st.session_state["xrule"]
+        tier_data, all_data = self.load_cqi_tier(siteid, start_date, end_date)
+        ltebusyhour_data = self.query_manager.get_busyhour(selected_sites, end_date)
+        ltebusyhour_data_final = split_sector(ltebusyhour_data, "EUtranCellFDD")
+
+        st.markdown(
+            *styling(
+                f"📶 CQI Comparison Across Frequencies for Site  {siteid}",
+                font_size=24,
+                text_align="left",
+                tag="h6",
+            )
+        )
+        # st.write(ltebusyhour_data_final)
+        self.chart_generator.create_charts_for_daily(
+            df=ltebusyhour_data_final,
+            cell_name="eutrancell_new",
+            x_param="DATE_ID",
+            y_param="CQI",
+            xrule=True,
+        )
 
-                    # FLAG: - create_charts_for_daily
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="RRC_SR",
-                        yline="CSSR",
-                        xrule=True,
-                    )
+        # MARK: CQI 1st tier
+        st.markdown(
+            *styling(
+                f"📶 CQI: {siteid} vs. Tier 1",
+                font_size=24,
+                text_align="left",
+                tag="h6",
+            )
+        )
+        if tier_data is not None:
+            try:
+                self.chart_generator.cqiclusterchart(
+                    all_data,
+                    tier_data,
+                    xrule,
+                )
+            except Exception as e:
+                st.write(f"An error occurred: {e!s}")
+
+        # MARK: Cluster KPI up to tier 3
+        st.markdown(
+            *styling(
+                f"📶 Cluster KPI: {siteid} vs. Tier 1-n",
+                font_size=24,
+                text_align="left",
+                tag="h6",
+            )
+        )
+        if tier_data is not None:
+            self.render_cluster(tier_data, start_date, end_date, xrule)
+
+    @fragment
+    def render_prb(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        ltehourly_data_final = self.load_ltehourly(selected_sites, end_date)
+        if ltehourly_data_final.empty:
+            st.write(f"No hourly data for site {siteid}.")
+            return
+        self.dataframe_manager.add_dataframe("ltehourly_data", ltehourly_data_final)
+        prepared_ltehourly = self.chart_generator.prepare(
+            ltehourly_data_final, "eutrancell_new", "datetime"
+        )
 
-                    # TAG: - ERAB SR
-                    st.markdown(
-                        *styling(
-                            f"📶 E-RAB Setup Success Rate for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        cols = st.columns(1)
+        with cols[0]:
+            st.markdown(
+                *styling(
+                    f"📶 PRB Utilization VS Active User Multisector for Site {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="ERAB_SR",
-                        yline="CSSR",
-                        xrule=True,
-                    )
+            # FLAG: transform to mulsec
+            self.chart_generator.create_charts_for_mulsec(
+                df=ltehourly_data_final,
+                cell_name="eutrancell_new",
+                x_param="datetime",
+                y_param="DL_Resource_Block_Utilizing_Rate",
+                y_param2="Active User",
+            )
 
-                    # TAG: - SSSR
-                    st.markdown(
-                        *styling(
-                            f"📶 Session Setup Success Rate for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        self.chart_generator.render_kpi_sections(
+            prepared_ltehourly,
+            HOURLY_KPI_SECTIONS,
+            siteid,
+            layout=self.chart_layout,
+        )
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="SSSR",
-                        yline="CSSR",
-                        xrule=True,
-                    )
+    @fragment
+    def render_vswr(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        folder = self.site_folder(siteid)
+        vswr_data = self.query_manager.get_vswr_data(selected_sites, end_date)
+        self.dataframe_manager.add_dataframe("vswr_data", vswr_data)
 
-                    # TAG: - CSSR
-                    st.markdown(
-                        *styling(
-                            f"📶 Session Abnormal Release Sectoral for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.markdown(
+                *styling(
+                    f"📶 VSWR Analysis for Site {siteid} (dBm)",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="SAR",
-                        yline="Service Drop Rate",
-                        xrule=True,
-                    )
+        with col2:
+            st.markdown(
+                *styling(
+                    f"📶 RET After {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
 
-                    # TAG: - CQI Non HOM
-                    st.markdown(
-                        *styling(
-                            f"📶 CQI Distribution (Non-Homogeneous) Sectoral for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        col1, col2 = st.columns([3, 2])
+        con1 = col1.container()
+        con2 = col2.container()
+        with con1:
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="avgcqinonhom",
-                        yline="CQI",
-                        xrule=True,
-                    )
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    position: relative;
+                    top: 0px;  /* Adjust this value as needed */
+                }
+                container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px)
+                }
+                """,
+            ):
+                self.chart_generator.create_charts_vswr(
+                    df=vswr_data,
+                    x1_param="DATE_ID",
+                    x2_param="RRU",
+                    y_param="VSWR",
+                    nename="RRU",
+                )
 
-                    # TAG: - Spectral Efficiency
-                    st.markdown(
-                        *styling(
-                            f"📶 Spectral Efficiency Analysis Sectoral for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        with con2:
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 80%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
+                if os.path.exists(folder):
+                    ret = os.path.join(folder, "ret.jpg")
+                    if os.path.exists(ret):
+                        st.image(ret, caption=None, use_column_width=True)
+                    else:
+                        st.error(f"Please upload the image: {ret}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
+        with con2:
+            st.markdown(
+                *styling(
+                    f"📶 VSWR for Site {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h4",
+                )
+            )
+            with stylable_container(
+                key="container_with_border",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 80%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
+                if os.path.exists(folder):
+                    vswr = os.path.join(folder, "vswr.jpg")
+                    if os.path.exists(vswr):
+                        st.image(vswr, caption=None, use_column_width=True)
+                    else:
+                        st.error(f"Please upload the image: {vswr}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
+
+    @fragment
+    def render_mdt(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        isd_data = self.load_site_table(
+            self.query_manager.get_cell_isd(siteid), siteid, "cell_isd"
+        )
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="SE_DAILY",
-                        yline="SE",
-                        xrule=True,
-                    )
+        # MARK: - GeoApp MDT Data
+        try:
+            mcom_data = self.query_manager.get_mcom_data(siteid)
+            st.session_state.mcom_data = mcom_data
+
+            required_columns = [
+                "Site_ID",
+                "NODE_ID",
+                "NE_ID",
+                "Cell_Name",
+                "Longitude",
+                "Latitude",
+                "Dir",
+                "Ant_BW",
+                "Ant_Size",
+                "cellId",
+                "eNBId",
+                "KABUPATEN",
+                "LTE",
+            ]
 
-                    # TAG: - Intra HO SR
-                    st.markdown(
-                        *styling(
-                            f"📶 Intra-Frequency Handover Performance Sectoral for Site {siteid} (%)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
+            try:
+                if not all(column in mcom_data.columns for column in required_columns):
+                    raise ValueError(
+                        "The dataframe does not contain all required columns"
                     )
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="Intra_HO_Exe_SR",
-                        yline="Intra Freq HOSR",
-                        xrule=True,
-                    )
+                self.dataframe_manager.add_dataframe(f"mcom_data_{siteid}", mcom_data)
 
-                    # TAG: - Inter HO SR
-                    st.markdown(
-                        *styling(
-                            f"📶 Inter-Frequency Handover Performance Sectoral for Site {siteid} (%)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+                if isinstance(selected_neids, list):
+                    selected_neids = selected_neids[0]
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="Inter_HO_Exe_SR",
-                        yline="Inter Freq HOSR",
-                        xrule=True,
+                if isinstance(selected_neids, str):
+                    ltemcomdata = mcom_data[mcom_data["NE_ID"] == selected_neids]
+                else:
+                    raise ValueError(
+                        "selected_neid should be a string or a list containing a string"
                     )
 
-                    # TAG: - UL RSSI
-                    st.markdown(
-                        *styling(
-                            f"📶 Average UL RSSI Sectoral for Site {siteid} (dBm)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+            except ValueError as ve:
+                st.error(f"An error occurred: {ve!s}")
+            except KeyError as ke:
+                st.error(f"A column is missing in the dataframe: {ke!s}")
+            except Exception as e:
+                st.error("An unexpected error occurred while processing the data.")
 
-                    self.chart_generator.create_charts_for_daily_reverse(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="UL_INT_PUSCH_y",
-                        yline="UL_INT_PUSCH_x",
-                        xrule=True,
-                    )
+        except Exception as e:
+            st.error("An error occurred while fetching data. Please try again later.")
 
-                    st.markdown(
-                        *styling(
-                            f"📶 Throughput (Mbps) Sectoral for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        # MARK: - GeoApp MDT Data
+        ltemdtdata = self.query_manager.get_ltemdt_data(selected_sites)
+        self.dataframe_manager.add_dataframe("ltemdtdata", ltemdtdata)
 
-                    self.chart_generator.create_charts_for_daily(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="CellDownlinkAverageThroughput",
-                        xrule=True,
-                    )
+        ltemcomdata["eNBId"] = ltemcomdata["eNBId"].astype(float)
+        ltemcomdata["cellId"] = ltemcomdata["cellId"].astype(float)
+        ltemdtdata["enodebid"] = ltemdtdata["enodebid"].astype(float)
+        ltemdtdata["ci"] = ltemdtdata["ci"].astype(float)
 
-                    st.markdown(
-                        *styling(
-                            f"📶 Payload Distribution Sectoral for Site {siteid} (Gpbs)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+        filter_set = set(zip(ltemcomdata["eNBId"], ltemcomdata["cellId"]))
 
-                    self.chart_generator.create_charts_for_stacked_area(
-                        df=final_data_ltedaily,
-                        cell_name="eutrancell_new",
-                        x_param="DATE_ID",
-                        y_param="Payload_Total(Gb)",
-                        xrule=True,
-                    )
+        ltemdtdata_final = ltemdtdata.loc[
+            ltemdtdata[["enodebid", "ci"]].apply(tuple, axis=1).isin(filter_set)
+        ]
 
-                payload_data = self.query_manager.get_ltedaily_payload(
-                    selected_sites, start_date, end_date
+        ltetastate_data = self.query_manager.get_ltetastate_data(selected_sites)
+        self.dataframe_manager.add_dataframe("ltetastate_data", ltetastate_data)
+
+        mcom_data["cellId"] = mcom_data["cellId"].astype(float)
+        mcom_data["eNBId"] = mcom_data["eNBId"].astype(float)
+        tastate_data = self.merge_tastate(mcom_data, ltetastate_data)
+        # tastate_final = split_sector(tastate_data, "Cell_Name")
+        # MARK: use this to calculate RF Propagation
+        self.dataframe_manager.add_dataframe("tastate_data", tastate_data)
+        ta_state = split_sector(tastate_data, "Cell_Name")
+        # st.write(ta_state)
+        col1, col2 = st.columns([3, 2])
+        con1 = col1.container()
+        con2 = col2.container()
+        # MARK: - GeoApp MDT Data
+        st.session_state.mcom_data = mcom_data
+
+        # MARK: - GeoApp MDT Data
+        ltemdtdata = self.query_manager.get_ltemdt_data(selected_sites)
+        self.dataframe_manager.add_dataframe("ltemdtdata", ltemdtdata)
+        st.session_state.ltemdtdata = ltemdtdata
+        st.session_state.ltemdtdata_final = ltemdtdata_final
+        st.session_state.ltemcomdata = ltemdtdata_final
+        with con1:
+            st.markdown(
+                *styling(
+                    f"☢️ MDT for Site {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h6",
                 )
-                self.dataframe_manager.add_dataframe("payload_data", payload_data)
-                # st.write(payload_data)
-
-                ltehourly_data = self.query_manager.get_ltehourly_data(
-                    selected_sites, end_date
+            )
+            self.geodata = GeoApp(mcom_data, ltemdtdata)
+            self.geodata.run_geo_app()
+
+        with con2:
+
+            # self.chart_generator.create_charts_tastate(ta_state)
+            st.markdown(
+                *styling(
+                    f"📶 TA Remark for Site {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h4",
                 )
+            )
+            tafinal = self.calculate_rf(isd_data, tastate_data)
+            st.table(tafinal)
 
-                ltehourly_data["datetime"] = pd.to_datetime(
-                    ltehourly_data["DATE_ID"].astype(str)
-                    + " "
-                    + ltehourly_data["hour_id"].astype(str).str.zfill(2),
-                    format="%Y-%m-%d %H",
+        col1 = st.columns(1)[0]
+        con1 = col1.container()
+        with col1:
+            st.markdown(
+                *styling(
+                    f"📶 TA State for Site {siteid}",
+                    font_size=24,
+                    text_align="left",
+                    tag="h4",
                 )
+            )
+            self.chart_generator.create_charts_tastate(ta_state, "eutrancell_new")
 
-                ltebusyhour_data = self.query_manager.get_busyhour(
-                    selected_sites, end_date
-                )
-                # self.dataframe_manager.add_dataframe(
-                #     "ltebusyhour_data", ltebusyhour_data
-                # )
-                ltebusyhour_data_final = split_sector(ltebusyhour_data, "EUtranCellFDD")
-
-                self.dataframe_manager.add_dataframe("ltehourly_data", ltehourly_data)
-                ltehourly_data_mulsec = add_mulsec_category(ltehourly_data)
-                # st.write(ltehourly_data_mulsec)
-                ltehourly_data_final = split_sector(
-                    ltehourly_data_mulsec, "EUtranCellFDD"
-                )
-                # st.write(ltehourly_data_final)
-                # st.write(ltehourly_data_final)
-                vswr_data = self.query_manager.get_vswr_data(selected_sites, end_date)
-                self.dataframe_manager.add_dataframe("vswr_data", vswr_data)
-
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    st.markdown(
-                        *styling(
-                            f"📶 Payload Distribution by Frequency for Site  {siteid} (Gpbs)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
+    @fragment
+    def render_drive_test(self, selected_sites, selected_neids, start_date, end_date):
+        siteid = selected_sites[-1]
+        folder = self.site_folder(siteid)
 
-                with col2:
-                    st.markdown(
-                        *styling(
-                            f"📶 Total Site Payload Overview for Site {siteid} (Gpbs)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-                # TAG: - Payload Neid
-                col1, col2 = st.columns([1, 1])
-                con1 = col1.container()
-                con2 = col2.container()
-                with con1:
-                    with stylable_container(
-                        key="container_with_border",
-                        css_styles="""
-                            {
-                                background-color: #F5F5F5;
-                                border: 2px solid rgba(49, 51, 63, 0.2);
-                                border-radius: 0.5rem;
-                                padding: calc(1em - 1px)
-                            }
-                            """,
-                    ):
-                        self.chart_generator.create_charts_for_stacked_area_neid(
-                            df=payload_data,
-                            neid="NEID",
-                            x_param="DATE_ID",
-                            y_param="Payload_Total(Gb)",
-                            xrule=True,
-                        )
+        col1 = st.columns(1)[0]
+        with col1:
+            st.markdown(
+                *styling(
+                    f"⛐ Drive Test Verification for Site {siteid}",
+                    font_size=28,
+                    text_align="left",
+                    tag="h6",
+                )
+            )
 
-                with con2:
-                    with stylable_container(
-                        key="container_with_border",
-                        css_styles="""
-                            {
-                                background-color: #F5F5F5;
-                                border: 2px solid rgba(49, 51, 63, 0.2);
-                                border-radius: 0.5rem;
-                                padding: calc(1em - 1px)
-                            }
-                            """,
-                    ):
-                        self.chart_generator.create_charts_for_stacked_area_neid(
-                            df=payload_data,
-                            neid="SITEID",
-                            x_param="DATE_ID",
-                            y_param="Payload_Total(Gb)",
-                            xrule=True,
-                        )
+        col1, col2, col3 = st.columns([1, 1, 1])
+        con1 = col1.container(border=True)
+        con2 = col2.container(border=True)
+        con3 = col3.container(border=True)
 
+        with con1:
+            with stylable_container(
+                key="rsrpsinr",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
                 st.markdown(
                     *styling(
-                        f"📶 CQI Comparison Across Frequencies for Site  {siteid}",
+                        f"RSRP & SINR {siteid}",
                         font_size=24,
-                        text_align="left",
+                        text_align="center",
                         tag="h6",
                     )
                 )
-                # st.write(ltebusyhour_data_final)
-                self.chart_generator.create_charts_for_daily(
-                    df=ltebusyhour_data_final,
-                    cell_name="eutrancell_new",
-                    x_param="DATE_ID",
-                    y_param="CQI",
-                    xrule=True,
-                )
+                if os.path.exists(folder):
+                    idlersrp = os.path.join(folder, "idlersrp.png")
+                    sinr = os.path.join(folder, "sinr.png")
+                    if os.path.exists(idlersrp) and os.path.exists(sinr):
+                        st.markdown(*styling("RSRP IDLE", font_size=15))
+                        st.image(idlersrp, caption=None, use_column_width=True)
+                        st.markdown(*styling("SINR", font_size=15))
+                        st.image(sinr, caption=None, use_column_width=True)
+                    else:
+                        st.error(f"Please upload the images: {idlersrp} & {sinr}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
 
-                # MARK: CQI 1st tier
+        with con2:
+            with stylable_container(
+                key="pci",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
                 st.markdown(
                     *styling(
-                        f"📶 CQI: {siteid} vs. Tier 1",
+                        f"PCI {siteid}",
                         font_size=24,
-                        text_align="left",
+                        text_align="center",
                         tag="h6",
                     )
                 )
-                if tier_data is not None:
-                    try:
-                        self.chart_generator.cqiclusterchart(
-                            all_data,
-                            tier_data,
-                            xrule,
-                        )
-                    except Exception as e:
-                        st.write(f"An error occurred: {e!s}")
-
-                cols = st.columns(1)
-                with cols[0]:
-                    st.markdown(
-                        *styling(
-                            f"📶 PRB Utilization VS Active User Multisector for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-
-                    # FLAG: transform to mulsec
-                    self.chart_generator.create_charts_for_mulsec(
-                        df=ltehourly_data_final,
-                        cell_name="eutrancell_new",
-                        x_param="datetime",
-                        y_param="DL_Resource_Block_Utilizing_Rate",
-                        y_param2="Active User",
-                    )
+                if os.path.exists(folder):
+                    pci = os.path.join(folder, "pci.png")
+                    if os.path.exists(pci):
+                        st.markdown(*styling("PCI", font_size=15))
+                        st.image(pci, caption=None, use_column_width=True)
+                    else:
+                        st.error(f"Please upload the images: {pci}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
 
+        with con3:
+            with stylable_container(
+                key="pci",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
                 st.markdown(
                     *styling(
-                        f"📶 PRB Utilization Site {siteid}",
+                        f"THROUGHPUT {siteid}",
                         font_size=24,
-                        text_align="left",
+                        text_align="center",
                         tag="h6",
                     )
                 )
-                self.chart_generator.create_charts_for_daily(
-                    df=ltehourly_data_final,
-                    cell_name="eutrancell_new",
-                    x_param="datetime",
-                    y_param="DL_Resource_Block_Utilizing_Rate",
+                if os.path.exists(folder):
+                    dlthp = os.path.join(folder, "dlthp.png")
+                    ulthp = os.path.join(folder, "ulthp.png")
+                    if os.path.exists(dlthp) & os.path.exists(ulthp):
+                        st.markdown(*styling("THROUGHPUT DOWNLOAD", font_size=15))
+                        st.image(dlthp, caption=None, use_column_width=True)
+                        st.markdown(*styling("THROUGHPUT UPLOAD", font_size=15))
+                        st.image(ulthp, caption=None, use_column_width=True)
+                    else:
+                        st.error(f"Please upload the images: {dlthp} & {ulthp}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
+
+        (
+            col1,
+            _,
+            _,
+        ) = st.columns([1, 1, 1])
+        with col1:
+            st.markdown(
+                *styling(
+                    f"⛐ CET Static Verification for Site {siteid}",
+                    font_size=28,
+                    text_align="left",
+                    tag="h6",
                 )
+            )
+
+        col1, col2, col3 = st.columns([1, 1, 1], gap="small")
+        con1 = col1.container(border=True)
+        con2 = col2.container(border=True)
+        con3 = col3.container(border=True)
+
+        with con1:
+            with stylable_container(
+                key="sec1",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
                 st.markdown(
                     *styling(
-                        f"📶 Active User Site {siteid}",
+                        f"SECTOR 1 {siteid}",
                         font_size=24,
-                        text_align="left",
+                        text_align="center",
                         tag="h6",
                     )
                 )
-                self.chart_generator.create_charts_for_daily(
-                    df=ltehourly_data_final,
-                    cell_name="eutrancell_new",
-                    x_param="datetime",
-                    y_param="Active User",
-                )
-
-                col1, col2 = st.columns([3, 2])
-                with col1:
-                    st.markdown(
-                        *styling(
-                            f"📶 VSWR Analysis for Site {siteid} (dBm)",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-
-                with col2:
-                    st.markdown(
-                        *styling(
-                            f"📶 RET After {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
+                if os.path.exists(folder):
+                    gridsec1 = os.path.join(folder, "gridsec1.jpg")
+                    speedtestsec1 = os.path.join(folder, "speedtestsec1.jpg")
+                    servicemodesec1 = os.path.join(folder, "servicemodesec1.jpg")
+                    gridservicemodesec1 = os.path.join(
+                        folder, "gridservicemodesec1.jpg"
                     )
 
-                col1, col2 = st.columns([3, 2])
-                con1 = col1.container()
-                con2 = col2.container()
-                with con1:
-                    with stylable_container(
-                        key="container_with_border",
-                        css_styles="""
-
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            position: relative;
-                            top: 0px;  /* Adjust this value as needed */
-                        }
-                        container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px)
-                        }
-                        """,
-                    ):
-                        self.chart_generator.create_charts_vswr(
-                            df=vswr_data,
-                            x1_param="DATE_ID",
-                            x2_param="RRU",
-                            y_param="VSWR",
-                            nename="RRU",
-                        )
-
-                with con2:
-                    with stylable_container(
-                        key="container_with_border",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 80%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        if os.path.exists(folder):
-                            ret = os.path.join(folder, "ret.jpg")
-                            if os.path.exists(ret):
-                                st.image(ret, caption=None, use_column_width=True)
-                            else:
-                                st.error(f"Please upload the image: {ret}")
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-                with con2:
-                    st.markdown(
-                        *styling(
-                            f"📶 VSWR for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h4",
-                        )
-                    )
-                    with stylable_container(
-                        key="container_with_border",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 80%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        if os.path.exists(folder):
-                            vswr = os.path.join(folder, "vswr.jpg")
-                            if os.path.exists(vswr):
-                                st.image(vswr, caption=None, use_column_width=True)
-                            else:
-                                st.error(f"Please upload the image: {vswr}")
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-                # MARK: - GeoApp MDT Data
-                try:
-                    mcom_data1 = self.query_manager.get_mcom_data(siteid)
-                    st.session_state.mcom_data1 = mcom_data1
-                    mcom_data = self.query_manager.get_mcom_data(siteid)
-                    st.session_state.mcom_data = mcom_data
-                    st.session_state.combined_target_data = combined_target_data
-
-                    required_columns = [
-                        "Site_ID",
-                        "NODE_ID",
-                        "NE_ID",
-                        "Cell_Name",
-                        "Longitude",
-                        "Latitude",
-                        "Dir",
-                        "Ant_BW",
-                        "Ant_Size",
-                        "cellId",
-                        "eNBId",
-                        "KABUPATEN",
-                        "LTE",
+                    existing_images = [
+                        img
+                        for img in [
+                            gridsec1,
+                            speedtestsec1,
+                            gridservicemodesec1,
+                            servicemodesec1,
+                        ]
+                        if os.path.exists(img)
                     ]
 
-                    try:
-                        if not all(
-                            column in mcom_data.columns for column in required_columns
-                        ):
-                            raise ValueError(
-                                "The dataframe does not contain all required columns"
-                            )
-
-                        self.dataframe_manager.add_dataframe(
-                            f"mcom_data_{siteid}", mcom_data
-                        )
-
-                        if isinstance(selected_neids, list):
-                            selected_neids = selected_neids[0]
-
-                        if isinstance(selected_neids, str):
-                            ltemcomdata = mcom_data[
-                                mcom_data["NE_ID"] == selected_neids
-                            ]
-                        else:
-                            raise ValueError(
-                                "selected_neid should be a string or a list containing a string"
-                            )
-
-                    except ValueError as ve:
-                        st.error(f"An error occurred: {ve!s}")
-                    except KeyError as ke:
-                        st.error(f"A column is missing in the dataframe: {ke!s}")
-                    except Exception as e:
+                    if existing_images:
+                        for img in existing_images:
+                            st.image(img, caption=None, use_column_width=True)
+                    else:
                         st.error(
-                            "An unexpected error occurred while processing the data."
+                            "No Functionality Test for Sector 1. (gridsec1, speedtestsec1, gridservicemodesec1, servicemodesec1)"
                         )
+                else:
+                    st.error(f"Path does not exist: {folder}")
 
-                except Exception as e:
-                    st.error(
-                        "An error occurred while fetching data. Please try again later."
+        with con2:
+            with stylable_container(
+                key="sec2",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
+                st.markdown(
+                    *styling(
+                        f"SECTOR 2 {siteid}",
+                        font_size=24,
+                        text_align="center",
+                        tag="h6",
                     )
-
-                # MARK: - GeoApp MDT Data
-                ltemdtdata = self.query_manager.get_ltemdt_data(selected_sites)
-                self.dataframe_manager.add_dataframe("ltemdtdata", ltemdtdata)
-
-                ltemcomdata["eNBId"] = ltemcomdata["eNBId"].astype(float)
-                ltemcomdata["cellId"] = ltemcomdata["cellId"].astype(float)
-                ltemdtdata["enodebid"] = ltemdtdata["enodebid"].astype(float)
-                ltemdtdata["ci"] = ltemdtdata["ci"].astype(float)
-
-                filter_set = set(zip(ltemcomdata["eNBId"], ltemcomdata["cellId"]))
-
-                ltemdtdata_final = ltemdtdata.loc[
-                    ltemdtdata[["enodebid", "ci"]].apply(tuple, axis=1).isin(filter_set)
-                ]
-
-                ltetastate_data = self.query_manager.get_ltetastate_data(selected_sites)
-                self.dataframe_manager.add_dataframe("ltetastate_data", ltetastate_data)
-
-                mcom_data["cellId"] = mcom_data["cellId"].astype(float)
-                mcom_data["eNBId"] = mcom_data["eNBId"].astype(float)
-                ltetastate_data["ci"] = ltetastate_data["ci"].astype(float)
-                ltetastate_data["enodebid"] = ltetastate_data["enodebid"].astype(float)
-
-                mcom_ta_renamed = mcom_data.rename(
-                    columns={"cellId": "ci", "eNBId": "enodebid"}
                 )
-
-                mcom_ta_indexed = mcom_ta_renamed.set_index(["ci", "enodebid"])
-                ltetastate_data_indexed = ltetastate_data.set_index(["ci", "enodebid"])
-                tastate_data = pd.merge(
-                    mcom_ta_indexed,
-                    ltetastate_data_indexed,
-                    on=["ci", "enodebid"],
-                    how="inner",
-                )
-                # tastate_final = split_sector(tastate_data, "Cell_Name")
-                # MARK: use this to calculate RF Propagation
-                self.dataframe_manager.add_dataframe("tastate_data", tastate_data)
-                ta_state = split_sector(tastate_data, "Cell_Name")
-                # st.write(ta_state)
-                col1, col2 = st.columns([3, 2])
-                con1 = col1.container()
-                con2 = col2.container()
-                # MARK: - GeoApp MDT Data
-                st.session_state.mcom_data = mcom_data
-                st.session_state.combined_target_data = combined_target_data
-
-                # MARK: - GeoApp MDT Data
-                ltemdtdata = self.query_manager.get_ltemdt_data(selected_sites)
-                self.dataframe_manager.add_dataframe("ltemdtdata", ltemdtdata)
-                st.session_state.ltemdtdata = ltemdtdata
-                st.session_state.ltemdtdata_final = ltemdtdata_final
-                st.session_state.ltemcomdata = ltemdtdata_final
-                with con1:
-                    st.markdown(
-                        *styling(
-                            f"☢️ MDT for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-                    self.geodata = GeoApp(mcom_data, ltemdtdata)
-                    self.geodata.run_geo_app()
-
-                with con2:
-
-                    # self.chart_generator.create_charts_tastate(ta_state)
-                    st.markdown(
-                        *styling(
-                            f"📶 TA Remark for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h4",
-                        )
-                    )
-                    tafinal = calculate_rf(isd_data, tastate_data)
-                    st.table(tafinal)
-
-                col1 = st.columns(1)[0]
-                con1 = col1.container()
-                with col1:
-                    st.markdown(
-                        *styling(
-                            f"📶 TA State for Site {siteid}",
-                            font_size=24,
-                            text_align="left",
-                            tag="h4",
-                        )
-                    )
-                    self.chart_generator.create_charts_tastate(
-                        ta_state, "eutrancell_new"
+                if os.path.exists(folder):
+                    gridsec2 = os.path.join(folder, "gridsec2.jpg")
+                    speedtestsec2 = os.path.join(folder, "speedtestsec2.jpg")
+                    servicemodesec2 = os.path.join(folder, "servicemodesec2.jpg")
+                    gridservicemodesec2 = os.path.join(
+                        folder, "gridservicemodesec2.jpg"
                     )
 
-                with col1:
-                    st.markdown(
-                        *styling(
-                            f"⛐ Drive Test Verification for Site {siteid}",
-                            font_size=28,
-                            text_align="left",
-                            tag="h6",
-                        )
-                    )
-
-                col1, col2, col3 = st.columns([1, 1, 1])
-                con1 = col1.container(border=True)
-                con2 = col2.container(border=True)
-                con3 = col3.container(border=True)
+                    existing_images = [
+                        img
+                        for img in [
+                            gridsec2,
+                            speedtestsec2,
+                            gridservicemodesec2,
+                            servicemodesec2,
+                        ]
+                        if os.path.exists(img)
+                    ]
 
-                with con1:
-                    with stylable_container(
-                        key="rsrpsinr",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"RSRP & SINR {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
-                        )
-                        if os.path.exists(folder):
-                            idlersrp = os.path.join(folder, "idlersrp.png")
-                            sinr = os.path.join(folder, "sinr.png")
-                            if os.path.exists(idlersrp) and os.path.exists(sinr):
-                                st.markdown(*styling("RSRP IDLE", font_size=15))
-                                st.image(idlersrp, caption=None, use_column_width=True)
-                                st.markdown(*styling("SINR", font_size=15))
-                                st.image(sinr, caption=None, use_column_width=True)
-                            else:
-                                st.error(
-                                    f"Please upload the images: {idlersrp} & {sinr}"
-                                )
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-
-                with con2:
-                    with stylable_container(
-                        key="pci",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"PCI {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
-                        )
-                        if os.path.exists(folder):
-                            pci = os.path.join(folder, "pci.png")
-                            if os.path.exists(pci):
-                                st.markdown(*styling("PCI", font_size=15))
-                                st.image(pci, caption=None, use_column_width=True)
-                            else:
-                                st.error(f"Please upload the images: {pci}")
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-
-                with con3:
-                    with stylable_container(
-                        key="pci",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"THROUGHPUT {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
+                    if existing_images:
+                        for img in existing_images:
+                            st.image(img, caption=None, use_column_width=True)
+                    else:
+                        st.error(
+                            "No Functionality Test for Sector 2. (gridsec2, speedtestsec2, gridservicemodesec2, servicemodesec2)"
                         )
-                        if os.path.exists(folder):
-                            dlthp = os.path.join(folder, "dlthp.png")
-                            ulthp = os.path.join(folder, "ulthp.png")
-                            if os.path.exists(dlthp) & os.path.exists(ulthp):
-                                st.markdown(
-                                    *styling("THROUGHPUT DOWNLOAD", font_size=15)
-                                )
-                                st.image(dlthp, caption=None, use_column_width=True)
-                                st.markdown(*styling("THROUGHPUT UPLOAD", font_size=15))
-                                st.image(ulthp, caption=None, use_column_width=True)
-                            else:
-                                st.error(f"Please upload the images: {dlthp} & {ulthp}")
-                        else:
-                            st.error(f"Path does not exist: {folder}")
+                else:
+                    st.error(f"Path does not exist: {folder}")
 
-                (
-                    col1,
-                    _,
-                    _,
-                ) = st.columns([1, 1, 1])
-                with col1:
-                    st.markdown(
-                        *styling(
-                            f"⛐ CET Static Verification for Site {siteid}",
-                            font_size=28,
-                            text_align="left",
-                            tag="h6",
-                        )
+        with con3:
+            with stylable_container(
+                key="sec3",
+                css_styles="""
+                img {
+                    display: block;
+                    margin-left: auto;
+                    margin-right: auto;
+                    width: 100%;
+                    max-width: 100%;
+                    position: relative;
+                    top: 0px;
+                }
+                .custom-container {
+                    background-color: #F5F5F5;
+                    border: 2px solid rgba(49, 51, 63, 0.2);
+                    border-radius: 0.5rem;
+                    padding: calc(1em - 1px);
+                }
+                """,
+            ):
+                st.markdown(
+                    *styling(
+                        f"SECTOR 3 {siteid}",
+                        font_size=24,
+                        text_align="center",
+                        tag="h6",
                     )
+                )
 
-                col1, col2, col3 = st.columns([1, 1, 1], gap="small")
-                con1 = col1.container(border=True)
-                con2 = col2.container(border=True)
-                con3 = col3.container(border=True)
+                if os.path.exists(folder):
+                    gridsec3 = os.path.join(folder, "gridsec3.jpg")
+                    speedtestsec3 = os.path.join(folder, "speedtestsec3.jpg")
+                    servicemodesec3 = os.path.join(folder, "servicemodesec3.jpg")
+                    gridservicemodesec3 = os.path.join(
+                        folder, "gridservicemodesec3.jpg"
+                    )
 
-                with con1:
-                    with stylable_container(
-                        key="sec1",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"SECTOR 1 {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
-                        )
-                        if os.path.exists(folder):
-                            gridsec1 = os.path.join(folder, "gridsec1.jpg")
-                            speedtestsec1 = os.path.join(folder, "speedtestsec1.jpg")
-                            servicemodesec1 = os.path.join(
-                                folder, "servicemodesec1.jpg"
-                            )
-                            gridservicemodesec1 = os.path.join(
-                                folder, "gridservicemodesec1.jpg"
-                            )
-
-                            existing_images = [
-                                img
-                                for img in [
-                                    gridsec1,
-                                    speedtestsec1,
-                                    gridservicemodesec1,
-                                    servicemodesec1,
-                                ]
-                                if os.path.exists(img)
-                            ]
-
-                            if existing_images:
-                                for img in existing_images:
-                                    st.image(img, caption=None, use_column_width=True)
-                            else:
-                                st.error(
-                                    "No Functionality Test for Sector 1. (gridsec1, speedtestsec1, gridservicemodesec1, servicemodesec1)"
-                                )
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-
-                with con2:
-                    with stylable_container(
-                        key="sec2",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"SECTOR 2 {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
-                        )
-                        if os.path.exists(folder):
-                            gridsec2 = os.path.join(folder, "gridsec2.jpg")
-                            speedtestsec2 = os.path.join(folder, "speedtestsec2.jpg")
-                            servicemodesec2 = os.path.join(
-                                folder, "servicemodesec2.jpg"
-                            )
-                            gridservicemodesec2 = os.path.join(
-                                folder, "gridservicemodesec2.jpg"
-                            )
-
-                            existing_images = [
-                                img
-                                for img in [
-                                    gridsec2,
-                                    speedtestsec2,
-                                    gridservicemodesec2,
-                                    servicemodesec2,
-                                ]
-                                if os.path.exists(img)
-                            ]
-
-                            if existing_images:
-                                for img in existing_images:
-                                    st.image(img, caption=None, use_column_width=True)
-                            else:
-                                st.error(
-                                    "No Functionality Test for Sector 2. (gridsec2, speedtestsec2, gridservicemodesec2, servicemodesec2)"
-                                )
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-
-                with con3:
-                    with stylable_container(
-                        key="sec3",
-                        css_styles="""
-                        img {
-                            display: block;
-                            margin-left: auto;
-                            margin-right: auto;
-                            width: 100%;
-                            max-width: 100%;
-                            position: relative;
-                            top: 0px;
-                        }
-                        .custom-container {
-                            background-color: #F5F5F5;
-                            border: 2px solid rgba(49, 51, 63, 0.2);
-                            border-radius: 0.5rem;
-                            padding: calc(1em - 1px);
-                        }
-                        """,
-                    ):
-                        st.markdown(
-                            *styling(
-                                f"SECTOR 3 {siteid}",
-                                font_size=24,
-                                text_align="center",
-                                tag="h6",
-                            )
-                        )
+                    existing_images = [
+                        img
+                        for img in [
+                            gridsec3,
+                            speedtestsec3,
+                            gridservicemodesec3,
+                            servicemodesec3,
+                        ]
+                        if os.path.exists(img)
+                    ]
 
-                        if os.path.exists(folder):
-                            gridsec3 = os.path.join(folder, "gridsec3.jpg")
-                            speedtestsec3 = os.path.join(folder, "speedtestsec3.jpg")
-                            servicemodesec3 = os.path.join(
-                                folder, "servicemodesec3.jpg"
-                            )
-                            gridservicemodesec3 = os.path.join(
-                                folder, "gridservicemodesec3.jpg"
-                            )
-
-                            existing_images = [
-                                img
-                                for img in [
-                                    gridsec3,
-                                    speedtestsec3,
-                                    gridservicemodesec3,
-                                    servicemodesec3,
-                                ]
-                                if os.path.exists(img)
-                            ]
-
-                            if existing_images:
-                                for img in existing_images:
-                                    st.image(img, caption=None, use_column_width=True)
-                            else:
-                                st.error(
-                                    "No Functionality Test for Sector 3. (gridsec3, speedtestsec3, gridservicemodesec3, servicemodesec3)"
-                                )
-                        else:
-                            st.error(f"Path does not exist: {folder}")
-
-                session.close()
-        else:
-            if "mcom_data" in st.session_state and "ltemdtdata" in st.session_state:
-                self.geodata = GeoApp(
-                    st.session_state.mcom_data, st.session_state.ltemdtdata
-                )
-                self.geodata.run_geo_app()
+                    if existing_images:
+                        for img in existing_images:
+                            st.image(img, caption=None, use_column_width=True)
+                    else:
+                        st.error(
+                            "No Functionality Test for Sector 3. (gridsec3, speedtestsec3, gridservicemodesec3, servicemodesec3)"
+                        )
+                else:
+                    st.error(f"Path does not exist: {folder}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,384 @@
+"""
+Headless export of the site review report.
+
+Runs the review.py data pipeline and ChartGenerator figure builders
+without a Streamlit session and writes one self-contained HTML report per
+site, optionally with a static PNG/PDF of every chart. Sites are spread
+over a process pool; workers are recycled after ``--max-tasks-per-child``
+sites so their memory stays bounded.
+
+Every chart of the page is exported; the neighbor cluster chart is drawn
+for each cluster KPI up to the deepest tier instead of the page's picks.
+Not exported: the site photos (Naura, alarm, RET and drive test), the MDT
+map and the TA remark table, which are not charts.
+
+    python reviewexport.py SITE1 SITE2 --start 2024-05-01 --end 2024-07-31
+    python reviewexport.py --sitelist test_sitelist.csv --format png --workers 8
+
+Static images need the kaleido package. The database settings are read
+from ``.streamlit/secrets.toml`` exactly as the Streamlit page does.
+"""
+
+import argparse
+import html
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import UTC, date, datetime
+from functools import partial
+from multiprocessing import get_context
+
+import pandas as pd
+import plotly.io as pio
+from cellmap import ensure_cell_attributes
+from figcache import FigureCache
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 1rem 2rem; color: #393955; }}
+h3 {{ margin-top: 2rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>{period}</p>
+{body}
+</body>
+</html>
+"""
+
+# Per-process state set up by init_worker
+_worker = {}
+
+
+class Uncached:
+    """
+    Proxy that calls an object's ``st.cache_data`` methods without the cache.
+
+    There is no Streamlit runtime in the export, so the undecorated method
+    (``__wrapped__``) is called with the proxy as ``_self``; cached methods
+    that call each other then stay uncached as well.
+    """
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        wrapped = getattr(getattr(type(self._target), name, None), "__wrapped__", None)
+        if wrapped is not None:
+            return partial(wrapped, self)
+        return getattr(self._target, name)
+
+
+def load_review_page():
+    """
+    Import review.py under another name.
+
+    The page shares its name with the ``review`` package next to it, so it
+    cannot be imported as ``review``; load it from its path instead.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "review.py")
+    spec = importlib.util.spec_from_file_location("review_page", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def init_worker(full_resolution):
+    page = load_review_page()
+    app = page.App()
+    _, engine = app.database_session.create_session()
+    if engine is None:
+        raise RuntimeError("Could not create the database engine")
+    ensure_cell_attributes(engine)
+
+    app.query_manager = Uncached(page.QueryManager(engine))
+    app.chart_generator.full_resolution = full_resolution
+    # Every site is rendered once, so keeping figures around only costs memory
+    app.chart_generator.figure_cache = FigureCache(max_bytes=0)
+    _worker.update(page=page, app=Uncached(app))
+
+
+def slugify(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_").lower()
+
+
+def site_figures(siteid, neids, start_date, end_date, oa_date=None):
+    """Yield ``(title, figure)`` for every chart of one site's review report."""
+    page = _worker["page"]
+    app = _worker["app"]
+    chart_generator = app.chart_generator
+    query_manager = app.query_manager
+    # The page keeps its frames for the data tab; one site is enough here
+    app.dataframe_manager.dataframes.clear()
+
+    def with_xrule(fig):
+        if oa_date is not None:
+            chart_generator.add_xrule(fig, oa_date)
+        return fig
+
+    def kpi_figures(prepared, sections, xrule):
+        sectors = prepared.split.sectors
+        if not sectors:
+            return
+        for section in sections:
+            fig = chart_generator.kpi_compact_figure(prepared, section, sectors)
+            yield (
+                section[0].format(siteid=siteid),
+                with_xrule(fig) if xrule else fig,
+            )
+
+    def cluster_figures(tier_data):
+        version = query_manager.get_neighbor_version()
+        if version is None:
+            return
+        graph = query_manager.get_neighbor_graph(version)
+        if graph is None:
+            return
+        for kpi in page.CLUSTER_KPIS:
+            cluster = app.load_cluster(
+                graph, tier_data, kpi, page.CLUSTER_DEPTHS[-1], start_date, end_date
+            )
+            if cluster is None:
+                continue
+            fig = chart_generator.cluster_figure(*cluster, kpi, oa_date)
+            if fig is not None:
+                yield f"Cluster {kpi}: {siteid} vs. Tier 1-n", fig
+
+    final_data_ltedaily = app.load_ltedaily([siteid], neids, start_date, end_date)
+    if final_data_ltedaily is not None:
+        prepared_ltedaily = chart_generator.prepare(
+            final_data_ltedaily, "eutrancell_new", "DATE_ID"
+        )
+        yield from kpi_figures(prepared_ltedaily, page.DAILY_KPI_SECTIONS, True)
+
+    payload_data = query_manager.get_ltedaily_payload([siteid], start_date, end_date)
+    if not payload_data.empty:
+        for neid, title in [
+            ("NEID", f"Payload Distribution by Frequency for Site {siteid} (Gpbs)"),
+            ("SITEID", f"Total Site Payload Overview for Site {siteid} (Gpbs)"),
+        ]:
+            fig = chart_generator.stacked_area_neid_figure(
+                payload_data, neid, "DATE_ID", "Payload_Total(Gb)"
+            )
+            yield title, with_xrule(fig)
+
+    ltebusyhour_data = query_manager.get_busyhour([siteid], end_date)
+    if not ltebusyhour_data.empty:
+        prepared_busyhour = chart_generator.prepare(
+            page.split_sector(ltebusyhour_data, "EUtranCellFDD"),
+            "eutrancell_new",
+            "DATE_ID",
+        )
+        cqi_section = (
+            "CQI Comparison Across Frequencies for Site {siteid}",
+            "daily",
+            "CQI",
+            None,
+        )
+        yield from kpi_figures(prepared_busyhour, [cqi_section], True)
+
+    tier_data, all_data = app.load_cqi_tier(siteid, start_date, end_date)
+    if tier_data is not None:
+        yield (
+            f"CQI: {siteid} vs. Tier 1",
+            chart_generator.cqicluster_figure(all_data, tier_data, oa_date),
+        )
+        yield from cluster_figures(tier_data)
+
+    ltehourly_data_final = app.load_ltehourly([siteid], end_date)
+    if not ltehourly_data_final.empty:
+        if ltehourly_data_final["mulsec_category"].notna().any():
+            yield (
+                f"PRB Utilization VS Active User Multisector for Site {siteid}",
+                chart_generator.mulsec_figure(
+                    ltehourly_data_final,
+                    "eutrancell_new",
+                    "datetime",
+                    "DL_Resource_Block_Utilizing_Rate",
+                    "Active User",
+                ),
+            )
+        prepared_ltehourly = chart_generator.prepare(
+            ltehourly_data_final, "eutrancell_new", "datetime"
+        )
+        yield from kpi_figures(prepared_ltehourly, page.HOURLY_KPI_SECTIONS, False)
+
+    vswr_data = query_manager.get_vswr_data([siteid], end_date)
+    if not vswr_data.empty:
+        yield (
+            f"VSWR Analysis for Site {siteid} (dBm)",
+            chart_generator.vswr_figure(vswr_data, "DATE_ID", "RRU", "VSWR"),
+        )
+
+    mcom_data = query_manager.get_mcom_data(siteid)
+    ltetastate_data = query_manager.get_ltetastate_data([siteid])
+    if not mcom_data.empty and not ltetastate_data.empty:
+        ta_state = page.split_sector(
+            app.merge_tastate(mcom_data, ltetastate_data), "Cell_Name"
+        )
+        if not ta_state.empty:
+            yield (
+                f"TA State for Site {siteid}",
+                chart_generator.tastate_figure(ta_state, "eutrancell_new"),
+            )
+
+
+def write_report(path, siteid, start_date, end_date, figures):
+    parts = []
+    for index, (title, fig) in enumerate(figures):
+        parts.append(f"<h3>{html.escape(title)}</h3>")
+        # plotly.js is inlined once so the file opens offline
+        parts.append(
+            pio.to_html(
+                fig,
+                full_html=False,
+                include_plotlyjs=index == 0,
+                config={"displaylogo": False},
+            )
+        )
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            HTML_TEMPLATE.format(
+                title=html.escape(f"Site Review {siteid}"),
+                period=f"{start_date} to {end_date}",
+                body="\n".join(parts),
+            )
+        )
+
+
+def write_images(folder, figures, formats):
+    paths = []
+    for index, (title, fig) in enumerate(figures):
+        for fmt in formats:
+            path = os.path.join(folder, f"{index:02d}_{slugify(title)}.{fmt}")
+            fig.write_image(path, width=1400, height=fig.layout.height or 500)
+            paths.append(path)
+    return paths
+
+
+def export_site(siteid, neids, start_date, end_date, oa_date, out_dir, formats):
+    """Render one site; returns ``(siteid, html path, chart count, seconds)``."""
+    started = time.perf_counter()
+    figures = list(site_figures(siteid, neids, start_date, end_date, oa_date))
+
+    folder = os.path.join(out_dir, siteid)
+    os.makedirs(folder, exist_ok=True)
+    report_path = os.path.join(folder, f"review_{siteid}.html")
+    write_report(report_path, siteid, start_date, end_date, figures)
+    if formats:
+        write_images(folder, figures, formats)
+
+    return siteid, report_path, len(figures), time.perf_counter() - started
+
+
+def read_sitelist(path):
+    with open(path) as f:
+        return [line.split(",")[0].strip() for line in f if line.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export site review reports without the Streamlit page."
+    )
+    parser.add_argument("sites", nargs="*", help="Site IDs to export")
+    parser.add_argument("--sitelist", help="CSV file whose first column is SITEID")
+    parser.add_argument(
+        "--neid", action="append", default=[], help="Limit daily KPIs to an NEID"
+    )
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        help="First DATE_ID (default: three months before --end)",
+    )
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=datetime.now(UTC).astimezone().date(),
+        help="Last DATE_ID (default: today)",
+    )
+    parser.add_argument("--oa-date", type=date.fromisoformat, help="OA date rule")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument(
+        "--format",
+        action="append",
+        choices=["png", "pdf"],
+        default=[],
+        help="Also write static images (needs kaleido)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--max-tasks-per-child",
+        type=int,
+        default=4,
+        help="Sites a worker renders before it is replaced",
+    )
+    parser.add_argument(
+        "--full-resolution",
+        action="store_true",
+        help="Keep every raw point instead of downsampling traces",
+    )
+    args = parser.parse_args(argv)
+
+    if args.sitelist:
+        args.sites += read_sitelist(args.sitelist)
+    args.sites = list(dict.fromkeys(args.sites))
+    if not args.sites:
+        parser.error("no sites given")
+    if args.start is None:
+        args.start = (pd.Timestamp(args.end) - pd.DateOffset(months=3)).date()
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=min(args.workers, len(args.sites)),
+        # Worker recycling is not available with the fork start method
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(args.full_resolution,),
+        max_tasks_per_child=args.max_tasks_per_child,
+    ) as pool:
+        futures = {
+            pool.submit(
+                export_site,
+                siteid,
+                args.neid,
+                args.start,
+                args.end,
+                args.oa_date,
+                args.out,
+                args.format,
+            ): siteid
+            for siteid in args.sites
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            siteid = futures[future]
+            try:
+                _, path, charts, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(futures)}] {siteid} failed: {e}", file=sys.stderr)
+            else:
+                print(
+                    f"[{done}/{len(futures)}] {siteid}: {charts} charts "
+                    f"in {seconds:.1f}s -> {path}"
+                )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,267 @@
 import sqlite3
+import threading
 
 import pandas as pd
 import streamlit as st
 import streamlit_antd_components as sac
 
+CELL_COLUMNS = ("EutranCell", "EUtranCellFDD", "NRCellDU", "GERANCELL", "MOID")
+KEY_PREFIX = "__key_"
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
 
 class DatabaseHandler:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, page_size: int = 200, prefetch_pages: int = 2):
         self.db_path = db_path
         self.connection = None
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self._window = None
+        self._indexed = set()
+        self._lock = threading.Lock()
 
     def connect(self):
         # self.db_path = "database/database.db"
-        self.connection = sqlite3.connect(self.db_path)
+        # Shared by every session through database_handler, hence any thread
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def pragma(self, name: str):
+        return self.connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def data_version(self):
+        """
+        Version of the rows and schema as seen by this connection.
+
+        ``data_version`` changes whenever another connection, such as the
+        upload page, commits; ``schema_version`` covers the indexes this
+        handler creates itself.
+        """
+        return self.pragma("data_version"), self.pragma("schema_version")
+
+    def get_tables(self):
+        if self.connection:
+            return self._get_tables(self.pragma("schema_version"))
 
     @st.cache_data(ttl=1800)
-    def get_tables(_self):
-        if _self.connection:
-            query = "SELECT name FROM sqlite_master WHERE type='table';"
-            tables = pd.read_sql_query(query, _self.connection)["name"].tolist()
-            return tables
+    def _get_tables(_self, schema_version: int):
+        query = "SELECT name FROM sqlite_master WHERE type='table';"
+        return pd.read_sql_query(query, _self.connection)["name"].tolist()
+
+    def get_table_columns(self, table_name: str):
+        if self.connection:
+            return self._get_table_columns(table_name, self.pragma("schema_version"))
+        return []
 
     @st.cache_data(ttl=1800)
-    def get_table_data(_self, table_name: str):
-        if _self.connection:
-            query = f"SELECT * FROM {table_name};"
-            data = pd.read_sql_query(query, _self.connection)
-            return data
+    def _get_table_columns(_self, table_name: str, schema_version: int):
+        cursor = _self.connection.execute(
+            f"PRAGMA table_info({quote_identifier(table_name)})"
+        )
+        return [info[1] for info in cursor.fetchall()]
+
+    def get_key_columns(self, table_name: str):
+        """Keyset columns for a table; rowid is appended as the final tie-breaker."""
+        columns = self.get_table_columns(table_name)
+        key_columns = [column for column in ("DATE_ID",) if column in columns]
+        cell_column = next(
+            (column for column in CELL_COLUMNS if column in columns), None
+        )
+        if cell_column:
+            key_columns.append(cell_column)
+        return key_columns
+
+    @staticmethod
+    def key_expression(column: str) -> str:
+        # NULL never compares greater than a key, so it would drop rows from
+        # the row-value comparison; '' keeps them in one consistent order
+        return f"COALESCE({quote_identifier(column)}, '')"
+
+    def ensure_keyset_index(self, table_name: str):
+        """Index the keyset expressions so each page is an index range scan."""
+        key_columns = self.get_key_columns(table_name)
+        if self.connection and key_columns and table_name not in self._indexed:
+            index_name = quote_identifier(f"idx_{table_name}_keyset")
+            indexed = ", ".join(self.key_expression(column) for column in key_columns)
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} "
+                f"ON {quote_identifier(table_name)} ({indexed})"
+            )
+            self.connection.commit()
+        self._indexed.add(table_name)
+
+    def build_filter_clause(self, table_name: str, filters):
+        """
+        Translate a filter mapping into a parameterised WHERE fragment.
+
+        A scalar value is an equality test, a list or set becomes IN and a
+        (low, high) tuple becomes BETWEEN. Unknown columns raise KeyError.
+        """
+        columns = self.get_table_columns(table_name)
+        conditions = []
+        params = []
+        for column, value in (filters or {}).items():
+            if column not in columns:
+                raise KeyError(f"Unknown column for {table_name}: {column}")
+            quoted = quote_identifier(column)
+            if isinstance(value, tuple):
+                conditions.append(f"{quoted} BETWEEN ? AND ?")
+                params.extend(value)
+            elif isinstance(value, list | set | frozenset):
+                values = list(value)
+                placeholders = ", ".join("?" for _ in values)
+                conditions.append(f"{quoted} IN ({placeholders})")
+                params.extend(values)
+            else:
+                conditions.append(f"{quoted} = ?")
+                params.append(value)
+        return conditions, params
+
+    def get_table_page(
+        self, table_name: str, after=None, columns=None, filters=None, page_size=None
+    ):
+        """
+        Fetch one page of a table ordered by its keyset columns.
+
+        :param table_name: Table to browse.
+        :param after: Key of the last row of the previous page, or None for the
+            first page.
+        :param columns: Columns to return, defaults to every column.
+        :param filters: Column filters pushed down into the WHERE clause.
+        :param page_size: Rows per page, defaults to the handler page size.
+        :return: Tuple of the page DataFrame and the key to pass as ``after``
+            for the next page (None on the last page).
+        """
+        page_size = page_size or self.page_size
+        after = tuple(after) if after is not None else None
+        with self._lock:
+            self.ensure_keyset_index(table_name)
+            # The window is shared by every session; any write to the
+            # database changes the version and drops it
+            signature = (
+                table_name,
+                tuple(columns or ()),
+                tuple(sorted((filters or {}).items(), key=lambda item: item[0])),
+                page_size,
+                self.data_version(),
+            )
+            window = self._window
+            if window and window["signature"] == signature:
+                offset = window["offsets"].get(after)
+                in_window = offset is not None and (
+                    offset + page_size <= len(window["frame"]) or window["exhausted"]
+                )
+                if in_window:
+                    return self._slice_window(offset, page_size)
+
+            self._fill_window(
+                signature,
+                table_name,
+                after=after,
+                columns=columns,
+                filters=filters,
+                page_size=page_size,
+            )
+            return self._slice_window(0, page_size)
+
+    def _fill_window(
+        self, signature, table_name, *, after, columns, filters, page_size
+    ):
+        key_columns = self.get_key_columns(table_name)
+        key_expressions = [*map(self.key_expression, key_columns), "rowid"]
+        key_columns = [*key_columns, "rowid"]
+        table_columns = self.get_table_columns(table_name)
+        selected = list(columns or table_columns)
+        missing = [column for column in selected if column not in table_columns]
+        if missing:
+            raise KeyError(f"Unknown columns for {table_name}: {missing}")
+
+        select_list = [quote_identifier(column) for column in selected]
+        select_list += [
+            f"{expression} AS {quote_identifier(KEY_PREFIX + column)}"
+            for expression, column in zip(key_expressions, key_columns)
+        ]
+        conditions, params = self.build_filter_clause(table_name, filters)
+        order_by = ", ".join(key_expressions)
+        if after is not None:
+            placeholders = ", ".join("?" for _ in key_columns)
+            conditions.append(f"({order_by}) > ({placeholders})")
+            params.extend(after)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit = page_size * (1 + self.prefetch_pages)
+        query = (
+            f"SELECT {', '.join(select_list)} FROM {quote_identifier(table_name)} "
+            f"{where_clause} ORDER BY {order_by} LIMIT {limit}"
+        )
+        frame = pd.read_sql_query(query, self.connection, params=params)
+
+        key_frame = frame[[KEY_PREFIX + column for column in key_columns]]
+        keys = list(key_frame.itertuples(index=False, name=None))
+        offsets = {after: 0}
+        for offset in range(page_size, len(keys), page_size):
+            offsets[keys[offset - 1]] = offset
+
+        self._window = {
+            "signature": signature,
+            "frame": frame.drop(columns=key_frame.columns),
+            "keys": keys,
+            "offsets": offsets,
+            "exhausted": len(frame) < limit,
+        }
+
+    def _slice_window(self, offset, page_size):
+        window = self._window
+        page = window["frame"].iloc[offset : offset + page_size].reset_index(drop=True)
+        end = offset + len(page)
+        last_page = end >= len(window["frame"]) and window["exhausted"]
+        next_key = None if last_page or page.empty else window["keys"][end - 1]
+        return page, next_key
 
     def close(self):
         if self.connection:
             self.connection.close()
 
 
+def table_browser(db_handler: DatabaseHandler, table_name: str, key="table_browser"):
+    """Render a table one keyset page at a time with previous/next controls."""
+    state_key = f"{key}_{table_name}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = [None]
+    cursors = st.session_state[state_key]
+
+    columns = st.multiselect(
+        "Columns",
+        db_handler.get_table_columns(table_name),
+        key=f"{state_key}_columns",
+    )
+    page, next_key = db_handler.get_table_page(
+        table_name, after=cursors[-1], columns=columns or None
+    )
+    st.dataframe(page, use_container_width=True)
+
+    col1, col2, col3 = st.columns([1, 1, 3])
+    if col1.button("Previous", key=f"{state_key}_prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col2.button("Next", key=f"{state_key}_next", disabled=next_key is None):
+        cursors.append(next_key)
+        st.rerun()
+    col3.write(f"Page {len(cursors)}")
+
+
+@st.cache_resource
+def database_handler(db_path: str) -> DatabaseHandler:
+    """One connected handler per database, so its prefetch window survives reruns."""
+    db_handler = DatabaseHandler(db_path)
+    db_handler.connect()
+    return db_handler
+
+
 def sidebar(page: str):
     side_bar_mods()
-    db_handler = None
     options = {"selected_table": None, "dataframe": None}
     with st.sidebar:
         col1, col2 = st.columns(2)
@@ -47,10 +273,6 @@ def sidebar(page: str):
         )
         sac.divider(color="black", key="title")
 
-        db_path = "database/database.db"  # TAG this with the correct path
-        db_handler = DatabaseHandler(db_path)
-        db_handler.connect()
-
         col1, col2, col3 = st.columns(3)
         if col1.button("NR"):
             st.session_state["dashboard_tab"] = "NR"
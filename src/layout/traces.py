@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from cellmap import map_unique
+
+WEBGL_POINT_THRESHOLD = 2000
+LTTB_TARGET_POINTS = 600
+
+
+class SectorCellSplit:
+    """
+    Rows of a chart frame regrouped by sector and cell in a single pass.
+
+    The frame is expected to be sorted by its x column already. One stable
+    argsort on (sector, cell) keeps that x order inside every group, so each
+    column is gathered once and every sector or cell is a contiguous slice
+    of the gathered NumPy arrays. Cells keep their order of first appearance,
+    which is the order ``Series.unique()`` gave the previous per-mask loops.
+    """
+
+    def __init__(self, df, cell_name, sectors, columns=(), dtypes=None):
+        dtypes = dtypes or {}
+        cell_codes, self.cell_names = pd.factorize(df[cell_name])
+        sector_codes, self.sector_values = pd.factorize(np.asarray(sectors), sort=True)
+
+        group_key = sector_codes.astype(np.int64) * len(self.cell_names) + cell_codes
+        valid = (cell_codes >= 0) & (sector_codes >= 0)
+        order = np.flatnonzero(valid)
+        order = order[np.argsort(group_key[order], kind="stable")]
+        group_key = group_key[order]
+
+        self._frame = df
+        self._order = order
+        self.arrays = {}
+        for column in dict.fromkeys(columns):
+            self.column(column, dtypes.get(column))
+
+        bounds = np.flatnonzero(np.diff(group_key)) + 1
+        starts = np.concatenate(([0], bounds)) if len(order) else np.array([], int)
+        ends = np.concatenate((bounds, [len(order)])) if len(order) else starts
+        group_sectors = sector_codes[order[starts]]
+        group_cells = cell_codes[order[starts]]
+
+        self._sector_bounds = {}
+        self._sector_groups = {}
+        for start, end, sector_code, cell_code in zip(
+            starts, ends, group_sectors, group_cells
+        ):
+            sector = self.sector_values[sector_code]
+            first, _ = self._sector_bounds.get(sector, (start, end))
+            self._sector_bounds[sector] = (first, end)
+            self._sector_groups.setdefault(sector, []).append(
+                (self.cell_names[cell_code], start, end)
+            )
+
+    @property
+    def sectors(self):
+        return list(self._sector_bounds)
+
+    @property
+    def cells(self):
+        return list(self.cell_names)
+
+    def column(self, column, dtype=None):
+        """
+        Gathered values of a column, in group order.
+
+        Columns are gathered on first use and kept, so a split shared by
+        several charts only pays for the columns that are actually plotted.
+        A ``dtype`` coerces the column with ``pd.to_numeric`` first.
+        """
+        if column not in self.arrays:
+            values = self._frame[column]
+            if dtype is not None:
+                values = pd.to_numeric(values, errors="coerce")
+            self.arrays[column] = values.to_numpy(dtype=dtype)[self._order]
+        return self.arrays[column]
+
+    def sector_column(self, sector, column):
+        start, end = self._sector_bounds[sector]
+        return self.column(column)[start:end]
+
+    def sector_cells(self, sector):
+        """Cells of a sector with their row counts, in trace order."""
+        return [(cell, end - start) for cell, start, end in self._sector_groups[sector]]
+
+    def cell_groups(self, sector, columns, xy=None, max_points=None, nonzero=None):
+        """
+        Yield ``(cell, {column: array})`` for every cell of a sector.
+
+        Rows where the ``nonzero`` column is 0 are dropped first. When
+        ``max_points`` is given, each cell is then reduced with LTTB on the
+        ``xy`` column pair and every requested column keeps the same rows.
+        Cells left without rows are skipped.
+        """
+        for cell, start, end in self._sector_groups[sector]:
+            rows = np.arange(start, end)
+            if nonzero is not None:
+                rows = rows[self.column(nonzero)[start:end] != 0]
+            if not rows.size:
+                continue
+            if max_points and rows.size > max_points:
+                x_column, y_column = xy
+                rows = rows[
+                    lttb_indices(
+                        self.column(x_column)[rows],
+                        self.column(y_column)[rows],
+                        max_points,
+                    )
+                ]
+            yield cell, {column: self.column(column)[rows] for column in columns}
+
+
+class PreparedFrame:
+    """
+    A chart frame sorted, split by sector and colored once.
+
+    Chart methods accept it in place of a DataFrame. Sorting by x, the
+    sector mapping and the cell colors are shared, and each chart only
+    gathers the KPI columns it plots, as floats, the first time they are
+    asked for.
+    """
+
+    def __init__(self, df, cell_name, x_param, sector_of, palette):
+        self.cell_name = cell_name
+        self.x_param = x_param
+        df = df.sort_values(by=x_param)
+        self.split = SectorCellSplit(
+            df, cell_name, map_unique(df[cell_name], sector_of), [x_param]
+        )
+        cells = self.split.cells
+        self.colors = dict(zip(sorted(cells), palette(len(cells))))
+        self.appearance_colors = dict(zip(cells, palette(len(cells))))
+
+    def kpi(self, *columns):
+        """Return the split with the given KPI columns gathered as floats."""
+        for column in columns:
+            if column:
+                self.split.column(column, float)
+        return self.split
+
+    def nonzero_sectors(self, column):
+        """Sectors holding at least one non-zero value of ``column``."""
+        return [
+            sector
+            for sector in self.split.sectors
+            if np.any(self.split.sector_column(sector, column) != 0)
+        ]
+
+
+def numeric_axis(values):
+    """X values as floats: numbers as-is, dates as epoch nanoseconds."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    converted = pd.to_datetime(pd.Series(values), errors="coerce")
+    if converted.notna().all():
+        return converted.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Row positions kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last rows are always kept; the rows in between are split
+    into ``max_points - 2`` buckets and each bucket keeps the row forming
+    the largest triangle with the previously kept row and the mean of the
+    next bucket, which preserves peaks and dips. Bucket means are computed
+    in one pass with ``np.add.reduceat``; only the choice of the previous
+    row is carried from bucket to bucket.
+    """
+    n = len(y)
+    if not max_points or max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = numeric_axis(x)
+    y = np.asarray(y, dtype=float)
+
+    every = (n - 2) / (max_points - 2)
+    edges = (np.arange(max_points - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+
+    filled_y = np.nan_to_num(y)
+    mean_x = np.add.reduceat(x[: n - 1], starts) / counts
+    mean_y = np.add.reduceat(filled_y[: n - 1], starts) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], filled_y[-1])
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        px, py = x[previous], filled_y[previous]
+        area = np.abs(
+            (px - next_x[bucket]) * (filled_y[start:end] - py)
+            - (px - x[start:end]) * (next_y[bucket] - py)
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def positive_min(values):
+    positive = values[values > 0]
+    return positive.min() if positive.size else np.nan
+
+
+def nan_mean(values):
+    values = values[~np.isnan(values)]
+    return values.mean() if values.size else np.nan
+
+
+def nan_max(values):
+    values = values[~np.isnan(values)]
+    return values.max() if values.size else np.nan
+
+
+def nan_min(values):
+    values = values[~np.isnan(values)]
+    return values.min() if values.size else np.nan
+
+
+def scatter_class(points, render_mode="auto", threshold=WEBGL_POINT_THRESHOLD):
+    """
+    Pick the trace type for a line chart holding ``points`` samples.
+
+    ``render_mode`` is ``"svg"``, ``"webgl"`` or ``"auto"``; auto switches to
+    ``go.Scattergl`` once the figure holds more than ``threshold`` points.
+    Scattergl takes the same line, legendgroup, customdata and hovertemplate
+    arguments, so callers only swap the class.
+    """
+    if render_mode == "webgl" or (render_mode == "auto" and points > threshold):
+        return go.Scattergl
+    return go.Scatter
@@ -4,6 +4,9 @@ from io import BytesIO, StringIO
 
 import pandas as pd
 import streamlit as st
+from cellmap import CELL_SOURCES, refresh_cell_attributes
+from sidebar import database_handler, table_browser
+from sqlalchemy import create_engine
 
 
 class DatabaseManager:
@@ -17,6 +20,24 @@ class DatabaseManager:
     def close(self):
         self.conn.close()
 
+    def refresh_cell_attributes(self, table_name):
+        """Rebuild cell_attributes after mcom or gsmmcom was loaded."""
+        technologies = [
+            technology
+            for technology, (source, _, _) in CELL_SOURCES.items()
+            if source == table_name
+        ]
+        if not technologies:
+            return
+        # SQLite has no "public" schema; the models' tables live in main
+        engine = create_engine(f"sqlite:///{self.db_path}").execution_options(
+            schema_translate_map={"public": None}
+        )
+        try:
+            refresh_cell_attributes(engine, technologies)
+        finally:
+            engine.dispose()
+
     def get_tables(self):
         self.connect()
         self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -50,6 +71,7 @@ class DatabaseManager:
         df = pd.read_csv(StringIO(csv_data))
         df.to_sql(table_name, self.conn, if_exists="append", index=False)
         self.close()
+        self.refresh_cell_attributes(table_name)
 
     def remove_duplicates(self, table_name, selected_columns):
         columns_concat = "||','||".join(selected_columns)
@@ -84,6 +106,7 @@ class DatabaseManager:
             index=False,
         )
         self.close()
+        self.refresh_cell_attributes(create_table_query.split(" ")[2])
 
     def insert_excel_to_table(self, table_name, excel_data, file_type):
         self.connect()
@@ -181,6 +204,9 @@ def upload_page():
             table_header = db_manager.get_table_header(selected_table)
             st.write(f"Table Header: {table_header}")
 
+            with st.expander("Browse table"):
+                table_browser(database_handler(db_path), selected_table)
+
             csv_files = st.file_uploader(
                 "Upload CSV files", type="csv", accept_multiple_files=True
             )
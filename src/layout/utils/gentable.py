@@ -81,6 +81,55 @@ class Mcom(Base):
     lte: Mapped[str] = mapped_column(Text(), nullable=True)
 
 
+class CellAttributes(Base):
+    __tablename__ = "cell_attributes"
+    cell_name: Mapped[str] = mapped_column(Text(), primary_key=True)
+    technology: Mapped[str] = mapped_column(Text(), primary_key=True)
+    site_id: Mapped[str] = mapped_column(Text(), nullable=False)
+    sector: Mapped[int] = mapped_column(Integer(), nullable=False)
+    band: Mapped[str] = mapped_column(Text(), nullable=True)
+    mulsec_category: Mapped[str] = mapped_column(Text(), nullable=True)
+
+
+class CellNeighbor(Base):
+    __tablename__ = "cell_neighbors"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    siteid: Mapped[str] = mapped_column(Text(), nullable=False, index=True)
+    neid: Mapped[str] = mapped_column(Text(), nullable=False, index=True)
+    cellname: Mapped[str] = mapped_column(Text(), nullable=False)
+    adjneid: Mapped[str] = mapped_column(Text(), nullable=True)
+    adjcellname: Mapped[str] = mapped_column(Text(), nullable=False)
+    distance: Mapped[float] = mapped_column(Float(), nullable=False)
+    bearing_from_source: Mapped[float] = mapped_column(Float(), nullable=False)
+    bearing_from_target: Mapped[float] = mapped_column(Float(), nullable=False)
+    remark: Mapped[str] = mapped_column(Text(), nullable=False)
+
+
+class CellIsd(Base):
+    __tablename__ = "cell_isd"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    siteid: Mapped[str] = mapped_column(Text(), nullable=False, index=True)
+    neid: Mapped[str] = mapped_column(Text(), nullable=False, index=True)
+    eutrancell: Mapped[str] = mapped_column(Text(), nullable=False)
+    isd: Mapped[float] = mapped_column(Float(), nullable=False)
+    enbid: Mapped[int] = mapped_column(Integer(), nullable=True)
+    ci: Mapped[int] = mapped_column(Integer(), nullable=True)
+
+
+class NeighborInput(Base):
+    __tablename__ = "neighbor_inputs"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    site_id: Mapped[str] = mapped_column(Text(), nullable=True)
+    ne_id: Mapped[str] = mapped_column(Text(), nullable=True)
+    cell_name: Mapped[str] = mapped_column(Text(), nullable=True)
+    latitude: Mapped[float] = mapped_column(Float(), nullable=True)
+    longitude: Mapped[float] = mapped_column(Float(), nullable=True)
+    dir: Mapped[float] = mapped_column(Float(), nullable=True)
+    lte: Mapped[str] = mapped_column(Text(), nullable=True)
+    enbid: Mapped[float] = mapped_column(Float(), nullable=True)
+    cellid: Mapped[float] = mapped_column(Float(), nullable=True)
+
+
 class DailyLte(Base):
     __tablename__ = "daily_lte"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)